@@ -29,13 +29,27 @@
 提示：优先级数字越小越优先，同优先级按初始化顺序排列
 """
 
+import importlib
+
 from .base import BaseFetcher
-from .efinance_fetcher import EfinanceFetcher
-from .akshare_fetcher import AkshareFetcher
-from .tushare_fetcher import TushareFetcher
-from .pytdx_fetcher import PytdxFetcher
-from .baostock_fetcher import BaostockFetcher
-from .yfinance_fetcher import YfinanceFetcher
+
+# 各数据源按需导入：访问 data_fetcher.XxxFetcher 时才加载对应模块
+_FETCHER_MODULES = {
+    'EfinanceFetcher': '.efinance_fetcher',
+    'AkshareFetcher': '.akshare_fetcher',
+    'TushareFetcher': '.tushare_fetcher',
+    'PytdxFetcher': '.pytdx_fetcher',
+    'BaostockFetcher': '.baostock_fetcher',
+    'YfinanceFetcher': '.yfinance_fetcher',
+}
+
+
+def __getattr__(name):
+    module = _FETCHER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
     'BaseFetcher',
@@ -159,6 +159,48 @@ def _is_us_code(stock_code: str) -> bool:
     return bool(re.match(r'^[A-Z]{1,5}(\.[A-Z])?$', code))
 
 
+# 各报告期（季度末 MMDD）的法定披露截止日（MMDD），年报与一季报均为次年/当年 4 月 30 日
+_DISCLOSURE_DEADLINES = (('0930', '1031'), ('0630', '0831'), ('0331', '0430'))
+
+
+def _latest_disclosed_period(today: Optional[datetime] = None) -> str:
+    """
+    披露截止日已过的最新财报报告期（YYYYMMDD）
+
+    批量与逐只财报查询统一使用该报告期：全部上市公司均已披露，
+    不会出现部分股票取新报告期、部分股票取旧报告期的情况。
+
+    Examples:
+        >>> _latest_disclosed_period(datetime(2025, 10, 15))
+        '20250630'
+        >>> _latest_disclosed_period(datetime(2026, 3, 1))
+        '20250930'
+    """
+    today = today or datetime.now()
+    month_day = today.strftime('%m%d')
+    for period, deadline in _DISCLOSURE_DEADLINES:
+        if month_day > deadline:
+            return f"{today.year}{period}"
+    return f"{today.year - 1}0930"
+
+
+# 财报记录的数值字段：金额单位为元，增长率单位为 %
+INCOME_VALUE_KEYS = ('income', 'income_inc', 'profit', 'profit_inc')
+
+
+def _income_record(code: Any, period: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    生成统一格式的财报记录
+
+    批量（业绩报表）与逐只（财务摘要）两条路径都经由本函数输出，
+    股票代码补齐为 6 位，数值统一为 float（缺失或无法解析为 NaN），合并后可按同一阈值筛选。
+    """
+    record = {'code': str(code).strip().zfill(6), 'period': period}
+    for key in INCOME_VALUE_KEYS:
+        record[key] = safe_float(values.get(key), float('nan'))
+    return record
+
+
 class AkshareFetcher(BaseFetcher):
     """
     Akshare 数据源实现
@@ -721,6 +763,53 @@ class AkshareFetcher(BaseFetcher):
             return None
         return self._get_income_data_em(stock)
 
+    def get_income_map(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        获取全市场财报营收/净利润数据（东财业绩报表）
+
+        一次请求（ak.stock_yjbb_em）替代逐只调用 ak.stock_financial_abstract，
+        报告期与逐只查询相同（见 _latest_disclosed_period），记录格式见 _income_record。
+
+        Returns:
+            {股票代码: {"code", "period", "income", "income_inc", "profit", "profit_inc"}}，获取失败返回 None
+        """
+        import akshare as ak
+        circuit_breaker = get_realtime_circuit_breaker()
+        source_key = "akshare_em"
+
+        if not circuit_breaker.is_available(source_key):
+            logger.warning(f"[熔断] 数据源 {source_key} 处于熔断状态，跳过")
+            return None
+
+        columns = {
+            '股票代码': 'code',
+            '营业总收入-营业总收入': 'income',
+            '营业总收入-同比增长': 'income_inc',
+            '净利润-净利润': 'profit',
+            '净利润-同比增长': 'profit_inc',
+        }
+        period = _latest_disclosed_period()
+        try:
+            self._set_random_user_agent()
+            self._enforce_rate_limit()
+            logger.info(f"[API调用] ak.stock_yjbb_em(date={period}) 获取业绩报表...")
+            df = ak.stock_yjbb_em(date=period)
+            if df is None or df.empty or not set(columns).issubset(df.columns):
+                logger.warning(f"[API返回] 报告期 {period} 业绩报表为空或缺少字段")
+                return None
+            df = df[list(columns)].rename(columns=columns)
+            records = (_income_record(row['code'], period, row) for row in df.to_dict('records'))
+            result = {record['code']: record for record in records}
+
+            circuit_breaker.record_success(source_key)
+            logger.info(f"[API返回] 业绩报表({period}): {len(result)} 只股票")
+            return result
+
+        except Exception as e:
+            logger.error(f"[API错误] 获取业绩报表(东财)失败: {e}")
+            circuit_breaker.record_failure(source_key, str(e))
+            return None
+
     def _get_income_data_em(self, stock_code: str) -> Optional[UnifiedRealtimeQuote]:
         import akshare as ak
         circuit_breaker = get_realtime_circuit_breaker()
@@ -775,15 +864,19 @@ class AkshareFetcher(BaseFetcher):
                 income_inc_col = '营业总收入增长率'
                 profit_col = '净利润'
                 profit_inc_col = '归属母公司净利润增长率'
+                # 与全市场业绩报表取同一报告期（列名为 YYYYMMDD），尚未披露该期时视为无数据
+                period = _latest_disclosed_period()
+                if period not in df.columns:
+                    logger.warning(f"[API返回] {stock_code} 暂无报告期 {period} 的财务摘要")
+                    return None
                 df = df[df['指标'].isin([income_col, income_inc_col, profit_col, profit_inc_col]) & (df['选项'] == '成长能力')]
-                result = {
-                        "code": stock_code,
-                        "income": df[df['指标'] == income_col].iloc[:, 2].tolist()[0],
-                        "income_inc": df[df['指标'] == income_inc_col].iloc[:, 2].tolist()[0],
-                        "profit": df[df['指标'] == profit_col].iloc[:, 2].tolist()[0],
-                        "profit_inc": df[df['指标'] == profit_inc_col].iloc[:, 2].tolist()[0]
-                    }
-                return result
+                values = df.drop_duplicates('指标').set_index('指标')[period]
+                return _income_record(stock_code, period, {
+                    'income': values.get(income_col),
+                    'income_inc': values.get(income_inc_col),
+                    'profit': values.get(profit_col),
+                    'profit_inc': values.get(profit_inc_col),
+                })
             else:
                 return None
             
@@ -845,6 +938,51 @@ class AkshareFetcher(BaseFetcher):
         
         return self._get_stock_industry_info_em(stock_code)
 
+    def get_industry_map(self) -> Optional[Dict[str, str]]:
+        """
+        获取全市场 {股票代码: 所属行业} 映射（东财行业板块成分股）
+
+        遍历所有行业板块（约 90 次请求）一次性得到全部股票的行业，
+        股票数量较多时替代逐只调用 ak.stock_individual_info_em。
+        """
+        import akshare as ak
+        circuit_breaker = get_realtime_circuit_breaker()
+        source_key = "akshare_em"
+
+        if not circuit_breaker.is_available(source_key):
+            logger.warning(f"[熔断] 数据源 {source_key} 处于熔断状态，跳过")
+            return None
+
+        try:
+            self._set_random_user_agent()
+            self._enforce_rate_limit()
+
+            logger.info("[API调用] ak.stock_board_industry_name_em() 获取行业板块列表...")
+            boards = ak.stock_board_industry_name_em()
+            if boards is None or boards.empty or '板块名称' not in boards.columns:
+                return None
+
+            mapping: Dict[str, str] = {}
+            for board in boards['板块名称'].dropna().tolist():
+                # 板块之间短暂随机休眠（完整的限流间隔会使遍历耗时数分钟）
+                self.random_sleep(0.3, 0.8)
+                try:
+                    cons = ak.stock_board_industry_cons_em(symbol=board)
+                except Exception as e:
+                    logger.debug(f"[API错误] 行业板块 {board} 成分股获取失败: {e}")
+                    continue
+                if cons is not None and not cons.empty and '代码' in cons.columns:
+                    mapping.update(dict.fromkeys(cons['代码'].astype(str).tolist(), board))
+
+            circuit_breaker.record_success(source_key)
+            logger.info(f"[API返回] 行业板块成分股: {len(boards)} 个板块, {len(mapping)} 只股票")
+            return mapping or None
+
+        except Exception as e:
+            logger.error(f"[API错误] 获取行业板块成分股(东财)失败: {e}")
+            circuit_breaker.record_failure(source_key, str(e))
+            return None
+
     def _get_stock_industry_info_em(self, stock_code):
         import akshare as ak
         circuit_breaker = get_realtime_circuit_breaker()
@@ -1106,8 +1244,6 @@ class AkshareFetcher(BaseFetcher):
         source_key = "akshare_sina"
         
         try:
-            import requests
-            
             # 判断市场前缀
             if stock_code.startswith(('6', '5', '9')):
                 symbol = f"sh{stock_code}"
@@ -1123,7 +1259,7 @@ class AkshareFetcher(BaseFetcher):
             logger.info(f"[API调用] 新浪财经接口获取 {stock_code} 实时行情...")
             
             self._enforce_rate_limit()
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._http().get(url, headers=headers, timeout=10)
             response.encoding = 'gbk'
             
             if response.status_code != 200:
@@ -1204,8 +1340,6 @@ class AkshareFetcher(BaseFetcher):
         source_key = "tencent"
         
         try:
-            import requests
-            
             # 判断市场前缀
             if stock_code.startswith(('6', '5', '9')):
                 symbol = f"sh{stock_code}"
@@ -1221,7 +1355,7 @@ class AkshareFetcher(BaseFetcher):
             logger.info(f"[API调用] 腾讯财经接口获取 {stock_code} 实时行情...")
             
             self._enforce_rate_limit()
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._http().get(url, headers=headers, timeout=10)
             response.encoding = 'gbk'
             
             if response.status_code != 200:
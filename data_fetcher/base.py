@@ -14,23 +14,18 @@
 3. 指数退避重试机制
 """
 
+import functools
 import logging
 import random
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Optional, List, Tuple, Dict, Any
-from ta.trend import MACD
-from ta.volatility import BollingerBands, AverageTrueRange
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Optional, List, Tuple, Dict, Any, ClassVar, Mapping
 
 import pandas as pd
 import numpy as np
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
 
 from utils.config import FetcherArgs
 from utils.logger import Logger
@@ -41,6 +36,13 @@ logger = Logger(__name__)
 # === 标准化列名定义 ===
 STANDARD_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount', 'pct_chg']
 
+# EMA 平滑系数 alpha = 2 / (span + 1)，各周期在导入时算好
+# 5/10: 金叉死叉, 12/26/9: MACD, 50/200: 趋势
+EMA_ALPHA = {span: 2.0 / (span + 1) for span in (5, 9, 10, 12, 26, 50, 200)}
+
+# 完整计算长周期指标（EMA50/EMA200、60日涨幅）所需的最少 K 线数
+MIN_HISTORY_DAYS = 61
+
 
 class DataFetchError(Exception):
     """数据获取异常基类"""
@@ -56,8 +58,328 @@ class DataSourceUnavailableError(DataFetchError):
     """数据源不可用异常"""
     pass
 
-@staticmethod
-def _calculate_metrics(df: pd.DataFrame) -> pd.DataFrame:
+@dataclass
+class OHLCV:
+    """
+    按列存储的日线数据（列式布局）
+
+    每个字段都是按日期升序排列的一维连续数组，指标计算直接消费这些数组，
+    不再经过 DataFrame 的行/列索引器。
+    """
+    date: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    amount: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'OHLCV':
+        """从 _clean_data 输出的标准化 DataFrame 一次性提取各列"""
+        return cls(
+            date=df['date'].to_numpy(),
+            open=df['open'].to_numpy(dtype=np.float64),
+            high=df['high'].to_numpy(dtype=np.float64),
+            low=df['low'].to_numpy(dtype=np.float64),
+            close=df['close'].to_numpy(dtype=np.float64),
+            volume=df['volume'].to_numpy(dtype=np.float64),
+            amount=df['amount'].to_numpy(dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+@functools.lru_cache(maxsize=8)
+def _estimate_start_date(end_date: str, days: int) -> str:
+    """
+    按日历日估算获取 days 个交易日所需的开始日期（多取一倍）
+
+    批量扫描时 (end_date, days) 基本不变，缓存后每只股票不再重复解析和格式化日期。
+    """
+    start_dt = datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days * 2)
+    return start_dt.strftime('%Y-%m-%d')
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滑动均值（等价于 rolling(window, min_periods=1).mean()）
+
+    基于累计和做差，一次遍历得到所有窗口的均值；窗口未满时按已有数据求均值。
+    输入不应包含 NaN（_clean_data 已去除关键列空值）。
+    """
+    csum = np.cumsum(values, dtype=np.float64)
+    out = np.empty_like(csum)
+    head = min(window, len(csum))
+    out[:head] = csum[:head] / np.arange(1, head + 1)
+    out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+@functools.lru_cache(maxsize=64)
+def _ema_weights(alpha: float, n: int) -> np.ndarray:
+    """
+    递推 EMA（adjust=False，以首个值为起点）末值的闭式权重
+
+    ema[n-1] = (1-a)^(n-1) * x[0] + sum(a * (1-a)^(n-1-i) * x[i], i=1..n-1)
+    """
+    w = alpha * (1 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    w[0] = (1 - alpha) ** (n - 1)
+    return w
+
+
+def _ema_last(values: np.ndarray, alpha: float) -> float:
+    """只需要 EMA 末值时，用一次点积代替逐日递推"""
+    return float(np.dot(values, _ema_weights(alpha, len(values))))
+
+
+def _moving_averages(close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    计算均线与量比序列（_calculate_indicators 与 _compute_metrics 共用）
+
+    - ma5, ma10, ma20: 收盘价移动平均线
+    - volume_ratio: 量比（当日成交量 / 前一日的5日平均成交量），无法计算时为 1.0
+    """
+    avg_volume_5 = np.full_like(volume, np.nan, dtype=np.float64)
+    avg_volume_5[1:] = _rolling_mean(volume, 5)[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = volume / avg_volume_5
+    return {
+        'ma5': _rolling_mean(close, 5),
+        'ma10': _rolling_mean(close, 10),
+        'ma20': _rolling_mean(close, 20),
+        'volume_ratio': np.where(np.isnan(volume_ratio), 1.0, volume_ratio),
+    }
+
+
+def _metrics_kernel(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    long_history: bool = True
+) -> Dict[str, Any]:
+    """
+    计算技术指标状态
+
+    - EMA5, EMA10 及 MACD 快慢线（12, 26）：需要逐日序列（金叉/死叉、MACD 线），
+      在同一次前向遍历中递推
+    - EMA50, EMA200, MACD 信号线(9), ATR(14)：只需要末值，用闭式权重点积计算
+    布林带只需要最后两根 K 线的 %B，直接取对应的 20 日窗口计算。
+
+    初始化方式与 ta 库保持一致（adjust=False 的 EMA、
+    信号线从慢线第一个有效值开始、ATR 以前 14 日 TR 均值为起点）。
+    项目未引入 numba，这里是纯 Python 循环加 numpy 点积，不做 @njit 编译。
+
+    Args:
+        close/high/low: 按日期升序排列的一维 float64 数组
+        long_history: 历史不足时传 False，跳过 EMA50/EMA200 并返回 NaN
+
+    Returns:
+        末根（及前一根）K 线的指标标量，以及逐日的 EMA5 - EMA10 差值（用于金叉/死叉判断）
+    """
+    close = np.asarray(close, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    c = close.tolist()
+    n = len(c)
+    nan = float('nan')
+
+    # 递推用的系数绑定为局部常量，循环内不再重复计算 1 - alpha
+    a5, a10, a12, a26 = EMA_ALPHA[5], EMA_ALPHA[10], EMA_ALPHA[12], EMA_ALPHA[26]
+    d5, d10, d12, d26 = 1 - a5, 1 - a10, 1 - a12, 1 - a26
+    macd_start = 26 - 1
+    atr_window = 14
+
+    e5 = e10 = e12 = e26 = c[0]
+    ema_diff = [0.0] * n
+    macd_line = [0.0] * max(n - macd_start, 0)
+
+    for i in range(n):
+        if i:
+            x = c[i]
+            e5 = d5 * e5 + a5 * x
+            e10 = d10 * e10 + a10 * x
+            e12 = d12 * e12 + a12 * x
+            e26 = d26 * e26 + a26 * x
+        ema_diff[i] = e5 - e10
+        # MACD 线：从慢线（26 日）第一个有效值开始记录
+        if i >= macd_start:
+            macd_line[i - macd_start] = e12 - e26
+
+    if long_history:
+        ema50 = _ema_last(close, EMA_ALPHA[50])
+        ema200 = _ema_last(close, EMA_ALPHA[200])
+        ema200_prev = _ema_last(close[:-1], EMA_ALPHA[200])
+    else:
+        ema50 = ema200 = ema200_prev = nan
+
+    # 信号线需要 9 个有效 MACD 值
+    if len(macd_line) >= 9:
+        macd_histogram = macd_line[-1] - _ema_last(np.asarray(macd_line), EMA_ALPHA[9])
+    else:
+        macd_histogram = nan
+
+    # ATR：前 14 日 TR 均值作为起点，之后 Wilder 平滑（alpha = 1/14）
+    if n >= atr_window:
+        prev_close = np.concatenate(([close[0]], close[:-1]))
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        tr[0] = high[0] - low[0]
+        atr_input = np.concatenate(([tr[:atr_window].mean()], tr[atr_window:]))
+        atr = _ema_last(atr_input, 1.0 / atr_window)
+    else:
+        atr = nan
+
+    # 布林带(20, 2) %B：仅计算最后两根 K 线
+    bb_window = 20
+    percent_b = []
+    for end in (n - 1, n):
+        if end < bb_window:
+            percent_b.append(nan)
+            continue
+        window = c[end - bb_window:end]
+        mavg = sum(window) / bb_window
+        mstd = (sum((v - mavg) ** 2 for v in window) / bb_window) ** 0.5
+        band = 4 * mstd  # 上轨 - 下轨
+        percent_b.append((window[-1] - (mavg - 2 * mstd)) / band if band else nan)
+
+    return {
+        'ema5': e5,
+        'ema10': e10,
+        'ema50': ema50,
+        'ema200': ema200,
+        'ema200_prev': ema200_prev,
+        'macd_histogram': macd_histogram,
+        'atr': atr,
+        'bb_percent_b1': percent_b[1],
+        'bb_percent_b2': percent_b[0],
+        'ema_diff': np.asarray(ema_diff),
+    }
+
+
+@dataclass(slots=True)
+class Metrics:
+    """
+    单只股票的技术指标结果（固定字段，slots 存储）
+
+    历史不足时对应字段为 NaN。20日/60日涨幅在字典形式中的键名为 '20d_inc' / '60d_inc'；
+    仍支持 metrics['20d_inc'] 这类旧版字典下标读取。
+    """
+    amount: float             # 当日成交额
+    amount_ma20: float        # 20日日均成交额
+    close: float
+    ema5: float
+    ema10: float
+    ema50: float
+    ema200: float
+    ema200_slop: float        # EMA200 日斜率(%)
+    gloden_cross_days: int    # 距最近一次 EMA5 上穿 EMA10 的交易日数，无金叉为 -1
+    cross_count_10d: int      # 10个交易日内金叉/死叉次数
+    macd_histogram: float
+    ema200_deviation_rate: float
+    inc_20d: float            # 20日涨幅(%)
+    inc_60d: float            # 60日涨幅(%)
+    atr_rate: float           # ATR/收盘价(%)
+    bb_percent_b1: float      # 当日布林带 %B
+    bb_percent_b2: float      # 前一日布林带 %B
+    ma5: float
+    ma10: float
+    ma20: float
+    volume_ratio: float       # 量比（当日成交量 / 5日平均成交量）
+
+    # 与旧版字典结果保持一致的键名（字段名 -> 字典键名）
+    _DICT_KEYS: ClassVar[Mapping[str, str]] = MappingProxyType({'inc_20d': '20d_inc', 'inc_60d': '60d_inc'})
+    _FIELD_NAMES: ClassVar[Mapping[str, str]] = MappingProxyType({'20d_inc': 'inc_20d', '60d_inc': 'inc_60d'})
+
+    def __getitem__(self, key: str) -> Any:
+        """兼容旧版字典结果的下标读取，接受 '20d_inc' / '60d_inc' 等旧键名"""
+        name = self._FIELD_NAMES.get(key, key)
+        if name not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（用于报告输出）"""
+        return {
+            self._DICT_KEYS.get(f.name, f.name): getattr(self, f.name)
+            for f in fields(self)
+        }
+
+
+def _compute_metrics(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    amount: np.ndarray
+) -> Metrics:
+    """
+    基于按日期升序排列的列数组计算技术指标（_calculate_metrics 的数组版本）
+    """
+    # 新上市或长期停牌的股票历史不足，长周期指标直接置为 NaN
+    long_history = len(close) >= MIN_HISTORY_DAYS
+    # ema5, ema10, ema50, ema200, macd, atr, 布林带：单次遍历计算
+    kernel = _metrics_kernel(close, high, low, long_history=long_history)
+    # 比值类指标用 numpy 标量计算：停牌等导致价格为 0 时得到 inf/NaN，而不是抛出 ZeroDivisionError
+    current_price = np.float64(close[-1])
+    ema200 = np.float64(kernel['ema200'])
+    ema200_prev = np.float64(kernel['ema200_prev'])
+    # ema5 上穿 ema10的金叉, 下穿的死叉：相邻两日 EMA5-EMA10 的符号发生翻转
+    # 数组第 k 位对应第 k+1 个交易日
+    ema_diff = kernel['ema_diff']
+    above = ema_diff > 0
+    below = ema_diff < 0
+    is_golden_cross = (above[1:] ^ above[:-1]) & above[1:]
+    is_death_cross = (below[1:] ^ below[:-1]) & below[1:]
+    # 金叉间隔交易日期
+    cross_days = np.flatnonzero(is_golden_cross)
+    gloden_cross_days = -1
+    if len(cross_days) > 0:
+        gloden_cross_days = len(close) - 2 - int(cross_days[-1])
+    # 10个交易日内金死叉交叉次数：打包成位后做 popcount
+    is_cross = is_golden_cross | is_death_cross
+    packed = np.packbits(is_cross[-10:]).tobytes()
+    # 均线与量比：与 _calculate_indicators 同一实现，取末值
+    averages = _moving_averages(np.asarray(close, dtype=np.float64), np.asarray(volume, dtype=np.float64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ema200_slop = (ema200 - ema200_prev) / ema200_prev * 100
+        ema200_deviation_rate = (ema200 - current_price) / ema200 * 100
+        inc_20d = (current_price / np.float64(close[-21]) - 1) * 100 if len(close) > 20 else np.nan
+        inc_60d = (current_price / np.float64(close[-61]) - 1) * 100 if long_history else np.nan
+        atr_rate = np.float64(kernel['atr']) / current_price * 100
+    return Metrics(
+        # 当日, 20日成交额
+        amount=float(amount[-1]),
+        amount_ma20=float(amount[-20:].mean()) if len(amount) >= 20 else np.nan,
+        close=float(current_price),
+        ema5=kernel['ema5'],
+        ema10=kernel['ema10'],
+        ema50=kernel['ema50'],
+        ema200=float(ema200),
+        # ema200斜率
+        ema200_slop=float(ema200_slop),
+        gloden_cross_days=gloden_cross_days,
+        cross_count_10d=int.from_bytes(packed, 'little').bit_count(),
+        # macd histogram = DIF - DEA
+        macd_histogram=float(kernel['macd_histogram']),
+        # ema200偏离比例
+        ema200_deviation_rate=float(ema200_deviation_rate),
+        # 20日, 60日涨幅（历史不足时为 NaN）
+        inc_20d=float(inc_20d),
+        inc_60d=float(inc_60d),
+        # ATR/收盘价比值
+        atr_rate=float(atr_rate),
+        # 连续2日布林带%B
+        bb_percent_b1=kernel['bb_percent_b1'],
+        bb_percent_b2=kernel['bb_percent_b2'],
+        ma5=float(averages['ma5'][-1]),
+        ma10=float(averages['ma10'][-1]),
+        ma20=float(averages['ma20'][-1]),
+        volume_ratio=float(averages['volume_ratio'][-1]),
+    )
+
+
+def _calculate_metrics(df: pd.DataFrame) -> Metrics:
     """
     计算技术指标
     
@@ -65,74 +387,11 @@ def _calculate_metrics(df: pd.DataFrame) -> pd.DataFrame:
     - 20日日均成交额
     - MA5, MA10, MA20: 移动平均线
     - Volume_Ratio: 量比（今日成交量 / 5日平均成交量）
+
+    df 需已按日期升序排列（由 _clean_data 保证），此处不再复制和排序。
     """
-    result = {}
-    df = df.copy().sort_values("date").reset_index(drop=True)
-    # 当日, 20日成交额
-    result['amount'] = df['amount'].iloc[-1]
-    result['amount_ma20'] = df['amount'].rolling(window=20).mean().iloc[-1]
-    # ema5, ema10, ema50, ema120
-    ema5 = df['close'].ewm(span=5, adjust=False).mean()
-    ema10 = df['close'].ewm(span=10, adjust=False).mean()
-    ema50 = df['close'].ewm(span=50, adjust=False).mean()
-    ema200 = df['close'].ewm(span=200, adjust=False).mean()
-    result['close'] = df['close'].iloc[-1]
-    result['ema5'] = ema5.iloc[-1]
-    result['ema10'] = ema10.iloc[-1]
-    result['ema50'] = ema50.iloc[-1]
-    result['ema200'] = ema200.iloc[-1]
-    # ema120斜率
-    result['ema200_slop'] = (ema200.iloc[-1] - ema200.iloc[-2]) / ema200.iloc[-2] * 100
-    # ema5 上穿 ema10的金叉, 下穿的死叉
-    is_golden_cross = ((ema5 > ema10) & (ema5.shift(1) <= ema10.shift(1)))
-    is_death_cross = ((ema5 < ema10) & (ema5.shift(1) >= ema10.shift(1)))
-    # 金叉间隔交易日期
-    cross_days = df[is_golden_cross].index.tolist()
-    gloden_cross_days = -1
-    if len(cross_days) > 0:
-        gloden_cross_days = len(df) - 1 - cross_days[-1]
-    result['gloden_cross_days'] = gloden_cross_days
-    # 10个交易日内金死叉交叉次数
-    is_cross = (is_golden_cross | is_death_cross).astype(int)
-    cross_count = is_cross.iloc[-10:].sum() if len(df) >= 10 else is_cross.sum()
-    result['cross_count_10d'] = cross_count
-    # macd
-    macd_calc = MACD(
-        close=df["close"],
-        window_fast=12,   # 快线周期
-        window_slow=26,   # 慢线周期
-        window_sign=9     # 信号线周期
-    )
-    macd_histogram = macd_calc.macd_diff() # Histogram = DIF - DEA
-    result['macd_histogram'] = float(macd_histogram.iloc[-1])
-    # ema120偏离比例
-    result['ema200_deviation_rate'] = ((result['ema200'] - result['close']) / result['ema200']) * 100
-    # 20日, 60日涨幅
-    current_price = df["close"].iloc[-1]
-    price_20d_ago = df["close"].iloc[-21]
-    price_60d_ago = df["close"].iloc[-61]
-    result['20d_inc'] = ((current_price - price_20d_ago) / price_20d_ago) * 100
-    result['60d_inc'] = ((current_price - price_60d_ago) / price_60d_ago) * 100
-    # ATR/收盘价比值
-    current_price = df["close"].iloc[-1]
-    atr_calculator = AverageTrueRange(
-        high=df["high"],
-        low=df["low"],
-        close=df["close"],
-        window=14
-    )
-    atr = atr_calculator.average_true_range().iloc[-1]
-    atr_ratio = (float(atr) / float(current_price)) * 100
-    result['atr_rate'] = atr_ratio
-    # 连续2日布林带%B
-    bb = BollingerBands(close=df["close"], window=20, window_dev=2)
-    bb_high = bb.bollinger_hband()   # 上轨
-    bb_mid = bb.bollinger_mavg()     # 中轨（20日SMA）
-    bb_low = bb.bollinger_lband()    # 下轨
-    bb_percent_b = (df["close"] - bb_low) / (bb_high - bb_low).iloc[-2:]
-    result['bb_percent_b1'] = bb_percent_b.iloc[-1]
-    result['bb_percent_b2'] = bb_percent_b.iloc[-2]
-    return result
+    data = OHLCV.from_frame(df)
+    return _compute_metrics(data.close, data.high, data.low, data.volume, data.amount)
 
 class BaseFetcher(ABC):
     """
@@ -151,6 +410,33 @@ class BaseFetcher(ABC):
     name: str = "BaseFetcher"
     priority: int = 99  # 优先级数字越小越优先
     
+    # 共享 HTTP 会话（由 DataFetcherManager 注入，复用连接池与 keep-alive）
+    http_session: Optional[Any] = None
+    
+    def set_http_session(self, session: Any) -> None:
+        """注入共享 HTTP 会话（requests.Session）"""
+        self.http_session = session
+    
+    def _http(self) -> Any:
+        """返回共享 HTTP 会话，未注入时退化为 requests 模块（每次请求新建连接）"""
+        if self.http_session is not None:
+            return self.http_session
+        import requests
+        return requests
+    
+    # 限流冷却：最近一次被限流后的冷却期内，请求前随机休眠
+    rate_limit_cooldown: float = 60.0
+    last_rate_limit_ts: float = 0.0  # time.monotonic() 时间戳，0 表示从未被限流
+    
+    def mark_rate_limited(self) -> None:
+        """记录数据源被限流的时间"""
+        self.last_rate_limit_ts = time.monotonic()
+    
+    def rate_limit_backoff(self) -> None:
+        """仅在最近被限流的冷却期内随机休眠，正常状态下不等待"""
+        if self.last_rate_limit_ts and time.monotonic() - self.last_rate_limit_ts < self.rate_limit_cooldown:
+            self.random_sleep(2.0, 5.0)
+    
     @abstractmethod
     def _fetch_raw_data(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
@@ -251,24 +537,13 @@ class BaseFetcher(ABC):
         
         if start_date is None:
             # 默认获取最近 30 个交易日（按日历日估算，多取一些）
-            from datetime import timedelta
-            start_dt = datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days * 2)
-            start_date = start_dt.strftime('%Y-%m-%d')
+            start_date = _estimate_start_date(end_date, days)
         
         logger.info(f"[{self.name}] 获取 {stock_code} 数据: {start_date} ~ {end_date}")
         
         try:
-            # Step 1: 获取原始数据
-            raw_df = self._fetch_raw_data(stock_code, start_date, end_date)
-            
-            if raw_df is None or raw_df.empty:
-                raise DataFetchError(f"[{self.name}] 未获取到 {stock_code} 的数据")
-            
-            # Step 2: 标准化列名
-            df = self._normalize_data(raw_df, stock_code)
-            
-            # Step 3: 数据清洗
-            df = self._clean_data(df)
+            # Step 1-3: 获取原始数据、标准化列名、数据清洗
+            df = self._fetch_clean_data(stock_code, start_date, end_date)
             
             # Step 4: 计算技术指标
             result = calculate_fn(df)
@@ -283,7 +558,8 @@ class BaseFetcher(ABC):
         stock_code: str, 
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        days: int = 30
+        days: int = 30,
+        trim: bool = False
     ) -> pd.DataFrame:
         """
         获取日线数据（统一入口）
@@ -299,6 +575,8 @@ class BaseFetcher(ABC):
             start_date: 开始日期（可选）
             end_date: 结束日期（可选，默认今天）
             days: 获取天数（当 start_date 未指定时使用）
+            trim: 未指定 start_date 时是否只保留截至 end_date 的最近 days 个交易日；
+                默认返回按日历日估算多取的全部数据（部分调用方依赖多取的行）
             
         Returns:
             标准化的 DataFrame，包含技术指标
@@ -307,30 +585,26 @@ class BaseFetcher(ABC):
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
         
+        trim_to_days = trim and start_date is None
         if start_date is None:
             # 默认获取最近 30 个交易日（按日历日估算，多取一些）
-            from datetime import timedelta
-            start_dt = datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days * 2)
-            start_date = start_dt.strftime('%Y-%m-%d')
+            start_date = _estimate_start_date(end_date, days)
         
         logger.info(f"[{self.name}] 获取 {stock_code} 数据: {start_date} ~ {end_date}")
         
         try:
-            # Step 1: 获取原始数据
-            raw_df = self._fetch_raw_data(stock_code, start_date, end_date)
-            
-            if raw_df is None or raw_df.empty:
-                raise DataFetchError(f"[{self.name}] 未获取到 {stock_code} 的数据")
-            
-            # Step 2: 标准化列名
-            df = self._normalize_data(raw_df, stock_code)
-            
-            # Step 3: 数据清洗
-            df = self._clean_data(df)
+            # Step 1-3: 获取原始数据、标准化列名、数据清洗
+            df = self._fetch_clean_data(stock_code, start_date, end_date)
             
             # Step 4: 计算技术指标
             df = self._calculate_indicators(df)
             
+            # Step 5: 按需二分定位 end_date 并截取最近 days 个交易日
+            # （在指标计算之后截取，保留前面数据对均线的预热）
+            if trim_to_days:
+                end_idx = int(df['date'].searchsorted(pd.Timestamp(end_date), side='right'))
+                df = df.iloc[max(0, end_idx - days):end_idx].reset_index(drop=True)
+            
             logger.info(f"[{self.name}] {stock_code} 获取成功，共 {len(df)} 条数据")
             return df
             
@@ -338,6 +612,18 @@ class BaseFetcher(ABC):
             logger.error(f"[{self.name}] 获取 {stock_code} 失败: {str(e)}")
             raise DataFetchError(f"[{self.name}] {stock_code}: {str(e)}") from e
     
+    def _fetch_clean_data(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        获取原始数据并标准化、清洗（get_daily_data / get_daily_data_with_fn 共用）
+        """
+        raw_df = self._fetch_raw_data(stock_code, start_date, end_date)
+        
+        if raw_df is None or raw_df.empty:
+            raise DataFetchError(f"[{self.name}] 未获取到 {stock_code} 的数据")
+        
+        df = self._normalize_data(raw_df, stock_code)
+        return self._clean_data(df)
+    
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         数据清洗
@@ -347,18 +633,25 @@ class BaseFetcher(ABC):
         2. 数值类型转换
         3. 去除空值行
         4. 按日期排序
+
+        转换后的列通过一次 assign 写回新对象，不修改也不预先复制传入的 df。
         """
-        df = df.copy()
+        converted = {}
         
         # 确保日期列为 datetime 类型
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
+            converted['date'] = pd.to_datetime(df['date'])
         
         # 数值列类型转换
         numeric_cols = ['open', 'high', 'low', 'close', 'volume', 'amount', 'pct_chg']
         for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            if col not in df.columns:
+                continue
+            # 多数数据源已返回数值类型，只对字符串/object 列做解析
+            if df[col].dtype.kind not in 'fiu':
+                converted[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        df = df.assign(**converted)
         
         # 去除关键列为空的行
         df = df.dropna(subset=['close', 'volume'])
@@ -378,20 +671,12 @@ class BaseFetcher(ABC):
         """
         df = df.copy()
         
-        # 移动平均线
-        df['ma5'] = df['close'].rolling(window=5, min_periods=1).mean()
-        df['ma10'] = df['close'].rolling(window=10, min_periods=1).mean()
-        df['ma20'] = df['close'].rolling(window=20, min_periods=1).mean()
-        
-        # 量比：当日成交量 / 5日平均成交量
-        avg_volume_5 = df['volume'].rolling(window=5, min_periods=1).mean()
-        df['volume_ratio'] = df['volume'] / avg_volume_5.shift(1)
-        df['volume_ratio'] = df['volume_ratio'].fillna(1.0)
-        
-        # 保留2位小数
-        for col in ['ma5', 'ma10', 'ma20', 'volume_ratio']:
-            if col in df.columns:
-                df[col] = df[col].round(2)
+        averages = _moving_averages(
+            df['close'].to_numpy(dtype=np.float64),
+            df['volume'].to_numpy(dtype=np.float64),
+        )
+        for col, values in averages.items():
+            df[col] = values
         
         return df
     
@@ -145,7 +145,7 @@ class TushareFetcher(BaseFetcher):
                 'params': kwargs,
                 'fields': fields,
             }
-            res = requests.post(TUSHARE_API_URL, json=req_params, timeout=_timeout)
+            res = self._http().post(TUSHARE_API_URL, json=req_params, timeout=_timeout)
             if res.status_code != 200:
                 raise Exception(f"Tushare API HTTP {res.status_code}")
             result = _json.loads(res.text)
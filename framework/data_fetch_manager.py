@@ -1,28 +1,328 @@
 # -*- coding: utf-8 -*-
 
+import atexit
+import bisect
+import copy
+import functools
 import logging
+import operator
 import random
+import threading
 import time
-import random
+import weakref
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Optional, List, Tuple, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Optional, List, Tuple, Dict, Any, Callable, Iterator, FrozenSet
 
 import pandas as pd
 import numpy as np
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
 
-from data_fetcher.base import BaseFetcher, DataFetchError, RateLimitError, DataSourceUnavailableError
+from data_fetcher.base import (
+    BaseFetcher, DataFetchError, RateLimitError, DataSourceUnavailableError, Metrics
+)
+from data_fetcher.realtime_types import UnifiedRealtimeQuote, RealtimeSource, get_chip_circuit_breaker
+from utils.cache import MISSING, cached, get_cache
 from utils.config import FetcherArgs
+from utils.http import create_http_session
 from utils.logger import Logger
 
 logger = Logger(__name__)
 
+# 磁盘缓存有效期（秒）；日线数据在工作日收盘前另见 daily_data_ttl
+DAILY_CACHE_TTL = 24 * 3600
+INCOME_CACHE_TTL = 24 * 3600
+INDUSTRY_CACHE_TTL = 7 * 24 * 3600
+# 批量查询财报时，股票数达到该值才拉取全市场业绩报表，否则逐只查询
+INCOME_BULK_MIN_CODES = 100
+# 批量查询行业时，股票数达到该值才拉取全市场行业映射（约 90 次请求），否则逐只查询
+INDUSTRY_BULK_MIN_CODES = 100
+# 逐只查询行业时的并发线程数（单个数据源的并发仍受 SOURCE_MAX_CONCURRENCY 限制）
+INDUSTRY_LOOKUP_WORKERS = 8
+CHIP_CACHE_TTL = 24 * 3600
+# 个股日线分析/财报结果的进程内缓存条目上限（同一进程内重复筛选时免去磁盘读取与反序列化）
+MEMORY_CACHE_SIZE = 4096
+
+# 数据源排序键：优先级数字越小越优先
+_by_priority = operator.attrgetter('priority')
+
+# 默认数据源（按初始化顺序，同优先级时靠前者优先）
+DEFAULT_FETCHERS = (
+    "EfinanceFetcher",
+    "AkshareFetcher",
+    "TushareFetcher",
+    "PytdxFetcher",
+    "BaostockFetcher",
+    "YfinanceFetcher",
+)
+
+# 股票名称缓存上限（LRU 淘汰）
+NAME_CACHE_MAX = 20000
+# 股票名称有效期（秒，按条目从获取时算起）与磁盘缓存键
+NAME_CACHE_TTL = 30 * 24 * 3600
+_NAME_CACHE_KEY = "stock_names_by_code"
+
+# 批量获取股票名称时，逐个查询剩余股票的并发数；单个数据源的并发上限（防封禁）
+NAME_LOOKUP_WORKERS = 16
+SOURCE_MAX_CONCURRENCY = 4
+# 数据源明确限流（RateLimitError）时的最多尝试次数
+RATE_LIMIT_ATTEMPTS = 2
+
+# 实时行情缓存有效期（秒）：交易时段 / 非交易时段 / 获取失败
+QUOTE_TTL_TRADING = 5
+QUOTE_TTL_CLOSED = 3600
+QUOTE_NEGATIVE_TTL = 30
+# 实时行情进程内缓存条目上限
+QUOTE_CACHE_SIZE = 8192
+# 交易时段内日线分析结果的进程内缓存有效期（秒）
+DAILY_MEMORY_TTL_TRADING = 300
+
+# A 股交易所时区（无夏令时，使用固定偏移，无需 tzdata）
+_CN_TZ = timezone(timedelta(hours=8))
+
+
+@functools.lru_cache(maxsize=1)
+def _is_trading_session(epoch_second: int) -> bool:
+    """判断给定时间（秒级，按秒缓存）是否处于 A 股交易时段（工作日 9:30-15:00）"""
+    now = datetime.fromtimestamp(epoch_second, _CN_TZ)
+    if now.weekday() >= 5:
+        return False
+    return 930 <= now.hour * 100 + now.minute < 1500
+
+
+def realtime_quote_ttl() -> float:
+    """实时行情缓存有效期：交易时段内很短，收盘后行情不再变化可缓存较久"""
+    return QUOTE_TTL_TRADING if _is_trading_session(int(time.time())) else QUOTE_TTL_CLOSED
+
+
+def daily_data_ttl() -> float:
+    """日线缓存有效期：工作日收盘前获取的数据含未完成的当日 K 线，只缓存到当日 15:00"""
+    now = datetime.now(_CN_TZ)
+    market_close = now.replace(hour=15, minute=0, second=0, microsecond=0)
+    if now.weekday() < 5 and now < market_close:
+        return (market_close - now).total_seconds()
+    return DAILY_CACHE_TTL
+
+
+def daily_memory_ttl() -> float:
+    """日线分析结果的进程内缓存有效期：交易时段内当日 K 线仍在变化，只保留 DAILY_MEMORY_TTL_TRADING 秒"""
+    if _is_trading_session(int(time.time())):
+        return DAILY_MEMORY_TTL_TRADING
+    return daily_data_ttl()
+
+
+# 请求合并：等待其他线程进行中请求的超时时间（秒）
+SINGLE_FLIGHT_TIMEOUT = 30
+
+# 全量行情快照有效期（秒）：预取后单股行情直接从快照读取
+BULK_QUOTE_TTL = 30
+
+# 全量行情列名 -> UnifiedRealtimeQuote 字段（兼容东财/efinance 中文列名与英文列名）
+_BULK_QUOTE_COLUMNS = {
+    'price': ('最新价', 'price'),
+    'change_pct': ('涨跌幅', 'pct_chg'),
+    'change_amount': ('涨跌额', 'change'),
+    'volume': ('成交量', 'volume'),
+    'amount': ('amount', '成交额'),
+    'volume_ratio': ('量比', 'volume_ratio'),
+    'turnover_rate': ('换手率', 'turnover_rate'),
+    'amplitude': ('振幅', 'amplitude'),
+    'open_price': ('今开', '开盘', 'open'),
+    'high': ('最高', 'high'),
+    'low': ('最低', 'low'),
+    'pre_close': ('昨收', 'pre_close'),
+    'pe_ratio': ('市盈率-动态', '市盈率', 'pe_ratio'),
+    'pb_ratio': ('市净率', 'pb_ratio'),
+    'total_mv': ('total_mv', '总市值'),
+    'circ_mv': ('流通市值', 'circ_mv'),
+    'change_60d': ('60日涨跌幅',),
+    'high_52w': ('52周最高',),
+    'low_52w': ('52周最低',),
+}
+
+# 全量接口数据源 -> 行情来源标记
+_BULK_QUOTE_SOURCES = {
+    'efinance': RealtimeSource.EFINANCE,
+    'akshare_em': RealtimeSource.AKSHARE_EM,
+    'tushare': RealtimeSource.TUSHARE,
+}
+
+
+def _quotes_from_frame(df: pd.DataFrame, source: RealtimeSource) -> Dict[str, UnifiedRealtimeQuote]:
+    """
+    将全量实时行情 DataFrame 转换为 {股票代码: UnifiedRealtimeQuote}
+
+    按列整体转换数值（无法解析的值为 None），避免逐行 iterrows。
+    """
+    if df is None or df.empty or 'code' not in df.columns:
+        return {}
+    
+    codes = df['code'].astype(str).tolist()
+    names = df['name'].astype(str).tolist() if 'name' in df.columns else [''] * len(codes)
+    
+    columns = {}
+    for field_name, candidates in _BULK_QUOTE_COLUMNS.items():
+        col = next((c for c in candidates if c in df.columns), None)
+        if col is None:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64).tolist()
+        if field_name == 'volume':
+            columns[field_name] = [None if v != v else int(v) for v in values]
+        else:
+            columns[field_name] = [None if v != v else v for v in values]
+    
+    return {
+        code: UnifiedRealtimeQuote(
+            code=code,
+            name=name,
+            source=source,
+            **{field_name: values[i] for field_name, values in columns.items()}
+        )
+        for i, (code, name) in enumerate(zip(codes, names))
+    }
+
+
+# 数据源 -> (Fetcher 名称, 调用参数)
+_BULK_SOURCE_TABLE = {
+    "efinance": ("EfinanceFetcher", {}),
+    "akshare_em": ("AkshareFetcher", {"source": "em"}),
+    # TushareFetcher 需要 Tushare Pro 积分
+    "tushare": ("TushareFetcher", {}),
+}
+_REALTIME_SOURCE_TABLE = {
+    **_BULK_SOURCE_TABLE,
+    "akshare_sina": ("AkshareFetcher", {"source": "sina"}),
+    "tencent": ("AkshareFetcher", {"source": "tencent"}),
+    "akshare_qq": ("AkshareFetcher", {"source": "tencent"}),
+}
+
+# 构建分发表时预先检查的数据源方法
+_CAPABILITIES = (
+    'get_income_data',
+    'get_income_map',
+    'get_industry_info',
+    'get_industry_map',
+    'get_all_realtime_quote',
+    'get_realtime_quote',
+    'get_chip_distribution',
+    'get_stock_name',
+    'get_stock_list',
+)
+
+# 对冲请求（FetcherArgs.hedge_width > 1）使用的线程池
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fetch-hedge")
+
+
+def _iter_completed(
+    calls: List[Tuple[str, Callable[[], Any]]],
+    errors: List[str],
+    timeout: Optional[float] = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    并发执行一组数据源调用，按完成顺序产出成功的结果
+
+    失败的调用记录到 errors 中；迭代结束（或提前退出）时取消尚未开始的调用。
+    只有一个调用且不限超时时（默认 hedge_width=1）直接在当前线程执行，不经过线程池。
+
+    Args:
+        calls: [(数据源名称, 无参调用)] 列表
+        errors: 失败信息收集列表
+        timeout: 等待超时时间（秒），None 表示不限
+
+    Yields:
+        (数据源名称, 返回结果)
+    """
+    if len(calls) == 1 and timeout is None:
+        name, call = calls[0]
+        try:
+            result = call()
+        except Exception as e:
+            error_msg = f"[{name}] 失败: {str(e)}"
+            logger.warning(error_msg)
+            errors.append(error_msg)
+            return
+        yield name, result
+        return
+
+    futures = {_hedge_executor.submit(call): name for name, call in calls}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                error_msg = f"[{name}] 失败: {str(e)}"
+                logger.warning(error_msg)
+                errors.append(error_msg)
+                continue
+            yield name, result
+    except FuturesTimeoutError:
+        error_msg = f"[{', '.join(futures.values())}] 超时（{timeout}s）"
+        logger.warning(error_msg)
+        errors.append(error_msg)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _race(
+    calls: List[Tuple[str, Callable[[], Any]]],
+    is_valid: Callable[[Any], bool],
+    errors: List[str],
+    timeout: Optional[float] = None
+) -> Optional[Tuple[str, Any]]:
+    """
+    对冲请求：并发执行一组数据源调用，返回最先得到的有效结果，其余调用取消
+
+    Returns:
+        (数据源名称, 结果)，全部失败返回 None
+    """
+    for name, result in _iter_completed(calls, errors, timeout):
+        if is_valid(result):
+            return name, result
+    return None
+
+
+def _call_with_backoff(fetcher: BaseFetcher, method: str, *args, **kwargs) -> Any:
+    """
+    调用数据源方法，仅在数据源明确限流（RateLimitError）时重试
+
+    重试前的等待只由 fetcher.rate_limit_backoff() 负责：限流后的冷却期内随机休眠，
+    正常状态下不等待。最多尝试 RATE_LIMIT_ATTEMPTS 次。
+    """
+    for attempt in range(1, RATE_LIMIT_ATTEMPTS + 1):
+        fetcher.rate_limit_backoff()
+        try:
+            return getattr(fetcher, method)(*args, **kwargs)
+        except Exception as e:
+            # 数据源可能将 RateLimitError 包装为 DataFetchError 抛出
+            if not (isinstance(e, RateLimitError) or isinstance(e.__cause__, RateLimitError)):
+                raise
+            fetcher.mark_rate_limited()
+            if attempt == RATE_LIMIT_ATTEMPTS:
+                if isinstance(e, RateLimitError):
+                    raise
+                raise RateLimitError(str(e)) from e
+            logger.warning(f"[{fetcher.name}] {method} 被限流，冷却后重试 ({attempt}/{RATE_LIMIT_ATTEMPTS})")
+
+
+# 存活的管理器实例（弱引用），进程退出时统一写回股票名称缓存
+_live_managers: "weakref.WeakSet[DataFetcherManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_stock_names() -> None:
+    """进程退出时将所有存活管理器的股票名称缓存写回磁盘"""
+    for manager in list(_live_managers):
+        try:
+            manager._save_stock_names()
+        except Exception as e:
+            logger.debug(f"[股票名称] 写回磁盘缓存失败: {e}")
+
 
 class DataFetcherManager:
     """
@@ -34,8 +334,8 @@ class DataFetcherManager:
     3. 提供统一的数据获取接口
     
     切换策略：
-    - 优先使用高优先级数据源
-    - 失败后自动切换到下一个
+    - 优先使用高优先级数据源，每批请求 args.hedge_width 个（默认 1，即逐个切换）
+    - 整批失败后自动切换到下一批
     - 所有数据源都失败时抛出异常
     """
     
@@ -49,12 +349,75 @@ class DataFetcherManager:
         self.args = args
         self._fetchers: List[BaseFetcher] = []
         
+        # 数据源优先级解析缓存（见 priority_sources）
+        self._priority_raw: Optional[str] = None
+        self._priority_sources: Tuple[str, ...] = ()
+        
+        # 个股请求节流：下一个请求可发起的时刻（time.monotonic），见 _pace_request
+        self._next_request_ts = 0.0
+        self._pace_lock = threading.Lock()
+        
+        # 进行中的请求（single-flight 合并并发的相同请求）
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # 全量行情快照（由 prefetch_realtime_quotes 启用，过期后惰性刷新）
+        self._bulk_quote_enabled = False
+        self._bulk_quote_snapshot: Dict[str, UnifiedRealtimeQuote] = {}
+        self._bulk_quote_ts = 0.0
+        self._bulk_quote_lock = threading.Lock()
+        
+        # 股票名称 LRU 缓存 {代码: (名称, 获取时间)}（持久化到磁盘缓存目录，进程退出时写回）
+        self._stock_name_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._stock_name_lock = threading.Lock()
+        self._stock_names_dirty = False
+        self._load_stock_names()
+        _live_managers.add(self)
+        
+        # 各数据源的并发信号量（按 Fetcher 名称）
+        self._source_semaphores: Dict[str, threading.Semaphore] = {}
+        
         if fetchers:
             # 按优先级排序
-            self._fetchers = sorted(fetchers, key=lambda f: f.priority)
+            self._fetchers = sorted(fetchers, key=_by_priority)
+            self._build_dispatch()
         else:
             # 默认数据源将在首次使用时延迟加载
             self._init_default_fetchers()
+        
+        # 所有数据源共用一个 HTTP 会话
+        self._http = create_http_session()
+        for fetcher in self._fetchers:
+            fetcher.set_http_session(self._http)
+    
+    def _build_dispatch(self) -> None:
+        """根据当前数据源列表构建 名称 -> Fetcher 映射及各方法的分发表"""
+        self._by_name: Dict[str, BaseFetcher] = {f.name: f for f in self._fetchers}
+        for name in self._by_name:
+            self._source_semaphores.setdefault(name, threading.Semaphore(SOURCE_MAX_CONCURRENCY))
+        
+        # 预先判断各数据源支持的方法，避免每次调用时 hasattr
+        self._supports: Dict[str, FrozenSet[str]] = {
+            method: frozenset(f.name for f in self._fetchers if hasattr(f, method))
+            for method in _CAPABILITIES
+        }
+        # 支持各方法的数据源（按优先级）
+        self._fetchers_with: Dict[str, List[BaseFetcher]] = {
+            method: [f for f in self._fetchers if f.name in names]
+            for method, names in self._supports.items()
+        }
+        
+        def dispatch(table, method):
+            return {
+                source: (self._by_name[fetcher_name], kwargs)
+                for source, (fetcher_name, kwargs) in table.items()
+                if fetcher_name in self._supports[method]
+            }
+        
+        self._income_dispatch = dispatch(_BULK_SOURCE_TABLE, 'get_income_data')
+        self._industry_dispatch = dispatch(_BULK_SOURCE_TABLE, 'get_industry_info')
+        self._all_quote_dispatch = dispatch(_BULK_SOURCE_TABLE, 'get_all_realtime_quote')
+        self._realtime_dispatch = dispatch(_REALTIME_SOURCE_TABLE, 'get_realtime_quote')
     
     def _init_default_fetchers(self) -> None:
         """
@@ -70,52 +433,58 @@ class DataFetcherManager:
           3. BaostockFetcher (Priority 3)
           4. YfinanceFetcher (Priority 4)
         """
-        from data_fetcher.efinance_fetcher import EfinanceFetcher
-        from data_fetcher.akshare_fetcher import AkshareFetcher
-        from data_fetcher.tushare_fetcher import TushareFetcher
-        from data_fetcher.pytdx_fetcher import PytdxFetcher
-        from data_fetcher.baostock_fetcher import BaostockFetcher
-        from data_fetcher.yfinance_fetcher import YfinanceFetcher
-
-        # 创建所有数据源实例（优先级在各 Fetcher 的 __init__ 中确定）
-        efinance = EfinanceFetcher(self.args)
-        akshare = AkshareFetcher(self.args)
-        tushare = TushareFetcher(self.args)  # 会根据 Token 配置自动调整优先级
-        pytdx = PytdxFetcher(self.args)      # 通达信数据源
-        baostock = BaostockFetcher(self.args)
-        yfinance = YfinanceFetcher(self.args)
-
-        # 初始化数据源列表
-        self._fetchers = [
-            efinance,
-            akshare,
-            tushare,
-            pytdx,
-            baostock,
-            yfinance,
-        ]
+        import data_fetcher
 
-        # 按优先级排序（Tushare 如果配置了 Token 且初始化成功，优先级为 0）
-        self._fetchers.sort(key=lambda f: f.priority)
+        # 只导入并创建启用的数据源（优先级在各 Fetcher 的 __init__ 中确定，
+        # Tushare 会根据 Token 配置自动调整优先级）
+        enabled = self.args.enabled_fetchers
+        # 按优先级有序插入（Tushare 如果配置了 Token 且初始化成功，优先级最高；同优先级保持初始化顺序）
+        self._fetchers = []
+        for name in DEFAULT_FETCHERS:
+            if enabled is None or name in enabled:
+                bisect.insort(self._fetchers, getattr(data_fetcher, name)(self.args), key=_by_priority)
+        self._build_dispatch()
 
         # 构建优先级说明
         priority_info = ", ".join([f"{f.name}(P{f.priority})" for f in self._fetchers])
         logger.info(f"已初始化 {len(self._fetchers)} 个数据源（按优先级）: {priority_info}")
     
     def add_fetcher(self, fetcher: BaseFetcher) -> None:
-        """添加数据源并重新排序"""
-        self._fetchers.append(fetcher)
-        self._fetchers.sort(key=lambda f: f.priority)
+        """添加数据源（按优先级有序插入）"""
+        fetcher.set_http_session(self._http)
+        bisect.insort(self._fetchers, fetcher, key=_by_priority)
+        self._build_dispatch()
     
+    def _pace_request(self) -> None:
+        """
+        个股请求节流：相邻请求的发起时刻至少间隔 args.request_interval 秒
+
+        在锁内为当前请求预约发起时刻，锁外各线程并发等待，
+        等待与其他线程的网络 I/O 重叠，而不是由结果消费方串行休眠。
+        """
+        interval = self.args.request_interval
+        if not interval or interval <= 0:
+            return
+        with self._pace_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_ts)
+            self._next_request_ts = start_at + interval
+        if start_at > now:
+            time.sleep(start_at - now)
+    
+    @cached(daily_data_ttl, per_day=True, memory_size=MEMORY_CACHE_SIZE, memory_ttl=daily_memory_ttl)
     def get_daily_analyzed_data(
         self, 
         stock_code: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         days: int = 200
-    ) -> Tuple[pd.DataFrame, str]:
+    ) -> Metrics:
         """
-        获取日线数据（自动切换数据源）
+        获取日线数据并计算技术指标（自动切换数据源）
+
+        get_market_analyzed_frame 逐只调用本方法；结果经进程内缓存复用（交易时段内
+        保留 DAILY_MEMORY_TTL_TRADING 秒），同一 Metrics 实例可能被多个调用方共享，调用方只读
         
         故障切换策略：
         1. 从最高优先级数据源开始尝试
@@ -130,39 +499,26 @@ class DataFetcherManager:
             days: 获取天数
             
         Returns:
-            Tuple[DataFrame, str]: (数据, 成功的数据源名称)
+            Metrics: 技术指标结果
             
         Raises:
             DataFetchError: 所有数据源都失败时抛出
         """
-        errors = []
-        time.sleep(random.uniform(2, 5))
-        for fetcher in self._fetchers:
-            try:
-                logger.info(f"尝试使用 [{fetcher.name}] 获取 {stock_code}...")
-                result = fetcher.get_daily_data_with_fn(
-                    stock_code=stock_code,
-                    start_date=start_date,
-                    end_date=end_date,
-                    days=days
-                )
-                
-                if result is not None:
-                    logger.info(f"[{fetcher.name}] 成功获取 {stock_code}")
-                    return result
-                    
-            except Exception as e:
-                error_msg = f"[{fetcher.name}] 失败: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
-                # 继续尝试下一个数据源
-                continue
-        
-        # 所有数据源都失败
-        error_summary = f"所有数据源获取 {stock_code} 失败:\n" + "\n".join(errors)
-        logger.error(error_summary)
-        raise DataFetchError(error_summary)
+        # 结束日期只解析一次，所有数据源共用
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        result, _ = self._hedged_failover(
+            stock_code,
+            'get_daily_data_with_fn',
+            lambda result: result is not None,
+            stock_code=stock_code,
+            start_date=start_date,
+            end_date=end_date,
+            days=days
+        )
+        return result
     
+    @cached(daily_data_ttl, per_day=True)
     def get_daily_data(
         self, 
         stock_code: str,
@@ -191,34 +547,127 @@ class DataFetcherManager:
         Raises:
             DataFetchError: 所有数据源都失败时抛出
         """
-        errors = []
+        # 结束日期只解析一次，所有数据源共用
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
         
-        for fetcher in self._fetchers:
+        return self._hedged_failover(
+            stock_code,
+            'get_daily_data',
+            lambda df: df is not None and not df.empty,
+            stock_code=stock_code,
+            start_date=start_date,
+            end_date=end_date,
+            days=days
+        )
+    
+    def get_market_analyzed_frame(
+        self,
+        stock_codes: List[str],
+        end_date: Optional[str] = None,
+        days: int = 200,
+        max_workers: int = 4
+    ) -> pd.DataFrame:
+        """
+        批量获取多只股票的技术指标快照（按列组织，每行一只股票）
+
+        上游没有全市场历史行情接口，逐只并发调用 get_daily_analyzed_data
+        （经其进程内/磁盘缓存与故障切换），每只股票按自身日期计算指标，结果与单只查询一致。
+
+        Args:
+            stock_codes: 股票代码列表
+            end_date: 结束日期（默认今天）
+            days: 获取天数
+            max_workers: 并发获取日线的线程数
+
+        Returns:
+            index 为股票代码、列为 Metrics 字段的 DataFrame，获取失败的股票不包含在内
+        """
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        codes = list(dict.fromkeys(stock_codes))
+        columns = [f.name for f in fields(Metrics)]
+        if not codes:
+            return pd.DataFrame(columns=columns)
+
+        def load(code: str) -> Optional[Metrics]:
             try:
-                logger.info(f"尝试使用 [{fetcher.name}] 获取 {stock_code}...")
-                df = fetcher.get_daily_data(
-                    stock_code=stock_code,
-                    start_date=start_date,
-                    end_date=end_date,
-                    days=days
-                )
-                
-                if df is not None and not df.empty:
-                    logger.info(f"[{fetcher.name}] 成功获取 {stock_code}")
-                    return df, fetcher.name
-                    
+                return self.get_daily_analyzed_data(code, end_date=end_date, days=days)
             except Exception as e:
-                error_msg = f"[{fetcher.name}] 失败: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
-                # 继续尝试下一个数据源
-                continue
+                logger.error(f"[{code}] 日线获取失败: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(codes)))) as executor:
+            rows = [
+                (code, metrics) for code, metrics in zip(codes, executor.map(load, codes))
+                if metrics is not None
+            ]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+
+        return pd.DataFrame(
+            [[getattr(metrics, col) for col in columns] for _, metrics in rows],
+            index=[code for code, _ in rows],
+            columns=columns,
+        )
+
+    def _hedged_failover(
+        self,
+        stock_code: str,
+        method: str,
+        is_valid: Callable[[Any], bool],
+        /,
+        **kwargs
+    ) -> Tuple[Any, str]:
+        """
+        按优先级分批对冲请求各数据源的 method 方法
+        
+        每批请求 args.hedge_width 个数据源（默认 1），返回最先成功的结果；
+        整批失败后切换到下一批，所有数据源都失败时抛出 DataFetchError。
+        每批请求发起前按 args.request_interval 节流（缓存命中不经过此处）。
+        
+        Returns:
+            Tuple[Any, str]: (结果, 成功的数据源名称)
+        """
+        errors = []
+        width = self._hedge_width
+        for i in range(0, len(self._fetchers), width):
+            batch = self._fetchers[i:i + width]
+            self._pace_request()
+            logger.info(f"尝试使用 [{', '.join(f.name for f in batch)}] 获取 {stock_code}...")
+            winner = _race(
+                [(f.name, partial(_call_with_backoff, f, method, **kwargs)) for f in batch],
+                is_valid,
+                errors
+            )
+            if winner is not None:
+                name, result = winner
+                logger.info(f"[{name}] 成功获取 {stock_code}")
+                return result, name
         
         # 所有数据源都失败
         error_summary = f"所有数据源获取 {stock_code} 失败:\n" + "\n".join(errors)
         logger.error(error_summary)
         raise DataFetchError(error_summary)
     
+    @property
+    def _hedge_width(self) -> int:
+        """同时请求的数据源个数（至少 1）"""
+        return max(1, self.args.hedge_width)
+    
+    @property
+    def priority_sources(self) -> Tuple[str, ...]:
+        """
+        解析后的实时行情数据源优先级（小写、去空白）
+
+        仅在 args.realtime_source_priority 变化时重新解析。
+        """
+        raw = self.args.realtime_source_priority
+        if raw != self._priority_raw:
+            self._priority_sources = tuple(s.strip().lower() for s in raw.split(','))
+            self._priority_raw = raw
+        return self._priority_sources
+    
     @property
     def available_fetchers(self) -> List[str]:
         """返回可用数据源名称列表"""
@@ -252,14 +701,12 @@ class DataFetcherManager:
         # 检查优先级中是否包含全量拉取数据源
         # 注意：新增全量接口（如 tushare_realtime）时需同步更新此列表
         # 全量接口特征：一次 API 调用拉取全市场 5000+ 股票数据
-        priority = self.args.realtime_source_priority.lower()
         bulk_sources = ['efinance', 'akshare_em', 'tushare']  # 全量接口列表
         
         # 如果优先级中前两个都不是全量数据源，跳过预取
         # 因为新浪/腾讯是单股票查询，不需要预取
-        priority_list = [s.strip() for s in priority.split(',')]
         first_bulk_source_index = None
-        for i, source in enumerate(priority_list):
+        for i, source in enumerate(self.priority_sources):
             if source in bulk_sources:
                 first_bulk_source_index = i
                 break
@@ -276,63 +723,68 @@ class DataFetcherManager:
         
         logger.info(f"[预取] 开始批量预取实时行情，共 {len(stock_codes)} 只股票...")
         
-        # 尝试通过 efinance 或 akshare 预取
-        # 只需要调用一次 get_realtime_quote，缓存机制会自动拉取全市场数据
+        # 一次全量拉取填充行情快照，后续 get_realtime_quote 直接从快照读取
         try:
-            # 用第一只股票触发全量拉取
-            first_code = stock_codes[0]
-            quote = self.get_realtime_quote(first_code)
+            self._bulk_quote_enabled = True
+            with self._bulk_quote_lock:
+                self._refresh_bulk_quotes()
             
-            if quote:
-                logger.info(f"[预取] 批量预取完成，缓存已填充")
-                return len(stock_codes)
+            prefetched = sum(1 for code in stock_codes if code in self._bulk_quote_snapshot)
+            if prefetched:
+                logger.info(f"[预取] 批量预取完成，快照命中 {prefetched}/{len(stock_codes)} 只股票")
             else:
                 logger.warning(f"[预取] 批量预取失败，将使用逐个查询模式")
-                return 0
+            return prefetched
                 
         except Exception as e:
             logger.error(f"[预取] 批量预取异常: {e}")
             return 0
+    
+    def _refresh_bulk_quotes(self) -> None:
+        """全量拉取实时行情并重建快照（调用方需持有 _bulk_quote_lock）"""
+        fetched = self._get_all_realtime_quote_with_source()
+        if fetched is None:
+            self._bulk_quote_snapshot = {}
+        else:
+            source, df = fetched
+            self._bulk_quote_snapshot = _quotes_from_frame(df, _BULK_QUOTE_SOURCES[source])
+        # 失败时同样记录时间，避免在有效期内反复全量拉取
+        self._bulk_quote_ts = time.monotonic()
+    
+    def _get_bulk_quote(self, stock_code: str) -> Optional[UnifiedRealtimeQuote]:
+        """
+        从全量行情快照读取单只股票行情
+        
+        快照未启用时返回 None；快照过期时惰性刷新（同一时刻只有一个线程刷新）。
+        """
+        if not self._bulk_quote_enabled:
+            return None
+        
+        if time.monotonic() - self._bulk_quote_ts >= BULK_QUOTE_TTL:
+            with self._bulk_quote_lock:
+                # 获取锁后再次检查，其他线程可能已完成刷新
+                if time.monotonic() - self._bulk_quote_ts >= BULK_QUOTE_TTL:
+                    self._refresh_bulk_quotes()
+        
+        quote = self._bulk_quote_snapshot.get(stock_code)
+        if quote is None or not quote.has_basic_data():
+            return None
+        # 返回副本，避免调用方修改快照
+        return copy.copy(quote)
 
+    @cached(INCOME_CACHE_TTL, per_day=True, memory_size=MEMORY_CACHE_SIZE)
     def get_income_data(self, stock_list: List[str]):
         # 获取配置的数据源优先级
-        source_priority = self.args.realtime_source_priority.split(',')
+        source_priority = self.priority_sources
+        self._pace_request()
         
         errors = []
-        # primary_quote holds the first successful result; we may supplement
-        # missing fields (volume_ratio, turnover_rate, etc.) from later sources.
-        primary_quote = None
-        # 随机等待 2-5 秒，以免封禁
-        time.sleep(random.uniform(2, 5))
-        
         for source in source_priority:
-            source = source.strip().lower()
-            
             try:
                 quote = None
-                if source == "efinance":    
-                    # 尝试 EfinanceFetcher
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "EfinanceFetcher":
-                            if hasattr(fetcher, 'get_income_data'):
-                                quote = fetcher.get_income_data(stock_list)
-                            break
-                
-                elif source == "akshare_em":
-                    # 尝试 AkshareFetcher 东财数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_income_data'):
-                                quote = fetcher.get_income_data(stock_list, source="em")
-                            break
-                
-                elif source == "tushare":
-                    # 尝试 TushareFetcher（需要 Tushare Pro 积分）
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "TushareFetcher":
-                            if hasattr(fetcher, 'get_income_data'):
-                                quote = fetcher.get_income_data(stock_list)
-                            break
+                fetcher, kwargs = self._income_dispatch.get(source, (None, None))
+                if fetcher is not None:
+                    quote = _call_with_backoff(fetcher, 'get_income_data', stock_list, **kwargs)
                 
                 if quote is not None:
                     return quote
@@ -345,12 +797,50 @@ class DataFetcherManager:
 
         # 所有数据源都失败，返回 None（降级兜底）
         if errors:
-            logger.warning(f"[实时行情] 所有数据源均失败，降级处理: {'; '.join(errors)}")
+            logger.warning(f"[财报数据] {stock_list} 所有数据源均失败，降级处理: {'; '.join(errors)}")
         else:
-            logger.warning(f"[实时行情] 无可用数据源")
+            logger.warning(f"[财报数据] {stock_list} 无可用数据源")
         
         return None
 
+    @cached(INCOME_CACHE_TTL, per_day=True)
+    def get_income_map(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        获取全市场 {股票代码: 财报数据} 映射
+
+        按优先级尝试支持批量财报查询的数据源，结果按天缓存。
+        """
+        for fetcher in self._fetchers_with['get_income_map']:
+            try:
+                mapping = _call_with_backoff(fetcher, 'get_income_map')
+                if mapping:
+                    logger.info(f"[财报数据] 从 {fetcher.name} 获取全市场业绩报表，共 {len(mapping)} 只股票")
+                    return mapping
+            except Exception as e:
+                logger.warning(f"[财报数据] {fetcher.name} 获取全市场业绩报表失败: {e}")
+                continue
+        return None
+
+    def get_income_data_batch(self, stock_codes: List[str]) -> pd.DataFrame:
+        """
+        批量获取股票财报数据（一次请求全市场业绩报表后本地筛选）
+
+        股票数量少于 INCOME_BULK_MIN_CODES 或批量数据源不可用时返回空表，
+        调用方对未返回的股票逐只调用 get_income_data。
+
+        Args:
+            stock_codes: 股票代码列表
+
+        Returns:
+            包含 code/period/income/income_inc/profit/profit_inc 列的 DataFrame
+        """
+        columns = ['code', 'period', 'income', 'income_inc', 'profit', 'profit_inc']
+        codes = list(dict.fromkeys(stock_codes))
+        mapping = self.get_income_map() if len(codes) >= INCOME_BULK_MIN_CODES else None
+        if not mapping:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame([mapping[code] for code in codes if code in mapping], columns=columns)
+
     def get_all_realtime_quote(self):
         """
         获取实时行情数据（自动故障切换）
@@ -366,46 +856,30 @@ class DataFetcherManager:
         Returns:
             pd.DataFrame 对象，所有数据源都失败则返回 None
         """
+        fetched = self._get_all_realtime_quote_with_source()
+        return None if fetched is None else fetched[1]
+
+    def _get_all_realtime_quote_with_source(self) -> Optional[Tuple[str, pd.DataFrame]]:
+        """
+        获取全量实时行情数据（自动故障切换）
+
+        Returns:
+            (成功的数据源, DataFrame)，所有数据源都失败则返回 None
+        """
         # 获取配置的数据源优先级
-        source_priority = self.args.realtime_source_priority.split(',')
+        source_priority = self.priority_sources
         
         errors = []
-        # primary_quote holds the first successful result; we may supplement
-        # missing fields (volume_ratio, turnover_rate, etc.) from later sources.
-        primary_quote = None
-        
         for source in source_priority:
-            source = source.strip().lower()
-            
             try:
                 quote = None
-                print(source)
-                if source == "efinance":    
-                    # 尝试 EfinanceFetcher
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "EfinanceFetcher":
-                            if hasattr(fetcher, 'get_all_realtime_quote'):
-                                quote = fetcher.get_all_realtime_quote()
-                            break
-                
-                elif source == "akshare_em":
-                    # 尝试 AkshareFetcher 东财数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_all_realtime_quote'):
-                                quote = fetcher.get_all_realtime_quote(source="em")
-                            break
-                
-                elif source == "tushare":
-                    # 尝试 TushareFetcher（需要 Tushare Pro 积分）
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "TushareFetcher":
-                            if hasattr(fetcher, 'get_all_realtime_quote'):
-                                quote = fetcher.get_all_realtime_quote()
-                            break
+                logger.debug(f"[全量行情] 尝试数据源 {source}")
+                fetcher, kwargs = self._all_quote_dispatch.get(source, (None, None))
+                if fetcher is not None:
+                    quote = fetcher.get_all_realtime_quote(**kwargs)
                 
                 if quote is not None:
-                    return quote
+                    return source, quote
                     
             except Exception as e:
                 error_msg = f"[{source}] 失败: {str(e)}"
@@ -415,51 +889,79 @@ class DataFetcherManager:
 
         # 所有数据源都失败，返回 None（降级兜底）
         if errors:
-            logger.warning(f"[实时行情] 所有数据源均失败，降级处理: {'; '.join(errors)}")
+            logger.warning(f"[全量行情] 所有数据源均失败，降级处理: {'; '.join(errors)}")
         else:
-            logger.warning(f"[实时行情] 无可用数据源")
+            logger.warning(f"[全量行情] 无可用数据源")
         
         return None
 
+    @cached(INDUSTRY_CACHE_TTL)
+    def get_industry_map(self) -> Optional[Dict[str, str]]:
+        """
+        获取全市场 {股票代码: 所属行业} 映射
+
+        按优先级尝试支持批量行业查询的数据源，结果缓存 INDUSTRY_CACHE_TTL。
+        """
+        for fetcher in self._fetchers_with['get_industry_map']:
+            try:
+                mapping = _call_with_backoff(fetcher, 'get_industry_map')
+                if mapping:
+                    logger.info(f"[行业信息] 从 {fetcher.name} 获取全市场行业映射，共 {len(mapping)} 只股票")
+                    return mapping
+            except Exception as e:
+                logger.warning(f"[行业信息] {fetcher.name} 获取全市场行业映射失败: {e}")
+                continue
+        return None
+
+    def get_industry_info_bulk(self, stock_codes: List[str]) -> Dict[str, Any]:
+        """
+        批量获取股票所属行业
+
+        股票数量较多时先用全市场行业映射一次性匹配，未匹配到的再逐只查询。
+
+        Args:
+            stock_codes: 股票代码列表
+
+        Returns:
+            {股票代码: 行业}，获取失败的股票对应 None
+        """
+        result: Dict[str, Any] = {}
+        missing_codes = list(dict.fromkeys(stock_codes))
+
+        if len(missing_codes) >= INDUSTRY_BULK_MIN_CODES:
+            mapping = self.get_industry_map() or {}
+            for code in missing_codes:
+                if code in mapping:
+                    result[code] = mapping[code]
+            missing_codes = [code for code in missing_codes if code not in result]
+            if missing_codes:
+                logger.info(f"[行业信息] 批量匹配 {len(result)} 只，剩余 {len(missing_codes)} 只逐只查询")
+
+        if missing_codes:
+            with ThreadPoolExecutor(max_workers=min(INDUSTRY_LOOKUP_WORKERS, len(missing_codes))) as executor:
+                futures = {executor.submit(self.get_industry_info, code): code for code in missing_codes}
+                for future in as_completed(futures):
+                    code = futures[future]
+                    try:
+                        result[code] = future.result()
+                    except Exception as e:
+                        logger.debug(f"[行业信息] {code} 获取失败: {e}")
+                        result[code] = None
+        return result
+
+    @cached(INDUSTRY_CACHE_TTL)
     def get_industry_info(self, stock_code: str):
         # 获取配置的数据源优先级
-        source_priority = self.args.realtime_source_priority.split(',')
+        source_priority = self.priority_sources
         
         errors = []
-        # primary_quote holds the first successful result; we may supplement
-        # missing fields (volume_ratio, turnover_rate, etc.) from later sources.
-        primary_quote = None
-        # 随机等待 2-5 秒，以免封禁
-        time.sleep(random.uniform(2, 5))
-        
         for source in source_priority:
-            source = source.strip().lower()
-            
             try:
                 quote = None
-                if source == "efinance":    
-                    # 尝试 EfinanceFetcher
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "EfinanceFetcher":
-                            if hasattr(fetcher, 'get_industry_info'):
-                                quote = fetcher.get_industry_info(stock_code)
-                            break
-                
-                elif source == "akshare_em":
-                    # 尝试 AkshareFetcher 东财数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_industry_info'):
-                                quote = fetcher.get_industry_info(stock_code, source="em")
-                            break
-                
-                elif source == "tushare":
-                    # 尝试 TushareFetcher（需要 Tushare Pro 积分）
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "TushareFetcher":
-                            if hasattr(fetcher, 'get_industry_info'):
-                                quote = fetcher.get_industry_info(stock_code)
-                            break
+                fetcher, kwargs = self._industry_dispatch.get(source, (None, None))
+                if fetcher is not None:
+                    with self._source_semaphores[fetcher.name]:
+                        quote = _call_with_backoff(fetcher, 'get_industry_info', stock_code, **kwargs)
                 
                 if quote is not None:
                     return quote
@@ -472,9 +974,9 @@ class DataFetcherManager:
 
         # 所有数据源都失败，返回 None（降级兜底）
         if errors:
-            logger.warning(f"[实时行情] 所有数据源均失败，降级处理: {'; '.join(errors)}")
+            logger.warning(f"[行业信息] {stock_code} 所有数据源均失败，降级处理: {'; '.join(errors)}")
         else:
-            logger.warning(f"[实时行情] 无可用数据源")
+            logger.warning(f"[行业信息] {stock_code} 无可用数据源")
         
         return None
 
@@ -483,6 +985,9 @@ class DataFetcherManager:
         """
         获取实时行情数据（自动故障切换）
         
+        结果（含失败）在内存中缓存：交易时段 QUOTE_TTL_TRADING 秒，
+        收盘后 QUOTE_TTL_CLOSED 秒，失败结果 QUOTE_NEGATIVE_TTL 秒。
+        
         故障切换策略（按配置的优先级）：
         1. 美股：使用 YfinanceFetcher.get_realtime_quote()
         2. EfinanceFetcher.get_realtime_quote()
@@ -497,113 +1002,90 @@ class DataFetcherManager:
         Returns:
             UnifiedRealtimeQuote 对象，所有数据源都失败则返回 None
         """
-        from .realtime_types import get_realtime_circuit_breaker
-        from .akshare_fetcher import _is_us_code
-        
         # 如果实时行情功能被禁用，直接返回 None
         if not self.args.enable_realtime_quote:
             logger.debug(f"[实时行情] 功能已禁用，跳过 {stock_code}")
             return None
         
+        quote = self._get_realtime_quote_cached(stock_code)
+        # 返回副本，避免调用方修改缓存中的行情
+        return None if quote is None else copy.copy(quote)
+    
+    @cached(realtime_quote_ttl, memory_size=QUOTE_CACHE_SIZE, disk=False, negative_ttl=QUOTE_NEGATIVE_TTL)
+    def _get_realtime_quote_cached(self, stock_code: str):
+        """获取实时行情（仅进程内缓存，同一股票的并发查询合并为一次）"""
+        return self._single_flight(f"quote:{stock_code}", partial(self._fetch_realtime_quote, stock_code))
+    
+    def _fetch_realtime_quote(self, stock_code: str):
+        """按优先级从各数据源获取实时行情（不经过缓存）"""
+        from data_fetcher.akshare_fetcher import _is_us_code
+        
         # 美股单独处理，使用 YfinanceFetcher
         if _is_us_code(stock_code):
-            for fetcher in self._fetchers:
-                if fetcher.name == "YfinanceFetcher":
-                    if hasattr(fetcher, 'get_realtime_quote'):
-                        try:
-                            quote = fetcher.get_realtime_quote(stock_code)
-                            if quote is not None:
-                                logger.info(f"[实时行情] 美股 {stock_code} 成功获取 (来源: yfinance)")
-                                return quote
-                        except Exception as e:
-                            logger.warning(f"[实时行情] 美股 {stock_code} 获取失败: {e}")
-                    break
+            if "YfinanceFetcher" in self._supports['get_realtime_quote']:
+                try:
+                    quote = self._by_name["YfinanceFetcher"].get_realtime_quote(stock_code)
+                    if quote is not None:
+                        logger.info(f"[实时行情] 美股 {stock_code} 成功获取 (来源: yfinance)")
+                        return quote
+                except Exception as e:
+                    logger.warning(f"[实时行情] 美股 {stock_code} 获取失败: {e}")
             logger.warning(f"[实时行情] 美股 {stock_code} 无可用数据源")
             return None
         
+        # 已预取全量行情时，直接从快照读取
+        quote = self._get_bulk_quote(stock_code)
+        if quote is not None:
+            logger.debug(f"[实时行情] {stock_code} 命中全量行情快照")
+            return quote
+        
         # 获取配置的数据源优先级
-        source_priority = self.args.realtime_source_priority.split(',')
+        source_priority = self.priority_sources
+        calls = []
+        for source in source_priority:
+            call = self._realtime_quote_call(source, stock_code)
+            if call is not None:
+                calls.append((source, call))
         
         errors = []
         # primary_quote holds the first successful result; we may supplement
         # missing fields (volume_ratio, turnover_rate, etc.) from later sources.
         primary_quote = None
+        supplement_attempts = 0
         
-        for source in source_priority:
-            source = source.strip().lower()
+        idx = 0
+        while idx < len(calls):
+            # 尚无主结果时按 args.hedge_width 请求数据源；仅需补充字段时只再尝试一个
+            width = self._hedge_width if primary_quote is None else 1
+            batch = calls[idx:idx + width]
+            idx += width
             
-            try:
-                quote = None
-                
-                if source == "efinance":
-                    # 尝试 EfinanceFetcher
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "EfinanceFetcher":
-                            if hasattr(fetcher, 'get_realtime_quote'):
-                                quote = fetcher.get_realtime_quote(stock_code)
-                            break
-                
-                elif source == "akshare_em":
-                    # 尝试 AkshareFetcher 东财数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_realtime_quote'):
-                                quote = fetcher.get_realtime_quote(stock_code, source="em")
-                            break
-                
-                elif source == "akshare_sina":
-                    # 尝试 AkshareFetcher 新浪数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_realtime_quote'):
-                                quote = fetcher.get_realtime_quote(stock_code, source="sina")
-                            break
-                
-                elif source in ("tencent", "akshare_qq"):
-                    # 尝试 AkshareFetcher 腾讯数据源
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "AkshareFetcher":
-                            if hasattr(fetcher, 'get_realtime_quote'):
-                                quote = fetcher.get_realtime_quote(stock_code, source="tencent")
-                            break
-                
-                elif source == "tushare":
-                    # 尝试 TushareFetcher（需要 Tushare Pro 积分）
-                    for fetcher in self._fetchers:
-                        if fetcher.name == "TushareFetcher":
-                            if hasattr(fetcher, 'get_realtime_quote'):
-                                quote = fetcher.get_realtime_quote(stock_code)
-                            break
-                
-                if quote is not None and quote.has_basic_data():
-                    if primary_quote is None:
-                        # First successful source becomes primary
-                        primary_quote = quote
-                        logger.info(f"[实时行情] {stock_code} 成功获取 (来源: {source})")
-                        # If all key supplementary fields are present, return early
-                        if not self._quote_needs_supplement(primary_quote):
-                            return primary_quote
-                        # Otherwise, continue to try later sources for missing fields
-                        logger.debug(f"[实时行情] {stock_code} 部分字段缺失，尝试从后续数据源补充")
-                        supplement_attempts = 0
-                    else:
-                        # Supplement missing fields from this source (limit attempts)
-                        supplement_attempts += 1
-                        if supplement_attempts > 1:
-                            logger.debug(f"[实时行情] {stock_code} 补充尝试已达上限，停止继续")
-                            break
-                        merged = self._merge_quote_fields(primary_quote, quote)
-                        if merged:
-                            logger.info(f"[实时行情] {stock_code} 从 {source} 补充了缺失字段: {merged}")
-                        # Stop supplementing once all key fields are filled
-                        if not self._quote_needs_supplement(primary_quote):
-                            break
-                    
-            except Exception as e:
-                error_msg = f"[{source}] 失败: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
-                continue
+            for source, quote in _iter_completed(batch, errors):
+                if quote is None or not quote.has_basic_data():
+                    continue
+                if primary_quote is None:
+                    # First successful source becomes primary
+                    primary_quote = quote
+                    logger.info(f"[实时行情] {stock_code} 成功获取 (来源: {source})")
+                    # If all key supplementary fields are present, return early
+                    if not self._quote_needs_supplement(primary_quote):
+                        return primary_quote
+                    # Otherwise, drain the rest of the batch and later sources for missing fields
+                    logger.debug(f"[实时行情] {stock_code} 部分字段缺失，尝试从后续数据源补充")
+                else:
+                    # Supplement missing fields from this source
+                    supplement_attempts += 1
+                    merged, still_missing = self._merge_quote_fields(primary_quote, quote)
+                    if merged:
+                        logger.info(f"[实时行情] {stock_code} 从 {source} 补充了缺失字段: {merged}")
+                    # Stop supplementing once all key fields are filled
+                    if not still_missing:
+                        return primary_quote
+            
+            # Limit supplement attempts to one source
+            if supplement_attempts >= 1:
+                logger.debug(f"[实时行情] {stock_code} 补充尝试已达上限，停止继续")
+                break
         
         # Return primary even if some fields are still missing
         if primary_quote is not None:
@@ -617,13 +1099,25 @@ class DataFetcherManager:
         
         return None
 
+    def _realtime_quote_call(self, source: str, stock_code: str) -> Optional[Callable[[], Any]]:
+        """
+        构造指定实时行情数据源的调用
+
+        Returns:
+            无参调用，数据源不可用时返回 None
+        """
+        fetcher, kwargs = self._realtime_dispatch.get(source, (None, None))
+        if fetcher is not None:
+            return partial(fetcher.get_realtime_quote, stock_code, **kwargs)
+        return None
+
     # Fields worth supplementing from secondary sources when the primary
     # source returns None for them. Ordered by importance.
-    _SUPPLEMENT_FIELDS = [
+    _SUPPLEMENT_FIELDS = (
         'volume_ratio', 'turnover_rate',
         'pe_ratio', 'pb_ratio', 'total_mv', 'circ_mv',
         'amplitude',
-    ]
+    )
 
     @classmethod
     def _quote_needs_supplement(cls, quote) -> bool:
@@ -634,20 +1128,25 @@ class DataFetcherManager:
         return False
 
     @classmethod
-    def _merge_quote_fields(cls, primary, secondary) -> list:
+    def _merge_quote_fields(cls, primary, secondary) -> Tuple[list, bool]:
         """
         Copy non-None fields from *secondary* into *primary* where
-        *primary* has None. Returns list of field names that were filled.
+        *primary* has None. Returns (list of field names that were filled,
+        whether any key field is still None after the merge).
         """
         filled = []
+        still_missing = False
         for f in cls._SUPPLEMENT_FIELDS:
             if getattr(primary, f, None) is None:
                 val = getattr(secondary, f, None)
                 if val is not None:
                     setattr(primary, f, val)
                     filled.append(f)
-        return filled
+                else:
+                    still_missing = True
+        return filled, still_missing
 
+    @cached(CHIP_CACHE_TTL, per_day=True)
     def get_chip_distribution(self, stock_code: str):
         """
         获取筹码分布数据（带熔断和多数据源降级）
@@ -664,8 +1163,6 @@ class DataFetcherManager:
         Returns:
             ChipDistribution 对象，失败则返回 None
         """
-        from .realtime_types import get_chip_circuit_breaker
-
         # 如果筹码分布功能被禁用，直接返回 None
         if not self.args.enable_chip_distribution:
             logger.debug(f"[筹码分布] 功能已禁用，跳过 {stock_code}")
@@ -686,16 +1183,15 @@ class DataFetcherManager:
                 logger.debug(f"[熔断] {fetcher_name} 筹码接口处于熔断状态，尝试下一个")
                 continue
 
+            if fetcher_name not in self._supports['get_chip_distribution']:
+                continue
+
             try:
-                for fetcher in self._fetchers:
-                    if fetcher.name == fetcher_name:
-                        if hasattr(fetcher, 'get_chip_distribution'):
-                            chip = fetcher.get_chip_distribution(stock_code)
-                            if chip is not None:
-                                circuit_breaker.record_success(source_key)
-                                logger.info(f"[筹码分布] {stock_code} 成功获取 (来源: {fetcher_name})")
-                                return chip
-                        break
+                chip = self._by_name[fetcher_name].get_chip_distribution(stock_code)
+                if chip is not None:
+                    circuit_breaker.record_success(source_key)
+                    logger.info(f"[筹码分布] {stock_code} 成功获取 (来源: {fetcher_name})")
+                    return chip
             except Exception as e:
                 logger.warning(f"[筹码分布] {fetcher_name} 获取 {stock_code} 失败: {e}")
                 circuit_breaker.record_failure(source_key, str(e))
@@ -704,13 +1200,87 @@ class DataFetcherManager:
         logger.warning(f"[筹码分布] {stock_code} 所有数据源均失败")
         return None
 
+    def _single_flight(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        请求合并（single-flight）：同一 key 的并发调用只执行一次 fn，其余调用等待并共享结果
+        
+        等待超时（SINGLE_FLIGHT_TIMEOUT 秒）时自行执行 fn。
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        
+        if not owner:
+            try:
+                return copy.copy(future.result(timeout=SINGLE_FLIGHT_TIMEOUT))
+            except FuturesTimeoutError:
+                logger.debug(f"[请求合并] 等待 {key} 超时，独立请求")
+                return fn()
+        
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _load_stock_names(self) -> None:
+        """从磁盘缓存加载股票名称（跳过获取时间超过 NAME_CACHE_TTL 的条目）"""
+        if not self.args.cache_dir:
+            return
+        stored = get_cache(self.args.cache_dir).get(_NAME_CACHE_KEY)
+        if stored is MISSING:
+            return
+        expire_before = time.time() - NAME_CACHE_TTL
+        fresh = {code: entry for code, entry in stored.items() if entry[1] > expire_before}
+        self._stock_name_cache.update(fresh)
+        logger.info(f"[股票名称] 从磁盘缓存加载 {len(fresh)} 条")
+    
+    def _save_stock_names(self) -> None:
+        """将股票名称缓存写回磁盘（各条目按自身获取时间过期）"""
+        if not self.args.cache_dir or not self._stock_names_dirty:
+            return
+        with self._stock_name_lock:
+            names = dict(self._stock_name_cache)
+            self._stock_names_dirty = False
+        get_cache(self.args.cache_dir).set(_NAME_CACHE_KEY, names, NAME_CACHE_TTL)
+    
+    def _get_cached_name(self, stock_code: str) -> Optional[str]:
+        """读取股票名称缓存（命中时刷新 LRU 顺序，过期条目删除后视为未命中）"""
+        with self._stock_name_lock:
+            entry = self._stock_name_cache.get(stock_code)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > NAME_CACHE_TTL:
+                del self._stock_name_cache[stock_code]
+                return None
+            self._stock_name_cache.move_to_end(stock_code)
+            return entry[0]
+    
+    def _cache_names(self, names: Dict[str, str]) -> None:
+        """写入股票名称缓存，超出上限时淘汰最久未使用的条目"""
+        now = time.time()
+        with self._stock_name_lock:
+            for code, name in names.items():
+                self._stock_name_cache[code] = (name, now)
+                self._stock_name_cache.move_to_end(code)
+            self._stock_names_dirty = True
+            while len(self._stock_name_cache) > NAME_CACHE_MAX:
+                self._stock_name_cache.popitem(last=False)
+    
     def get_stock_name(self, stock_code: str) -> Optional[str]:
         """
         获取股票中文名称（自动切换数据源）
         
         尝试从多个数据源获取股票名称：
-        1. 先从实时行情缓存中获取（如果有）
-        2. 依次尝试各个数据源的 get_stock_name 方法
+        1. 先从名称缓存及全量行情快照中获取（如果有）
+        2. 依次尝试各个数据源的 get_stock_name 方法（不走实时行情查询）
         3. 最后尝试让大模型通过搜索获取（需要外部调用）
         
         Args:
@@ -720,35 +1290,36 @@ class DataFetcherManager:
             股票中文名称，所有数据源都失败则返回 None
         """
         # 1. 先检查缓存
-        if hasattr(self, '_stock_name_cache') and stock_code in self._stock_name_cache:
-            return self._stock_name_cache[stock_code]
-        
-        # 初始化缓存
-        if not hasattr(self, '_stock_name_cache'):
-            self._stock_name_cache = {}
+        name = self._get_cached_name(stock_code)
+        if name is not None:
+            return name
         
-        # 2. 尝试从实时行情中获取（最快）
-        quote = self.get_realtime_quote(stock_code)
-        if quote and hasattr(quote, 'name') and quote.name:
+        # 2. 尝试从全量行情快照中获取（名称不随行情变化，无需刷新快照）
+        quote = self._bulk_quote_snapshot.get(stock_code)
+        if quote is not None and quote.name:
             name = quote.name
-            self._stock_name_cache[stock_code] = name
-            logger.info(f"[股票名称] 从实时行情获取: {stock_code} -> {name}")
+            self._cache_names({stock_code: name})
+            logger.info(f"[股票名称] 从行情快照获取: {stock_code} -> {name}")
             return name
         
-        # 3. 依次尝试各个数据源
-        for fetcher in self._fetchers:
-            if hasattr(fetcher, 'get_stock_name'):
-                try:
+        # 3. 依次尝试各个数据源（同一股票的并发查询合并为一次）
+        return self._single_flight(f"name:{stock_code}", partial(self._fetch_stock_name, stock_code))
+    
+    def _fetch_stock_name(self, stock_code: str) -> Optional[str]:
+        """依次尝试各个数据源的 get_stock_name（不经过缓存）"""
+        for fetcher in self._fetchers_with['get_stock_name']:
+            try:
+                with self._source_semaphores[fetcher.name]:
                     name = fetcher.get_stock_name(stock_code)
-                    if name:
-                        self._stock_name_cache[stock_code] = name
-                        logger.info(f"[股票名称] 从 {fetcher.name} 获取: {stock_code} -> {name}")
-                        return name
-                except Exception as e:
-                    logger.debug(f"[股票名称] {fetcher.name} 获取失败: {e}")
-                    continue
+                if name:
+                    self._cache_names({stock_code: name})
+                    logger.info(f"[股票名称] 从 {fetcher.name} 获取: {stock_code} -> {name}")
+                    return name
+            except Exception as e:
+                logger.debug(f"[股票名称] {fetcher.name} 获取失败: {e}")
+                continue
         
-        # 4. 所有数据源都失败
+        # 所有数据源都失败
         logger.warning(f"[股票名称] 所有数据源都无法获取 {stock_code} 的名称")
         return None
 
@@ -769,31 +1340,31 @@ class DataFetcherManager:
         missing_codes = set(stock_codes)
         
         # 1. 先检查缓存
-        if not hasattr(self, '_stock_name_cache'):
-            self._stock_name_cache = {}
-        
         for code in stock_codes:
-            if code in self._stock_name_cache:
-                result[code] = self._stock_name_cache[code]
+            name = self._get_cached_name(code)
+            if name is not None:
+                result[code] = name
                 missing_codes.discard(code)
         
         if not missing_codes:
             return result
         
         # 2. 尝试批量获取股票列表
-        for fetcher in self._fetchers:
-            if hasattr(fetcher, 'get_stock_list') and missing_codes:
+        for fetcher in self._fetchers_with['get_stock_list']:
+            if missing_codes:
                 try:
                     stock_list = fetcher.get_stock_list()
                     if stock_list is not None and not stock_list.empty:
-                        for _, row in stock_list.iterrows():
-                            code = row.get('code')
-                            name = row.get('name')
-                            if code and name:
-                                self._stock_name_cache[code] = name
-                                if code in missing_codes:
-                                    result[code] = name
-                                    missing_codes.discard(code)
+                        # 按列整体构建 {代码: 名称}，跳过代码或名称为空的行
+                        valid = stock_list[['code', 'name']].dropna()
+                        valid = valid[(valid['code'] != '') & (valid['name'] != '')]
+                        pairs = dict(zip(valid['code'].tolist(), valid['name'].tolist()))
+                        self._cache_names(pairs)
+                        
+                        found = missing_codes.intersection(pairs)
+                        for code in found:
+                            result[code] = pairs[code]
+                        missing_codes -= found
                         
                         if not missing_codes:
                             break
@@ -803,51 +1374,53 @@ class DataFetcherManager:
                     logger.debug(f"[股票名称] {fetcher.name} 批量获取失败: {e}")
                     continue
         
-        # 3. 逐个获取剩余的
-        for code in list(missing_codes):
-            name = self.get_stock_name(code)
-            if name:
-                result[code] = name
-                missing_codes.discard(code)
+        # 3. 并发逐个获取剩余的（单个数据源的并发由信号量限制）
+        if missing_codes:
+            with ThreadPoolExecutor(max_workers=min(NAME_LOOKUP_WORKERS, len(missing_codes))) as executor:
+                futures = {executor.submit(self.get_stock_name, code): code for code in missing_codes}
+                for future in as_completed(futures):
+                    code = futures[future]
+                    try:
+                        name = future.result()
+                    except Exception as e:
+                        logger.debug(f"[股票名称] {code} 获取失败: {e}")
+                        continue
+                    if name:
+                        result[code] = name
         
         logger.info(f"[股票名称] 批量获取完成，成功 {len(result)}/{len(stock_codes)}")
         return result
 
-    def get_main_indices(self) -> List[Dict[str, Any]]:
-        """获取主要指数实时行情（自动切换数据源）"""
+    def _try_all(self, action: str, call: Callable[[BaseFetcher], Any]) -> Any:
+        """
+        按优先级依次调用各数据源，返回第一个非空结果（后续数据源不再调用）
+
+        Args:
+            action: 日志中的操作描述
+            call: 对单个数据源执行的调用
+
+        Returns:
+            第一个非空结果，全部失败返回 None
+        """
         for fetcher in self._fetchers:
             try:
-                data = fetcher.get_main_indices()
-                if data:
-                    logger.info(f"[{fetcher.name}] 获取指数行情成功")
-                    return data
+                data = call(fetcher)
             except Exception as e:
-                logger.warning(f"[{fetcher.name}] 获取指数行情失败: {e}")
+                logger.warning(f"[{fetcher.name}] {action}失败: {e}")
                 continue
-        return []
+            if data:
+                logger.info(f"[{fetcher.name}] {action}成功")
+                return data
+        return None
+
+    def get_main_indices(self) -> List[Dict[str, Any]]:
+        """获取主要指数实时行情（自动切换数据源）"""
+        return self._try_all("获取指数行情", lambda f: f.get_main_indices()) or []
 
     def get_market_stats(self) -> Dict[str, Any]:
         """获取市场涨跌统计（自动切换数据源）"""
-        for fetcher in self._fetchers:
-            try:
-                data = fetcher.get_market_stats()
-                if data:
-                    logger.info(f"[{fetcher.name}] 获取市场统计成功")
-                    return data
-            except Exception as e:
-                logger.warning(f"[{fetcher.name}] 获取市场统计失败: {e}")
-                continue
-        return {}
+        return self._try_all("获取市场统计", lambda f: f.get_market_stats()) or {}
 
     def get_sector_rankings(self, n: int = 5) -> Tuple[List[Dict], List[Dict]]:
         """获取板块涨跌榜（自动切换数据源）"""
-        for fetcher in self._fetchers:
-            try:
-                data = fetcher.get_sector_rankings(n)
-                if data:
-                    logger.info(f"[{fetcher.name}] 获取板块排行成功")
-                    return data
-            except Exception as e:
-                logger.warning(f"[{fetcher.name}] 获取板块排行失败: {e}")
-                continue
-        return [], []
+        return self._try_all("获取板块排行", lambda f: f.get_sector_rankings(n)) or ([], [])
@@ -1,21 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from datetime import date
-from typing import List, Dict, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import os
+from typing import List, Dict, Any
+
 
 class IndustryAnalyzer:
     def __init__(self, fetcher_manager):
         self.fetcher_manager = fetcher_manager
 
-    def get_industry_infos(self, stock_codes, code_infos):
+    def get_industry_infos(self, stock_codes: List[str], code_infos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        industries = self.fetcher_manager.get_industry_info_bulk(stock_codes)
         results = []
         for code, info in zip(stock_codes, code_infos):
-            results.append(self._get_industry_info(code, info))
+            info['行业'] = industries.get(code)
+            results.append(info)
         return results
-
-    def _get_industry_info(self, stock_code, stock_info):
-        industry = self.fetcher_manager.get_industry_info(stock_code)
-        stock_info['行业'] = industry
-        return stock_info
\ No newline at end of file
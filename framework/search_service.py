@@ -1,13 +1,18 @@
+import hashlib
 import logging
-import random
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
-from itertools import cycle
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from itertools import chain, cycle
 import requests
-from newspaper import Article, Config
 
 from searcher import (
     BaseSearchProvider,
@@ -18,10 +23,155 @@ from searcher import (
     SerpAPISearchProvider,
     TavilySearchProvider,
 )
+from utils.cache import MISSING, get_cache
+from utils.http import create_http_session
 from utils.logger import Logger
 
 logger = Logger(__name__)
 
+# 搜索结果缓存条目上限
+SEARCH_CACHE_MAX = 500
+# 美股代码：1-5个字母，可能包含点（如 BRK.B）
+_FOREIGN_US_RE = re.compile(r'^[A-Za-z]{1,5}(?:\.[A-Za-z])?$')
+# 单个搜索引擎的限流参数：突发请求数、每秒补充请求数
+PROVIDER_BURST = 2
+PROVIDER_RATE_PER_SEC = 2.0
+# 搜索请求共用线程池（各搜索引擎均为同步 HTTP 调用）
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="search")
+
+
+@lru_cache(maxsize=4096)
+def _is_foreign_stock(stock_code: str) -> bool:
+    """判断是否为港股或美股"""
+    code = stock_code.strip()
+    # 港股：带 hk 前缀或 5位纯数字
+    if code.lower().startswith('hk'):
+        return True
+    if code.isdigit():
+        return len(code) == 5
+    # 美股：1-5个大写字母，可能包含点（如 BRK.B）
+    return _FOREIGN_US_RE.match(code) is not None
+
+
+# 情报报告的维度描述（按展示顺序）
+_DIM_DESC = {
+    'latest_news': '📰 最新消息',
+    'market_analysis': '📈 机构分析',
+    'risk_check': '⚠️ 风险排查',
+    'earnings': '📊 业绩预期',
+    'industry': '🏭 行业分析',
+}
+
+def _pack_response(response: SearchResponse) -> tuple:
+    """
+    将 SearchResponse 压缩为纯字符串/数值元组用于缓存
+
+    只含不可变原子值的元组不受 GC 追踪、pickle 体积更小；
+    每次命中重建对象，调用方修改结果也不会污染缓存。
+    """
+    return (
+        response.query,
+        response.provider,
+        response.success,
+        response.error_message,
+        response.search_time,
+        tuple((r.title, r.snippet, r.url, r.source, r.published_date) for r in response.results),
+    )
+
+
+def _unpack_response(packed: tuple) -> SearchResponse:
+    """从缓存元组还原 SearchResponse"""
+    query, provider, success, error_message, search_time, results = packed
+    return SearchResponse(
+        query=query,
+        results=[SearchResult(*r) for r in results],
+        provider=provider,
+        success=success,
+        error_message=error_message,
+        search_time=search_time,
+    )
+
+
+# 去重时忽略的跟踪参数（前缀匹配）
+_TRACKING_PARAM_PREFIXES = ('utm_', 'gclid', 'fbclid', 'ref_', 'spm')
+
+
+def _canonicalize_url(url: str) -> str:
+    """规范化 URL 用于去重：协议/域名小写，去掉跟踪参数、锚点和末尾斜杠"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAM_PREFIXES)
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip('/'),
+        urlencode(query),
+        '',
+    ))
+
+
+# 新闻搜索时间范围的缓存有效期（秒）及缓存值 (过期时间戳, 天数)
+NEWS_SEARCH_DAYS_TTL = 60
+_news_search_days_cache: Tuple[float, int] = (0.0, 1)
+
+
+def _news_search_days() -> int:
+    """
+    新闻搜索时间范围（天），结果缓存 NEWS_SEARCH_DAYS_TTL 秒
+
+    策略：
+    1. 周二至周五：搜索近1天（24小时）
+    2. 周六、周日：搜索近2天（覆盖周末）
+    3. 周一：搜索近3天（覆盖周末）
+    """
+    global _news_search_days_cache
+    now = time.time()
+    expire_at, days = _news_search_days_cache
+    if now < expire_at:
+        return days
+    weekday = datetime.fromtimestamp(now).weekday()
+    if weekday == 0:  # 周一
+        days = 3
+    elif weekday >= 5:  # 周六(5)、周日(6)
+        days = 2
+    else:  # 周二(1) - 周五(4)
+        days = 1
+    # 整体替换元组，多线程并发刷新时各自算出相同结果，无需加锁
+    _news_search_days_cache = (now + NEWS_SEARCH_DAYS_TTL, days)
+    return days
+
+
+class TokenBucket:
+    """
+    令牌桶限流器（线程安全）
+
+    桶容量为 capacity，每秒补充 refill_per_sec 个令牌；令牌不足时阻塞等待。
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: float = 1) -> None:
+        """取出 n 个令牌，不足时等待补充"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+            self.last_refill = now
+            # 预先扣除令牌（可为负），保证并发调用按顺序排队
+            self.tokens -= n
+            wait = -self.tokens / self.refill_per_sec if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
 
 class SearchService:
     """
@@ -59,6 +209,7 @@ class SearchService:
         tavily_keys: Optional[List[str]] = None,
         brave_keys: Optional[List[str]] = None,
         serpapi_keys: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
     ):
         """
         初始化搜索服务
@@ -68,6 +219,8 @@ class SearchService:
             tavily_keys: Tavily API Key 列表
             brave_keys: Brave Search API Key 列表
             serpapi_keys: SerpAPI Key 列表
+            cache_dir: 搜索结果磁盘缓存目录（进程重启后仍可复用；默认为空，仅使用内存缓存。
+                缓存为 pickle 文件，只应指向本用户可写的私有目录）
         """
         self._providers: List[BaseSearchProvider] = []
 
@@ -95,27 +248,29 @@ class SearchService:
         if not self._providers:
             logger.warning("未配置任何搜索引擎 API Key，新闻搜索功能将不可用")
 
-        # In-memory search result cache: {cache_key: (timestamp, SearchResponse)}
-        self._cache: Dict[str, Tuple[float, 'SearchResponse']] = {}
+        # 所有搜索引擎共用一个 HTTP 会话（连接池复用，429/5xx 自动重试）
+        self._http = create_http_session(
+            retries=2,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+        )
+        for provider in self._providers:
+            provider.set_http_session(self._http)
+
+        # 每个搜索引擎独立限流，轮换引擎时无需等待
+        self._buckets: Dict[str, TokenBucket] = {
+            p.name: TokenBucket(PROVIDER_BURST, PROVIDER_RATE_PER_SEC) for p in self._providers
+        }
+
+        # In-memory LRU search result cache: {cache_key: (timestamp, packed SearchResponse)}
+        self._cache: 'OrderedDict[str, Tuple[float, tuple]]' = OrderedDict()
         # Default cache TTL in seconds (10 minutes)
         self._cache_ttl: int = 600
+        # Disk-backed second level, shared across restarts and worker processes
+        self._disk_cache = get_cache(cache_dir) if cache_dir else None
+        # Cache may be shared by concurrent batch searches
+        self._cache_lock = threading.Lock()
     
-    @staticmethod
-    def _is_foreign_stock(stock_code: str) -> bool:
-        """判断是否为港股或美股"""
-        import re
-        code = stock_code.strip()
-        # 美股：1-5个大写字母，可能包含点（如 BRK.B）
-        if re.match(r'^[A-Za-z]{1,5}(\.[A-Za-z])?$', code):
-            return True
-        # 港股：带 hk 前缀或 5位纯数字
-        lower = code.lower()
-        if lower.startswith('hk'):
-            return True
-        if code.isdigit() and len(code) == 5:
-            return True
-        return False
-
     @property
     def is_available(self) -> bool:
         """检查是否有可用的搜索引擎"""
@@ -125,36 +280,101 @@ class SearchService:
         """Build a cache key from query parameters."""
         return f"{query}|{max_results}|{days}"
 
+    @staticmethod
+    def _disk_key(key: str) -> str:
+        """Map a cache key to a file-safe disk cache key."""
+        return hashlib.md5(f"search|{key}".encode('utf-8')).hexdigest()
+
     def _get_cached(self, key: str) -> Optional['SearchResponse']:
         """Return cached SearchResponse if still valid, else None."""
-        entry = self._cache.get(key)
-        if entry is None:
+        now = time.time()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if now - entry[0] > self._cache_ttl:
+                    del self._cache[key]
+                else:
+                    self._cache.move_to_end(key)
+                    logger.debug(f"Search cache hit: {key[:60]}...")
+                    return _unpack_response(entry[1])
+
+        # Fall back to the disk cache (e.g. after a restart) and promote to memory
+        if self._disk_cache is None:
             return None
-        ts, response = entry
-        if time.time() - ts > self._cache_ttl:
-            del self._cache[key]
+        entry = self._disk_cache.get(self._disk_key(key))
+        if entry is MISSING or now - entry[0] > self._cache_ttl:
             return None
-        logger.debug(f"Search cache hit: {key[:60]}...")
-        return response
+        with self._cache_lock:
+            self._put_memory(key, entry[0], entry[1])
+        logger.debug(f"Search disk cache hit: {key[:60]}...")
+        return _unpack_response(entry[1])
 
     def _put_cache(self, key: str, response: 'SearchResponse') -> None:
         """Store a successful SearchResponse in cache."""
-        # Hard cap: evict oldest entries when cache exceeds limit
-        _MAX_CACHE_SIZE = 500
-        if len(self._cache) >= _MAX_CACHE_SIZE:
-            now = time.time()
-            # First pass: remove expired entries
-            expired = [k for k, (ts, _) in self._cache.items() if now - ts > self._cache_ttl]
-            for k in expired:
-                del self._cache[k]
-            # Second pass: if still over limit, evict oldest entries (FIFO)
-            if len(self._cache) >= _MAX_CACHE_SIZE:
-                excess = len(self._cache) - _MAX_CACHE_SIZE + 1
-                oldest = sorted(self._cache.keys(), key=lambda k: self._cache[k][0])[:excess]
-                for k in oldest:
-                    del self._cache[k]
-        self._cache[key] = (time.time(), response)
+        now = time.time()
+        packed = _pack_response(response)
+        with self._cache_lock:
+            self._put_memory(key, now, packed)
+        if self._disk_cache is not None:
+            self._disk_cache.set(self._disk_key(key), (now, packed), self._cache_ttl)
+
+    def _put_memory(self, key: str, ts: float, packed: tuple) -> None:
+        """Insert into the in-memory LRU (caller holds _cache_lock)."""
+        # Hard cap: evict least recently used entries when cache exceeds limit
+        self._cache.pop(key, None)
+        while len(self._cache) >= SEARCH_CACHE_MAX:
+            self._cache.popitem(last=False)
+        self._cache[key] = (ts, packed)
     
+    def _provider_search(
+        self,
+        provider: BaseSearchProvider,
+        query: str,
+        max_results: int = 5,
+        days: int = 7
+    ) -> SearchResponse:
+        """按搜索引擎限流后执行搜索"""
+        bucket = self._buckets.get(provider.name)
+        if bucket is None:
+            bucket = self._buckets.setdefault(
+                provider.name, TokenBucket(PROVIDER_BURST, PROVIDER_RATE_PER_SEC)
+            )
+        bucket.consume(1)
+        return provider.search(query, max_results, days=days)
+
+    def _search_first_success(
+        self,
+        query: str,
+        is_valid: Callable[[SearchResponse], bool],
+        max_results: int = 5,
+        days: int = 7
+    ) -> Optional[SearchResponse]:
+        """
+        按优先级依次请求各搜索引擎，返回第一个有效结果
+
+        Args:
+            query: 搜索关键词
+            is_valid: 判断搜索结果是否有效
+            max_results: 最大返回结果数
+            days: 搜索最近几天的时间范围
+
+        Returns:
+            有效的 SearchResponse，全部失败返回 None
+        """
+        for provider in self._providers:
+            if not provider.is_available:
+                continue
+            try:
+                response = self._provider_search(provider, query, max_results, days)
+            except Exception as e:
+                logger.warning(f"{provider.name} 搜索异常: {e}，尝试下一个引擎")
+                continue
+            if is_valid(response):
+                logger.info(f"使用 {provider.name} 搜索成功")
+                return response
+            logger.warning(f"{provider.name} 搜索失败: {response.error_message}，尝试下一个引擎")
+        return None
+
     def search_stock_news(
         self,
         stock_code: str,
@@ -174,21 +394,11 @@ class SearchService:
         Returns:
             SearchResponse 对象
         """
-        # 智能确定搜索时间范围
-        # 策略：
-        # 1. 周二至周五：搜索近1天（24小时）
-        # 2. 周六、周日：搜索近2-3天（覆盖周末）
-        # 3. 周一：搜索近3天（覆盖周末）
-        today_weekday = datetime.now().weekday()
-        if today_weekday == 0: # 周一
-            search_days = 3
-        elif today_weekday >= 5: # 周六(5)、周日(6)
-            search_days = 2
-        else: # 周二(1) - 周五(4)
-            search_days = 1
+        # 智能确定搜索时间范围（按星期几，缓存 NEWS_SEARCH_DAYS_TTL 秒）
+        search_days = _news_search_days()
 
         # 构建搜索查询（优化搜索效果）
-        is_foreign = self._is_foreign_stock(stock_code)
+        is_foreign = _is_foreign_stock(stock_code)
         if focus_keywords:
             # 如果提供了关键词，直接使用关键词作为查询
             query = " ".join(focus_keywords)
@@ -209,18 +419,15 @@ class SearchService:
             return cached
 
         # 依次尝试各个搜索引擎
-        for provider in self._providers:
-            if not provider.is_available:
-                continue
-            
-            response = provider.search(query, max_results, days=search_days)
-            
-            if response.success and response.results:
-                logger.info(f"使用 {provider.name} 搜索成功")
-                self._put_cache(cache_key, response)
-                return response
-            else:
-                logger.warning(f"{provider.name} 搜索失败: {response.error_message}，尝试下一个引擎")
+        response = self._search_first_success(
+            query,
+            lambda r: r.success and bool(r.results),
+            max_results=max_results,
+            days=search_days
+        )
+        if response is not None:
+            self._put_cache(cache_key, response)
+            return response
         
         # 所有引擎都失败
         return SearchResponse(
@@ -251,7 +458,7 @@ class SearchService:
             SearchResponse 对象
         """
         if event_types is None:
-            if self._is_foreign_stock(stock_code):
+            if _is_foreign_stock(stock_code):
                 event_types = ["earnings report", "insider selling", "quarterly results"]
             else:
                 event_types = ["年报预告", "减持公告", "业绩快报"]
@@ -263,14 +470,9 @@ class SearchService:
         logger.info(f"搜索股票事件: {stock_name}({stock_code}) - {event_types}")
         
         # 依次尝试各个搜索引擎
-        for provider in self._providers:
-            if not provider.is_available:
-                continue
-            
-            response = provider.search(query, max_results=5)
-            
-            if response.success:
-                return response
+        response = self._search_first_success(query, lambda r: r.success, max_results=5)
+        if response is not None:
+            return response
         
         return SearchResponse(
             query=query,
@@ -303,10 +505,9 @@ class SearchService:
             {维度名称: SearchResponse} 字典
         """
         results = {}
-        search_count = 0
         
         # 根据股票类型选择搜索关键词语言
-        is_foreign = self._is_foreign_stock(stock_code)
+        is_foreign = _is_foreign_stock(stock_code)
 
         # 定义搜索维度
         if is_foreign:
@@ -368,34 +569,38 @@ class SearchService:
         
         logger.info(f"开始多维度情报搜索: {stock_name}({stock_code})")
         
-        # 轮流使用不同的搜索引擎
-        provider_index = 0
+        # 选择搜索引擎（轮流使用）
+        available_providers = [p for p in self._providers if p.is_available]
+        if not available_providers:
+            return results
         
-        for dim in search_dimensions:
-            if search_count >= max_searches:
-                break
-            
-            # 选择搜索引擎（轮流使用）
-            available_providers = [p for p in self._providers if p.is_available]
-            if not available_providers:
-                break
-            
-            provider = available_providers[provider_index % len(available_providers)]
-            provider_index += 1
-            
+        assignments = list(zip(search_dimensions[:max_searches], cycle(available_providers)))
+        
+        # 各维度相互独立，并发搜索（同一引擎的请求由令牌桶限流）
+        futures = {}
+        for dim, provider in assignments:
             logger.info(f"[情报搜索] {dim['desc']}: 使用 {provider.name}")
-            
-            response = provider.search(dim['query'], max_results=3)
-            results[dim['name']] = response
-            search_count += 1
+            futures[_search_executor.submit(self._provider_search, provider, dim['query'], 3)] = dim
+        
+        responses = {}
+        for future in as_completed(futures):
+            dim = futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.warning(f"[情报搜索] {dim['desc']}: 搜索异常 - {e}")
+                continue
+            responses[dim['name']] = response
             
             if response.success:
                 logger.info(f"[情报搜索] {dim['desc']}: 获取 {len(response.results)} 条结果")
             else:
                 logger.warning(f"[情报搜索] {dim['desc']}: 搜索失败 - {response.error_message}")
-            
-            # 短暂延迟避免请求过快
-            time.sleep(0.5)
+        
+        # 按维度顺序整理结果
+        for dim, _ in assignments:
+            if dim['name'] in responses:
+                results[dim['name']] = responses[dim['name']]
         
         return results
     
@@ -412,32 +617,19 @@ class SearchService:
         """
         lines = [f"【{stock_name} 情报搜索结果】"]
         
-        # 维度展示顺序
-        display_order = ['latest_news', 'market_analysis', 'risk_check', 'earnings', 'industry']
-        
-        for dim_name in display_order:
-            if dim_name not in intel_results:
+        for dim_name, dim_desc in _DIM_DESC.items():
+            resp = intel_results.get(dim_name)
+            if resp is None:
                 continue
-                
-            resp = intel_results[dim_name]
-            
-            # 获取维度描述
-            dim_desc = dim_name
-            if dim_name == 'latest_news': dim_desc = '📰 最新消息'
-            elif dim_name == 'market_analysis': dim_desc = '📈 机构分析'
-            elif dim_name == 'risk_check': dim_desc = '⚠️ 风险排查'
-            elif dim_name == 'earnings': dim_desc = '📊 业绩预期'
-            elif dim_name == 'industry': dim_desc = '🏭 行业分析'
             
             lines.append(f"\n{dim_desc} (来源: {resp.provider}):")
             if resp.success and resp.results:
-                # 增加显示条数
-                for i, r in enumerate(resp.results[:4], 1):
-                    date_str = f" [{r.published_date}]" if r.published_date else ""
-                    lines.append(f"  {i}. {r.title}{date_str}")
-                    # 如果摘要太短，可能信息量不足
-                    snippet = r.snippet[:150] if len(r.snippet) > 20 else r.snippet
-                    lines.append(f"     {snippet}...")
+                # 增加显示条数；每条结果（标题 + 摘要）生成一段文本
+                lines.extend(
+                    f"  {i}. {r.title}{f' [{r.published_date}]' if r.published_date else ''}\n"
+                    f"     {r.snippet[:150]}..."
+                    for i, r in enumerate(resp.results[:4], 1)
+                )
             else:
                 lines.append("  未找到相关信息")
         
@@ -447,32 +639,42 @@ class SearchService:
         self,
         stocks: List[Dict[str, str]],
         max_results_per_stock: int = 3,
-        delay_between: float = 1.0
+        delay_between: Optional[float] = None,
+        max_concurrency: int = 4
     ) -> Dict[str, SearchResponse]:
         """
-        Batch search news for multiple stocks.
+        Batch search news for multiple stocks concurrently.
+        
+        Per-provider pacing is enforced by the token buckets, so no fixed
+        delay between stocks is needed.
         
         Args:
             stocks: List of stocks
             max_results_per_stock: Max results per stock
-            delay_between: Delay between searches (seconds)
+            delay_between: Deprecated and ignored; kept so existing callers
+                passing it do not break
+            max_concurrency: Max stocks searched at the same time
             
         Returns:
             Dict of results
         """
-        results = {}
-        
-        for i, stock in enumerate(stocks):
-            if i > 0:
-                time.sleep(delay_between)
-            
-            code = stock.get('code', '')
-            name = stock.get('name', '')
-            
-            response = self.search_stock_news(code, name, max_results_per_stock)
-            results[code] = response
-        
-        return results
+        if delay_between is not None:
+            logger.warning("batch_search 的 delay_between 参数已废弃并被忽略，限流由各搜索引擎的令牌桶负责")
+        if not stocks:
+            return {}
+        
+        # 独立线程池：不占用多维度情报搜索使用的共享线程池 _search_executor
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(stocks)),
+            thread_name_prefix="batch-search"
+        ) as executor:
+            responses = executor.map(
+                lambda stock: self.search_stock_news(
+                    stock.get('code', ''), stock.get('name', ''), max_results_per_stock
+                ),
+                stocks
+            )
+            return {stock.get('code', ''): response for stock, response in zip(stocks, responses)}
 
     def search_stock_price_fallback(
         self,
@@ -513,32 +715,30 @@ class SearchService:
         
         logger.info(f"[增强搜索] 数据源失败，启动增强搜索: {stock_name}({stock_code})")
         
-        all_results = []
-        seen_urls = set()
+        # {规范化 URL: SearchResult}，按首次出现顺序保存去重后的结果
+        deduped: Dict[str, SearchResult] = {}
         successful_providers = []
         
         # 使用多个关键词模板搜索
-        is_foreign = self._is_foreign_stock(stock_code)
+        is_foreign = _is_foreign_stock(stock_code)
         keywords = self.ENHANCED_SEARCH_KEYWORDS_EN if is_foreign else self.ENHANCED_SEARCH_KEYWORDS
-        for i, keyword_template in enumerate(keywords[:max_attempts]):
-            query = keyword_template.format(name=stock_name, code=stock_code)
-            
+        queries = tuple(t.format(name=stock_name, code=stock_code) for t in keywords[:max_attempts])
+        
+        # 按优先级依次尝试，保证结果可复现
+        providers = [p for p in self._providers if p.is_available]
+        
+        for i, query in enumerate(queries):
             logger.info(f"[增强搜索] 第 {i+1}/{max_attempts} 次搜索: {query}")
             
             # 依次尝试各个搜索引擎
-            for provider in self._providers:
-                if not provider.is_available:
-                    continue
-                
+            for provider in providers:
                 try:
-                    response = provider.search(query, max_results=3)
+                    response = self._provider_search(provider, query, max_results=3)
                     
                     if response.success and response.results:
                         # 去重并添加结果
                         for result in response.results:
-                            if result.url not in seen_urls:
-                                seen_urls.add(result.url)
-                                all_results.append(result)
+                            deduped.setdefault(_canonicalize_url(result.url), result)
                                 
                         if provider.name not in successful_providers:
                             successful_providers.append(provider.name)
@@ -551,12 +751,9 @@ class SearchService:
                 except Exception as e:
                     logger.warning(f"[增强搜索] {provider.name} 搜索异常: {e}")
                     continue
-            
-            # 短暂延迟避免请求过快
-            if i < max_attempts - 1:
-                time.sleep(0.5)
         
         # 汇总结果
+        all_results = list(deduped.values())
         if all_results:
             # 截取前 max_results 条
             final_results = all_results[:max_results]
@@ -636,19 +833,19 @@ class SearchService:
         if not response.success or not response.results:
             return "【股价走势搜索】未找到相关信息，请以其他渠道数据为准。"
         
-        lines = [
+        header = (
             f"【股价走势搜索结果】（来源: {response.provider}）",
             "⚠️ 注意：以下信息来自网络搜索，仅供参考，可能存在延迟或不准确。",
             ""
-        ]
-        
-        for i, result in enumerate(response.results, 1):
-            date_str = f" [{result.published_date}]" if result.published_date else ""
-            lines.append(f"{i}. 【{result.source}】{result.title}{date_str}")
-            lines.append(f"   {result.snippet[:200]}...")
-            lines.append("")
-        
-        return "\n".join(lines)
+        )
+        # 每条结果：标题行 + 摘要行 + 空行
+        body = (
+            f"{i}. 【{result.source}】{result.title}"
+            f"{f' [{result.published_date}]' if result.published_date else ''}\n"
+            f"   {result.snippet[:200]}...\n"
+            for i, result in enumerate(response.results, 1)
+        )
+        return "\n".join(chain(header, body))
 
 
 # === 便捷函数 ===
@@ -3,8 +3,10 @@
 import logging
 import time
 import random
+import numpy as np
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import date
 from typing import List, Dict, Any, Optional, Tuple
 import os
@@ -12,6 +14,7 @@ import os
 from .data_fetch_manager import DataFetcherManager
 from .notification import NotificationService
 from .industry_analyzer import IndustryAnalyzer
+from data_fetcher.base import Metrics
 from utils.config import FilterArgs
 from utils.logger import Logger
 
@@ -37,6 +40,16 @@ BOLL_PCT_B = 0.9
 
 RISK_SCORE_THRESHOLD = 2
 
+# 风险项名称（与 StockFilter._risk_flags 中各列顺序一致）
+_RISK_LABELS = (
+    '长期偏离EMA200>25%',
+    '长期偏离EMA200>15%',
+    '20日涨幅>25%',
+    '60日涨幅>50%',
+    'ATR/收盘价比值>4%',
+    '布林带%B连续2日>0.9',
+)
+
 class StockFilter:
     
     def __init__(
@@ -49,11 +62,19 @@ class StockFilter:
         self.args = args
         self.max_workers = max_workers or self.args.max_workers
         # 初始化各模块
-        self.fetcher_manager = DataFetcherManager(args.fetcher_args)
+        # 请求间隔由数据获取层统一节流（各线程并发等待），不在结果收集循环中串行休眠
+        fetcher_args = args.fetcher_args
+        if args.request_interval is not None:
+            fetcher_args = replace(fetcher_args, request_interval=args.request_interval)
+        self.fetcher_manager = DataFetcherManager(fetcher_args)
         logger.info(f"调度器初始化完成，最大并发数: {self.max_workers}")
         self.notifier = NotificationService(args.notifier_args)
         self.industry_analyzer = IndustryAnalyzer(self.fetcher_manager)
     
+    def _pool_size(self, stage_workers: Optional[int], task_count: int) -> int:
+        """线程池大小：阶段配置优先，其次全局 max_workers，且不超过任务数"""
+        return max(1, min(stage_workers or self.max_workers, task_count))
+
     def process(self):
         # 开始分析
         logger.info("开始筛选股票")
@@ -85,13 +106,31 @@ class StockFilter:
 
     def base_info_filter(self) -> List[str]:
         df_all = self.fetcher_manager.get_all_realtime_quote()
-        df_filtered = df_all[~df_all['name'].str.contains("ST")]
-        #df_filtered = df_filtered[df_filtered['amount'] > BASE_DAILY_AMOUNT] # 单日成交额
-        df_filtered = df_filtered[df_filtered['total_mv'] > BASE_MARKET_VALUE] # 总市值
-        stock_list = df_filtered['code'].tolist()
+        # 各条件合并为一个布尔掩码，一次筛选，不产生中间 DataFrame
+        mask = ~df_all['name'].str.contains("ST", regex=False, na=False).to_numpy(dtype=bool)
+        #mask &= df_all['amount'].to_numpy() > BASE_DAILY_AMOUNT # 单日成交额
+        mask &= df_all['total_mv'].to_numpy() > BASE_MARKET_VALUE # 总市值
+        stock_list = df_all['code'].to_numpy()[mask].tolist()
         return stock_list
 
     def income_filter(self, stock_list:List[str]) -> List[str]:
+        # 先用全市场业绩报表一次性匹配，未覆盖的股票再逐只查询
+        df_income = self.fetcher_manager.get_income_data_batch(stock_list)
+        codes = df_income['code'].tolist()
+        income_incs = df_income['income_inc'].tolist()
+        matched = set(codes)
+        missing_codes = [code for code in stock_list if code not in matched]
+        if missing_codes:
+            logger.info(f"业绩报表匹配 {len(matched)} 只股票，剩余 {len(missing_codes)} 只逐只查询")
+            for income_data in self._get_income_data_per_code(missing_codes):
+                codes.append(income_data['code'])
+                income_incs.append(income_data['income_inc'])
+
+        # 按列收集后用 NumPy 掩码筛选，不构造 DataFrame（缺失的增长率为 NaN，不通过）
+        income_incs = np.asarray(income_incs, dtype=float)
+        return np.asarray(codes, dtype=object)[income_incs >= BASE_INCOME_INCREASE].tolist()
+
+    def _get_income_data_per_code(self, stock_list: List[str]) -> List[Dict[str, Any]]:
         all_income_data = []
         batch = self.args.request_batch
         total_iter = (len(stock_list) - 1) // batch + 1
@@ -99,141 +138,143 @@ class StockFilter:
             start = batch * step
             end = min(batch * (step + 1), len(stock_list))
             batch_stock_list = stock_list[start:end]
-            with ThreadPoolExecutor(max_workers=self.args.max_workers) as executor:
-                # 提交任务
-                future_to_code = {
-                    executor.submit(
-                        self.fetcher_manager.get_income_data,
-                        code
-                    ): code
-                    for code in batch_stock_list
-                }
-                
-                # 收集结果
-                for idx, future in enumerate(as_completed(future_to_code)):
-                    code = future_to_code[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            all_income_data.append(result)
-
-                        if idx < len(batch_stock_list) - 1 and self.args.analysis_delay > 0:
-                            logger.debug(f"等待 {self.args.analysis_delay} 秒后继续下一只股票...")
-                            time.sleep(self.args.analysis_delay)
-
-                    except Exception as e:
-                        logger.error(f"[{code}] 任务执行失败: {e}")
+            workers = self._pool_size(self.args.income_max_workers, len(batch_stock_list))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # 结果按提交顺序返回，单只股票失败返回 None，不中断整批
+                results = executor.map(self._get_income_data_safe, batch_stock_list)
+                all_income_data.extend(result for result in results if result)
             if not step == total_iter - 1:
                 logger.info(f"处理完成 {batch * (step + 1)} 只股票，剩余{len(stock_list) - batch * (step + 1)}只股票")
                 time.sleep(random.uniform(1, 2) * 60)
+        return all_income_data
 
-        df_filtered = pd.DataFrame(all_income_data)
-        df_filtered = df_filtered[df_filtered['income_inc'] >= BASE_INCOME_INCREASE]
-        return df_filtered['code'].tolist()
+    def _get_income_data_safe(self, code: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.fetcher_manager.get_income_data(code)
+        except Exception as e:
+            logger.error(f"[{code}] 任务执行失败: {e}")
+            return None
 
     def history_info_filter(self, stock_list:List[str], report_type='short') -> List[str]:
-        logger.info(f"开始处理{len(stock_list)}只股票: {stock_list}")
-        filted_stocks = []
-        filtered_infos = []
+        logger.info(f"开始处理{len(stock_list)}只股票")
+        logger.debug("待处理股票: %s", stock_list)
+        metrics_frames: List[pd.DataFrame] = []
         batch = self.args.request_batch
         total_iter = (len(stock_list) - 1) // batch + 1
         for step in range(total_iter):
             start = batch * step
             end = min(batch * (step + 1), len(stock_list))
             batch_stock_list = stock_list[start:end]
-            with ThreadPoolExecutor(max_workers=self.args.max_workers) as executor:
-                # 提交任务
-                future_to_code = {
-                    executor.submit(
-                        self._history_info_filter,
-                        code,
-                        report_type=report_type
-                    ): code
-                    for code in batch_stock_list
-                }
-                
-                # 收集结果
-                for idx, future in enumerate(as_completed(future_to_code)):
-                    code = future_to_code[future]
-                    try:
-                        result = future.result()
-                        if result and result[0]:
-                            filted_stocks.append(code)
-                            filtered_infos.append(result[1])
-
-                        # Issue #128: 分析间隔 - 在个股分析和大盘分析之间添加延迟
-                        if idx < len(batch_stock_list) - 1 and self.args.analysis_delay > 0:
-                            logger.debug(f"等待 {self.args.analysis_delay} 秒后继续下一只股票...")
-                            time.sleep(self.args.analysis_delay)
-
-                    except Exception as e:
-                        logger.error(f"[{code}] 任务执行失败: {e}")
+            # 每批股票的日线并发获取后，按列一次计算全部技术指标
+            metrics_frames.append(self.fetcher_manager.get_market_analyzed_frame(
+                batch_stock_list,
+                end_date=self.args.analyze_date,
+                max_workers=self._pool_size(self.args.history_max_workers, len(batch_stock_list)),
+            ))
             if not step == total_iter - 1:
                 logger.info(f"处理完成 {batch * (step + 1)} 只股票，剩余{len(stock_list) - batch * (step + 1)}只股票")
                 time.sleep(random.uniform(1, 2) * 60)
-        logger.info(f"处理完成，剩余{len(filted_stocks)}只股票: {filted_stocks}")
+        metrics_frame = pd.concat(metrics_frames) if metrics_frames else pd.DataFrame()
+        filted_stocks, filtered_infos = self._evaluate_history(stock_list, metrics_frame, report_type)
+        logger.info(f"处理完成，剩余{len(filted_stocks)}只股票")
+        logger.debug("history_info_filter 通过股票: %s", filted_stocks)
         #filtered_infos = pd.DataFrame(filtered_infos)
         return filted_stocks, filtered_infos
 
-    def _history_info_filter(self, stock_code: str, report_type='short'):
-        analyzed_data = {"code": stock_code}
-        stock_data = self.fetcher_manager.get_daily_analyzed_data(stock_code, end_date=self.args.analyze_date)
-        if stock_data is None:
-            return False, analyzed_data
-        trend_result = self._single_trend_filter(stock_data, analyzed_data)
-        risk_result = self._single_risk_filter(stock_data, analyzed_data)
-        additional_result = self._single_additional_filter(stock_data, analyzed_data)
-        if not report_type == 'short':
-            analyzed_data['origin_data'] = stock_data
-        logger.info(f"history info analyze info: {analyzed_data}")
-        return trend_result and risk_result and additional_result, analyzed_data
-
-    def _single_trend_filter(self, stock_data, analyzed_data):
-        result = True
-        # 20日成交额 > 3亿 && 当日成交量 》= 1.3 x 20日均量
-        stock_data['20日成交额>3亿'] = (stock_data['amount_ma20'] >= MA20_AMOUNT)
-        stock_data['当日成交量>=1.3x20日均量'] = (stock_data['amount'] >= stock_data['amount_ma20'] * MA20_AMOUNT_FACTOR)
-        result = result and stock_data['20日成交额>3亿'] and stock_data['当日成交量>=1.3x20日均量']
-        # 收盘 > ema120
-        stock_data['收盘>ema200'] = (stock_data['close'] > stock_data['ema200'])
-        result = result and stock_data['收盘>ema200']
-        # ema120斜率 >= -0.05
-        stock_data['ema200斜率>=-0.05'] = (stock_data['ema200_slop'] >= EMA200_SLOP)
-        result = result and stock_data['ema200斜率>=-0.05']
-        # EMA5上穿EMA10≥1日 && 10日内EMA5/10交叉≤1次
-        stock_data['EMA5上穿EMA10≥1日'] = (stock_data['gloden_cross_days'] >= GLODEN_CROSS_DAYS)
-        stock_data['10日内EMA5/10交叉≤1次'] = (stock_data['cross_count_10d'] <= CROSS_COUNT_10D)
-        result = result and stock_data['EMA5上穿EMA10≥1日'] and stock_data['10日内EMA5/10交叉≤1次']
-        # macd histogram > 0
-        stock_data['MACD Histogram≥0'] = (stock_data['macd_histogram'] >= MACD_HISTOGRAM)
-        result = result and stock_data['MACD Histogram≥0']
-        return result
-    
-    def _single_risk_filter(self, stock_data, analyzed_data):
-        risk_score = 0
-        # 长期偏离EMA120
-        analyzed_data['长期偏离EMA200>25%'] = (abs(stock_data['ema200_deviation_rate']) > EMA200_DEVIATION_RATE_HIGH)
-        analyzed_data['长期偏离EMA200>15%'] = (abs(stock_data['ema200_deviation_rate']) > EMA200_DEVIATION_RATE_LOW)
-        risk_score = risk_score + 1 if analyzed_data['长期偏离EMA200>25%'] else risk_score
-        risk_score = risk_score + 1 if analyzed_data['长期偏离EMA200>15%'] else risk_score
-        # 20日涨幅是否超过25%，60日涨幅是否超过50%
-        analyzed_data['20日涨幅>25%'] = (stock_data['20d_inc'] > INCOME_INCREASE_20D)
-        analyzed_data['60日涨幅>50%'] = (stock_data['60d_inc'] > INCOME_INCREASE_60D)
-        risk_score = risk_score + 1 if analyzed_data['20日涨幅>25%'] else risk_score
-        risk_score = risk_score + 1 if analyzed_data['60日涨幅>50%'] else risk_score
-        # ATR/收盘价比值是否>4%
-        analyzed_data['ATR/收盘价比值>4%'] = (stock_data['atr_rate'] > ATR_RATE)
-        risk_score = risk_score + 1 if analyzed_data['ATR/收盘价比值>4%'] else risk_score
-        # 布林带%B是否连续2日>0.9
-        analyzed_data['布林带%B连续2日>0.9'] = (stock_data['bb_percent_b1'] is not None and stock_data['bb_percent_b1'] > BOLL_PCT_B and \
-            stock_data['bb_percent_b1'] is not None and stock_data['bb_percent_b2'] > BOLL_PCT_B)
-        risk_score = risk_score + 1 if analyzed_data['布林带%B连续2日>0.9'] else risk_score
-        analyzed_data['风险分'] = risk_score
-        return risk_score <= RISK_SCORE_THRESHOLD
-
-    def _single_additional_filter(self, stock_data, analyzed_data):
-        # 可选 ema50 > ema120
-        result = True
-        stock_data['ema50>=ema200'] = (stock_data['ema50'] >= stock_data['ema200'])
-        result = result and stock_data['ema50>=ema200']
-        return result
+    def _evaluate_history(self, stock_list: List[str], metrics_frame: pd.DataFrame, report_type='short'):
+        """
+        对所有股票的技术指标按列一次性判断趋势/风险/附加条件
+
+        Args:
+            stock_list: 股票代码列表
+            metrics_frame: index 为股票代码、列为 Metrics 字段的技术指标表
+
+        Returns:
+            (通过筛选的股票代码, 对应的分析信息)，按 stock_list 顺序
+        """
+        codes = [code for code in dict.fromkeys(stock_list) if code in metrics_frame.index]
+        if not codes:
+            return [], []
+        df = metrics_frame.loc[codes]
+
+        risk = self._risk_flags(df)
+        # 全量风险表格式化开销较大，仅在 DEBUG 级别生成
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"history info analyze info:\n{risk.to_string()}")
+        passed = (
+            self._trend_mask(df)
+            & (risk['风险分'].to_numpy() <= RISK_SCORE_THRESHOLD)
+            & self._additional_mask(df)
+        )
+
+        # 报告需要原始指标时，按行还原为 Metrics（保留各列的原始类型）
+        records = df.to_dict('records') if not report_type == 'short' else None
+        filted_stocks = []
+        filtered_infos = []
+        for row, (code, ok, flags) in enumerate(zip(codes, passed, risk.to_dict('records'))):
+            if not ok:
+                continue
+            analyzed_data = {"code": code}
+            analyzed_data.update((k, bool(v)) for k, v in flags.items() if k != '风险分')
+            analyzed_data['风险分'] = int(flags['风险分'])
+            if records is not None:
+                analyzed_data['origin_data'] = Metrics(**records[row]).to_dict()
+            filted_stocks.append(code)
+            filtered_infos.append(analyzed_data)
+        return filted_stocks, filtered_infos
+
+    @staticmethod
+    def _trend_mask(df: pd.DataFrame) -> np.ndarray:
+        """
+        趋势条件：按筛除率从高到低依次判断，每个条件只在尚未被筛除的股票上计算
+        """
+        col = lambda name, rows: df[name].to_numpy(dtype=float)[rows]
+        rows = np.arange(len(df))
+        for check in (
+            # EMA5上穿EMA10≥1日 && 10日内EMA5/10交叉≤1次（最严格）
+            lambda r: col('gloden_cross_days', r) >= GLODEN_CROSS_DAYS,
+            lambda r: col('cross_count_10d', r) <= CROSS_COUNT_10D,
+            # macd histogram > 0
+            lambda r: col('macd_histogram', r) >= MACD_HISTOGRAM,
+            # 当日成交量 》= 1.3 x 20日均量
+            lambda r: col('amount', r) >= col('amount_ma20', r) * MA20_AMOUNT_FACTOR,
+            # 收盘 > ema200
+            lambda r: col('close', r) > col('ema200', r),
+            # ema200斜率 >= -0.05
+            lambda r: col('ema200_slop', r) >= EMA200_SLOP,
+            # 20日成交额 > 3亿（经基础筛选后通过率较高，放最后）
+            lambda r: col('amount_ma20', r) >= MA20_AMOUNT,
+        ):
+            rows = rows[check(rows)]
+            if not len(rows):
+                break
+        mask = np.zeros(len(df), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    @staticmethod
+    def _risk_flags(df: pd.DataFrame) -> pd.DataFrame:
+        """各风险项是否命中及风险分（每命中一项计 1 分）"""
+        deviation = np.abs(df['ema200_deviation_rate'].to_numpy(dtype=float))
+        # 各风险项按列组成布尔矩阵，风险分为每行命中数，无逐行分支
+        flags = np.column_stack((
+            # 长期偏离EMA200
+            deviation > EMA200_DEVIATION_RATE_HIGH,
+            deviation > EMA200_DEVIATION_RATE_LOW,
+            # 20日涨幅是否超过25%，60日涨幅是否超过50%
+            df['inc_20d'].to_numpy(dtype=float) > INCOME_INCREASE_20D,
+            df['inc_60d'].to_numpy(dtype=float) > INCOME_INCREASE_60D,
+            # ATR/收盘价比值是否>4%
+            df['atr_rate'].to_numpy(dtype=float) > ATR_RATE,
+            # 布林带%B是否连续2日>0.9
+            (df['bb_percent_b1'].to_numpy(dtype=float) > BOLL_PCT_B)
+            & (df['bb_percent_b2'].to_numpy(dtype=float) > BOLL_PCT_B),
+        ))
+        risk = pd.DataFrame(flags, index=df.index, columns=_RISK_LABELS)
+        risk['风险分'] = flags.sum(axis=1)
+        return risk
+
+    @staticmethod
+    def _additional_mask(df: pd.DataFrame) -> np.ndarray:
+        # 可选 ema50 > ema200
+        return df['ema50'].to_numpy(dtype=float) >= df['ema200'].to_numpy(dtype=float)
@@ -13,51 +13,229 @@ A股自选股智能分析系统 - 搜索服务模块
 
 import logging
 import random
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from itertools import cycle
-import requests
-from newspaper import Article, Config
+from itertools import cycle, islice
+
+# trafilatura 为可选依赖：已安装时优先用它提取正文（比 newspaper3k 解析快数倍）
+try:
+    import trafilatura
+    trafilatura_available = True
+except ImportError:
+    trafilatura_available = False
+
+# orjson 为可选依赖：已安装时用它解析搜索接口的 JSON 响应
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+from utils.http import create_http_session
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_url_content(url: str, timeout: int = 5) -> str:
-    """
-    获取 URL 网页正文内容 (使用 newspaper3k)
-    """
+def parse_json_response(response: Any) -> Any:
+    """解析 HTTP 响应的 JSON 内容（解析失败抛出 ValueError）"""
+    if orjson_available:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# URL 域名（去掉 www. 前缀）
+_DOMAIN_RE = re.compile(r'https?://(?:www\.)?([^/?#]+)', re.I)
+
+
+@lru_cache(maxsize=4096)
+def _extract_domain(url: str) -> str:
+    """从 URL 提取域名作为来源（搜索结果常来自少数站点，按 URL 缓存）"""
+    m = _DOMAIN_RE.match(url) if url else None
+    return m.group(1) if m else '未知来源'
+
+
+# 网页正文缓存：相邻日期/股票的搜索常返回相同新闻链接，成功获取的正文按 URL 缓存
+PAGE_CACHE_MAX = 1024
+PAGE_CACHE_TTL = 900
+_page_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+
+def _get_cached_page(url: str) -> Optional[str]:
+    with _page_cache_lock:
+        entry = _page_cache.get(url)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del _page_cache[url]
+            return None
+        _page_cache.move_to_end(url)
+        return entry[1]
+
+
+def _put_cached_page(url: str, text: str) -> None:
+    with _page_cache_lock:
+        _page_cache[url] = (time.monotonic() + PAGE_CACHE_TTL, text)
+        _page_cache.move_to_end(url)
+        while len(_page_cache) > PAGE_CACHE_MAX:
+            _page_cache.popitem(last=False)
+
+
+# 网页正文下载的共享会话（未传入会话时使用，进程内各次下载复用连接池）
+_page_session: Optional[Any] = None
+_page_session_lock = threading.Lock()
+
+
+def _get_page_session() -> Any:
+    global _page_session
+    if _page_session is None:
+        with _page_session_lock:
+            if _page_session is None:
+                _page_session = create_http_session(retries=1, pool_size=64)
+    return _page_session
+
+
+# 下载网页使用的浏览器 UA
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+@lru_cache(maxsize=1)
+def _newspaper() -> Any:
+    """首次需要 newspaper3k 提取正文时再导入（已安装 trafilatura 时通常用不到）"""
+    import newspaper
+    return newspaper
+
+
+@lru_cache(maxsize=8)
+def _article_config(timeout: int) -> Any:
+    """newspaper3k 配置（只读，按超时时间缓存，各线程共用）"""
+    config = _newspaper().Config()
+    config.browser_user_agent = _USER_AGENT
+    config.request_timeout = timeout
+    config.fetch_images = False  # 不下载图片
+    config.memoize_articles = False # 不缓存
+    config.follow_meta_refresh = False  # 不跟随 meta refresh 跳转
+    config.keep_article_html = False  # 只需要纯文本
+    config.number_threads = 1
+    return config
+
+
+# 网页下载上限：正文只保留前 1500 字，读取前 64KB 已足够，不再下载整页
+PAGE_MAX_BYTES = 64 * 1024
+PAGE_CHUNK_SIZE = 8192
+
+# HTML 头部 <meta charset> 声明
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+
+def _decode_html(buf: bytes, resp: Any) -> str:
+    """按响应头 charset 解码，未声明时使用 HTML 中的 meta charset，默认 UTF-8"""
+    encoding = None
+    if 'charset' in resp.headers.get('content-type', '').lower():
+        encoding = resp.encoding
+    if not encoding:
+        m = _META_CHARSET_RE.search(buf, 0, 4096)
+        encoding = m.group(1).decode('ascii') if m else 'utf-8'
     try:
-        # 配置 newspaper3k
-        config = Config()
-        config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        config.request_timeout = timeout
-        config.fetch_images = False  # 不下载图片
-        config.memoize_articles = False # 不缓存
+        return buf.decode(encoding, errors='replace')
+    except LookupError:
+        return buf.decode('utf-8', errors='replace')
+
 
-        article = Article(url, config=config, language='zh') # 默认中文，但也支持其他
-        article.download()
-        article.parse()
+def _clean_text(text: str) -> str:
+    """去除空行并限制长度"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    return '\n'.join(lines)[:1500]  # 限制返回长度（比 bs4 稍微多一点，因为正文提取更干净）
 
-        # 获取正文
-        text = article.text.strip()
 
-        # 简单的后处理，去除空行
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
+def fetch_url_content(url: str, timeout: int = 5, session: Optional[Any] = None) -> str:
+    """
+    获取 URL 网页正文内容（优先 trafilatura，未安装或提取失败时使用 newspaper3k）
 
-        return text[:1500]  # 限制返回长度（比 bs4 稍微多一点，因为 newspaper 解析更干净）
+    Args:
+        url: 网页地址
+        timeout: 请求超时时间（秒）
+        session: 共享 HTTP 会话（requests.Session），未传入时使用模块级共享会话
+    """
+    cached = _get_cached_page(url)
+    if cached is not None:
+        return cached
+    try:
+        if session is None:
+            session = _get_page_session()
+        # 通过共享会话流式下载（keep-alive），最多读取 PAGE_MAX_BYTES 字节，下载后只做正文提取
+        with session.get(
+            url,
+            headers={'User-Agent': _USER_AGENT},
+            timeout=timeout,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            buf = b''.join(islice(resp.iter_content(PAGE_CHUNK_SIZE), PAGE_MAX_BYTES // PAGE_CHUNK_SIZE))
+            html = _decode_html(buf, resp)
+        text = ""
+        if trafilatura_available:
+            extracted = trafilatura.extract(
+                html,
+                include_comments=False,
+                include_tables=False,
+                favor_precision=True,
+            )
+            if extracted:
+                text = _clean_text(extracted)
+        if not text:
+            article = _newspaper().Article(url, config=_article_config(timeout), language='zh') # 默认中文，但也支持其他
+            article.download(input_html=html)
+            article.parse()
+            text = _clean_text(article.text)
+
+        # 正文已截断到固定长度，只缓存非空结果
+        if text:
+            _put_cached_page(url, text)
+        return text
     except Exception as e:
         logger.debug(f"Fetch content failed for {url}: {e}")
 
     return ""
 
 
-@dataclass
+def fetch_url_contents(
+    urls: List[str],
+    timeout: int = 5,
+    session: Optional[Any] = None,
+    max_workers: int = 8
+) -> Dict[str, str]:
+    """
+    并发获取多个 URL 的网页正文
+
+    Args:
+        urls: 网页地址列表
+        timeout: 单个请求超时时间（秒）
+        session: 共享 HTTP 会话，未传入时使用模块级共享会话
+        max_workers: 并发线程数
+
+    Returns:
+        {url: 正文}，获取失败的 URL 对应空字符串
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        contents = executor.map(lambda u: fetch_url_content(u, timeout=timeout, session=session), urls)
+        return dict(zip(urls, contents))
+
+
+@dataclass(slots=True, frozen=True)
 class SearchResult:
-    """搜索结果数据类"""
+    """搜索结果数据类（不可变，可哈希去重）"""
     title: str
     snippet: str  # 摘要
     url: str
@@ -70,9 +248,9 @@ class SearchResult:
         return f"【{self.source}】{self.title}{date_str}\n{self.snippet}"
 
 
-@dataclass 
+@dataclass(slots=True)
 class SearchResponse:
-    """搜索响应"""
+    """搜索响应（search_time 在搜索完成后回填，因此不冻结）"""
     query: str
     results: List[SearchResult]
     provider: str  # 使用的搜索引擎
@@ -108,6 +286,30 @@ class BaseSearchProvider(ABC):
         self._key_cycle = cycle(api_keys) if api_keys else None
         self._key_usage: Dict[str, int] = {key: 0 for key in api_keys}
         self._key_errors: Dict[str, int] = {key: 0 for key in api_keys}
+        # 保护 key 轮询与使用/错误计数（并发搜索时共享）
+        self._key_lock = threading.Lock()
+    
+    # 共享 HTTP 会话（requests.Session），由 SearchService 注入
+    http_session: Optional[Any] = None
+    
+    def set_http_session(self, session: Any) -> None:
+        """注入共享 HTTP 会话（requests.Session）"""
+        self.http_session = session
+    
+    def _http(self) -> Any:
+        """返回共享 HTTP 会话，未注入时创建本实例专用的连接池会话（keep-alive）"""
+        if self.http_session is None:
+            with self._key_lock:
+                if self.http_session is None:
+                    self.http_session = create_http_session(
+                        retries=2,
+                        backoff_factor=0.2,
+                        status_forcelist=(502, 503, 504),
+                        pool_size=16,
+                    )
+        return self.http_session
+    
+    _extract_domain = staticmethod(_extract_domain)
     
     @property
     def name(self) -> str:
@@ -127,29 +329,32 @@ class BaseSearchProvider(ABC):
         if not self._key_cycle:
             return None
         
-        # 最多尝试所有 key
-        for _ in range(len(self._api_keys)):
-            key = next(self._key_cycle)
-            # 跳过错误次数过多的 key（超过 3 次）
-            if self._key_errors.get(key, 0) < 3:
-                return key
-        
-        # 所有 key 都有问题，重置错误计数并返回第一个
+        with self._key_lock:
+            # 最多尝试所有 key
+            for _ in range(len(self._api_keys)):
+                key = next(self._key_cycle)
+                # 跳过错误次数过多的 key（超过 3 次）
+                if self._key_errors.get(key, 0) < 3:
+                    return key
+            
+            # 所有 key 都有问题，重置错误计数并返回第一个
+            self._key_errors = {key: 0 for key in self._api_keys}
         logger.warning(f"[{self._name}] 所有 API Key 都有错误记录，重置错误计数")
-        self._key_errors = {key: 0 for key in self._api_keys}
         return self._api_keys[0] if self._api_keys else None
     
     def _record_success(self, key: str) -> None:
         """记录成功使用"""
-        self._key_usage[key] = self._key_usage.get(key, 0) + 1
-        # 成功后减少错误计数
-        if key in self._key_errors and self._key_errors[key] > 0:
-            self._key_errors[key] -= 1
+        with self._key_lock:
+            self._key_usage[key] = self._key_usage.get(key, 0) + 1
+            # 成功后减少错误计数
+            if key in self._key_errors and self._key_errors[key] > 0:
+                self._key_errors[key] -= 1
     
     def _record_error(self, key: str) -> None:
         """记录错误"""
-        self._key_errors[key] = self._key_errors.get(key, 0) + 1
-        logger.warning(f"[{self._name}] API Key {key[:8]}... 错误计数: {self._key_errors[key]}")
+        with self._key_lock:
+            errors = self._key_errors[key] = self._key_errors.get(key, 0) + 1
+        logger.warning(f"[{self._name}] API Key {key[:8]}... 错误计数: {errors}")
     
     @abstractmethod
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
@@ -202,4 +407,28 @@ class BaseSearchProvider(ABC):
                 success=False,
                 error_message=str(e),
                 search_time=elapsed
-            )
\ No newline at end of file
+            )
+
+    def batch_search(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        days: int = 7,
+        workers: int = 8
+    ) -> List[SearchResponse]:
+        """
+        并发执行多个搜索
+
+        Args:
+            queries: 搜索关键词列表
+            max_results: 每个查询的最大返回结果数
+            days: 搜索最近几天的时间范围
+            workers: 并发线程数
+
+        Returns:
+            SearchResponse 列表，与 queries 顺序一致
+        """
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(workers, len(queries))) as executor:
+            return list(executor.map(lambda q: self.search(q, max_results, days=days), queries))
@@ -1,3 +1,4 @@
+import bisect
 import logging
 import random
 import time
@@ -7,12 +8,15 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from itertools import cycle
 import requests
-from newspaper import Article, Config
 
-from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content
+from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content, parse_json_response
 
 logger = logging.getLogger(__name__)
 
+# 时间范围：days <= 1/7/30 天分别对应 oneDay/oneWeek/oneMonth，更长为 oneYear
+_FRESHNESS_DAYS = (1, 7, 30)
+_FRESHNESS_VALUES = ('oneDay', 'oneWeek', 'oneMonth', 'oneYear')
+
 
 class BochaSearchProvider(BaseSearchProvider):
     """
@@ -32,17 +36,6 @@ class BochaSearchProvider(BaseSearchProvider):
     
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
         """执行博查搜索"""
-        try:
-            import requests
-        except ImportError:
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message="requests 未安装，请运行: pip install requests"
-            )
-        
         try:
             # API 端点
             url = "https://api.bocha.cn/v1/web-search"
@@ -54,15 +47,7 @@ class BochaSearchProvider(BaseSearchProvider):
             }
             
             # 确定时间范围
-            freshness = "oneWeek"
-            if days <= 1:
-                freshness = "oneDay"
-            elif days <= 7:
-                freshness = "oneWeek"
-            elif days <= 30:
-                freshness = "oneMonth"
-            else:
-                freshness = "oneYear"
+            freshness = _FRESHNESS_VALUES[bisect.bisect_left(_FRESHNESS_DAYS, days)]
 
             # 请求参数（严格按照API文档）
             payload = {
@@ -73,7 +58,7 @@ class BochaSearchProvider(BaseSearchProvider):
             }
             
             # 执行搜索
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = self._http().post(url, headers=headers, json=payload, timeout=10)
             
             # 检查HTTP状态码
             if response.status_code != 200:
@@ -111,7 +96,7 @@ class BochaSearchProvider(BaseSearchProvider):
             
             # 解析响应
             try:
-                data = response.json()
+                data = parse_json_response(response)
             except ValueError as e:
                 error_msg = f"响应JSON解析失败: {str(e)}"
                 logger.error(f"[Bocha] {error_msg}")
@@ -198,14 +183,3 @@ class BochaSearchProvider(BaseSearchProvider):
                 success=False,
                 error_message=error_msg
             )
-    
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        """从 URL 提取域名作为来源"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace('www.', '')
-            return domain or '未知来源'
-        except:
-            return '未知来源'
\ No newline at end of file
@@ -1,18 +1,26 @@
+import bisect
 import logging
 import random
+import re
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
-from itertools import cycle
+from itertools import cycle, islice
 import requests
-from newspaper import Article, Config
 
-from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content
+from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content, parse_json_response
 
 logger = logging.getLogger(__name__)
 
+# 时间范围（freshness 参数）：days <= 1/7/30 天分别对应 Past day/week/month，更长为 Past year
+_FRESHNESS_DAYS = (1, 7, 30)
+_FRESHNESS_VALUES = ('pd', 'pw', 'pm', 'py')
+
+# ISO 8601 日期前缀（YYYY-MM-DD）
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
 
 class BraveSearchProvider(BaseSearchProvider):
     """
@@ -42,14 +50,7 @@ class BraveSearchProvider(BaseSearchProvider):
             }
 
             # 确定时间范围（freshness 参数）
-            if days <= 1:
-                freshness = "pd"  # Past day (24小时)
-            elif days <= 7:
-                freshness = "pw"  # Past week
-            elif days <= 30:
-                freshness = "pm"  # Past month
-            else:
-                freshness = "py"  # Past year
+            freshness = _FRESHNESS_VALUES[bisect.bisect_left(_FRESHNESS_DAYS, days)]
 
             # 请求参数
             params = {
@@ -62,7 +63,7 @@ class BraveSearchProvider(BaseSearchProvider):
             }
 
             # 执行搜索（GET 请求）
-            response = requests.get(
+            response = self._http().get(
                 self.API_ENDPOINT,
                 headers=headers,
                 params=params,
@@ -83,7 +84,7 @@ class BraveSearchProvider(BaseSearchProvider):
 
             # 解析响应
             try:
-                data = response.json()
+                data = parse_json_response(response)
             except ValueError as e:
                 error_msg = f"响应JSON解析失败: {str(e)}"
                 logger.error(f"[Brave] {error_msg}")
@@ -103,17 +104,13 @@ class BraveSearchProvider(BaseSearchProvider):
             web_data = data.get('web', {})
             web_results = web_data.get('results', [])
 
-            for item in web_results[:max_results]:
-                # 解析发布日期（ISO 8601 格式）
-                published_date = None
+            for item in islice(web_results, max_results):
+                # 发布日期：ISO 8601 格式只取日期部分，无需完整解析；其他格式使用原始值
                 age = item.get('age') or item.get('page_age')
-                if age:
-                    try:
-                        # 转换 ISO 格式为简单日期字符串
-                        dt = datetime.fromisoformat(age.replace('Z', '+00:00'))
-                        published_date = dt.strftime('%Y-%m-%d')
-                    except (ValueError, AttributeError):
-                        published_date = age  # 解析失败时使用原始值
+                if isinstance(age, str) and _ISO_DATE_RE.match(age):
+                    published_date = age[:10]
+                else:
+                    published_date = age or None
 
                 results.append(SearchResult(
                     title=item.get('title', ''),
@@ -177,14 +174,3 @@ class BraveSearchProvider(BaseSearchProvider):
             return response.text[:200]
         except:
             return f"HTTP {response.status_code}: {response.text[:200]}"
-
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        """从 URL 提取域名作为来源"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace('www.', '')
-            return domain or '未知来源'
-        except:
-            return '未知来源'
\ No newline at end of file
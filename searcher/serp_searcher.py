@@ -1,18 +1,21 @@
+import bisect
 import logging
-import random
-import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
-from itertools import cycle
-import requests
-from newspaper import Article, Config
 
-from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content
+from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_contents, parse_json_response
 
 logger = logging.getLogger(__name__)
 
+# 时间范围 tbs：days <= 1/7/30 天分别对应过去24小时/一周/一月，更长为过去一年
+_TBS_DAYS = (1, 7, 30)
+_TBS_VALUES = ('qdr:d', 'qdr:w', 'qdr:m', 'qdr:y')
+
+# 摘要已超过该长度的自然结果不再下载网页正文
+SNIPPET_ENOUGH_CHARS = 200
+
 
 class SerpAPISearchProvider(BaseSearchProvider):
     """
@@ -26,48 +29,63 @@ class SerpAPISearchProvider(BaseSearchProvider):
     文档：https://serpapi.com/baidu-search-api?utm_source=github_daily_stock_analysis
     """
     
+    API_ENDPOINT = "https://serpapi.com/search"
+    # 请求频率或账户搜索次数超限的 HTTP 状态码
+    QUOTA_STATUS_CODES = (429,)
+
+    # 各次请求相同的参数
+    BASE_PARAMS = {
+        "engine": "google",
+        "google_domain": "google.com.hk", # 使用香港谷歌，中文支持较好
+        "hl": "zh-cn",  # 中文界面
+        "gl": "cn",     # 中国地区偏好
+        "output": "json",
+    }
+    
     def __init__(self, api_keys: List[str]):
         super().__init__(api_keys, "SerpAPI")
     
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
         """执行 SerpAPI 搜索"""
-        try:
-            from serpapi import GoogleSearch
-        except ImportError:
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message="google-search-results 未安装，请运行: pip install google-search-results"
-            )
-        
         try:
             # 确定时间范围参数 tbs
-            tbs = "qdr:w"  # 默认一周
-            if days <= 1:
-                tbs = "qdr:d"  # 过去24小时
-            elif days <= 7:
-                tbs = "qdr:w"  # 过去一周
-            elif days <= 30:
-                tbs = "qdr:m"  # 过去一月
-            else:
-                tbs = "qdr:y"  # 过去一年
+            tbs = _TBS_VALUES[bisect.bisect_left(_TBS_DAYS, days)]
 
             # 使用 Google 搜索 (获取 Knowledge Graph, Answer Box 等)
             params = {
-                "engine": "google",
+                **self.BASE_PARAMS,
                 "q": query,
                 "api_key": api_key,
-                "google_domain": "google.com.hk", # 使用香港谷歌，中文支持较好
-                "hl": "zh-cn",  # 中文界面
-                "gl": "cn",     # 中国地区偏好
                 "tbs": tbs,     # 时间范围限制
-                "num": max_results # 请求的结果数量，注意：Google API有时不严格遵守
+                "num": max_results, # 请求的结果数量，注意：Google API有时不严格遵守
             }
             
-            search = GoogleSearch(params)
-            response = search.get_dict()
+            # 直接调用 REST 接口（经共享会话复用连接），不再每次构造 SDK 客户端
+            resp = self._http().get(self.API_ENDPOINT, params=params, timeout=30)
+            if resp.status_code != 200:
+                try:
+                    detail = parse_json_response(resp).get('error', resp.text[:200])
+                except ValueError:
+                    detail = resp.text[:200]
+                error_msg = f"HTTP {resp.status_code}: {detail}"
+                if resp.status_code in self.QUOTA_STATUS_CODES:
+                    error_msg = f"API 配额已用尽: {error_msg}"
+                return SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    success=False,
+                    error_message=error_msg
+                )
+            response = parse_json_response(resp)
+            if response.get('error'):
+                return SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    success=False,
+                    error_message=str(response['error'])
+                )
             
             # 记录原始响应到日志
             logger.debug(f"[SerpAPI] 原始响应 keys: {response.keys()}")
@@ -158,29 +176,37 @@ class SerpAPISearchProvider(BaseSearchProvider):
                      ))
 
             # 4. 解析 Organic Results (自然搜索结果)
-            organic_results = response.get('organic_results', [])
+            organic_results = response.get('organic_results', [])[:max_results]
 
-            for item in organic_results[:max_results]:
+            # 并发下载各结果网页正文（总耗时约为最慢的一个网页），摘要已足够长的结果跳过
+            try:
+                page_contents = fetch_url_contents(
+                    [
+                        item.get('link', '') for item in organic_results
+                        if len(item.get('snippet', '')) <= SNIPPET_ENOUGH_CHARS
+                    ],
+                    timeout=5,
+                    session=self._http()
+                )
+            except Exception as e:
+                logger.debug(f"[SerpAPI] Fetch content failed: {e}")
+                page_contents = {}
+
+            for item in organic_results:
                 link = item.get('link', '')
                 snippet = item.get('snippet', '')
 
                 # 增强：如果需要，解析网页正文
                 # 策略：如果摘要太短，或者为了获取更多信息，可以请求网页
                 # 这里我们对所有结果尝试获取正文，但为了性能，仅获取前1000字符
-                content = ""
-                if link:
-                   try:
-                       fetched_content = fetch_url_content(link, timeout=5)
-                       if fetched_content:
-                           # 如果获取到了正文，将其拼接到 snippet 中，或者替换 snippet
-                           # 这里选择拼接，保留原摘要
-                           content = fetched_content
-                           if len(content) > 500:
-                               snippet = f"{snippet}\n\n【网页详情】\n{content[:500]}..."
-                           else:
-                               snippet = f"{snippet}\n\n【网页详情】\n{content}"
-                   except Exception as e:
-                       logger.debug(f"[SerpAPI] Fetch content failed: {e}")
+                content = page_contents.get(link, "")
+                if content:
+                    # 如果获取到了正文，将其拼接到 snippet 中，或者替换 snippet
+                    # 这里选择拼接，保留原摘要
+                    if len(content) > 500:
+                        snippet = f"{snippet}\n\n【网页详情】\n{content[:500]}..."
+                    else:
+                        snippet = f"{snippet}\n\n【网页详情】\n{content}"
 
                 results.append(SearchResult(
                     title=item.get('title', ''),
@@ -206,13 +232,3 @@ class SerpAPISearchProvider(BaseSearchProvider):
                 success=False,
                 error_message=error_msg
             )
-    
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        """从 URL 提取域名"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc.replace('www.', '') or '未知来源'
-        except:
-            return '未知来源'
\ No newline at end of file
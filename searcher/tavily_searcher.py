@@ -7,9 +7,8 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from itertools import cycle
 import requests
-from newspaper import Article, Config
 
-from .base import BaseSearchProvider, SearchResponse, SearchResult, fetch_url_content
+from .base import BaseSearchProvider, SearchResponse, SearchResult, parse_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -26,49 +25,65 @@ class TavilySearchProvider(BaseSearchProvider):
     文档：https://docs.tavily.com/
     """
     
+    API_ENDPOINT = "https://api.tavily.com/search"
+    # 请求频率或账户配额超限的 HTTP 状态码
+    QUOTA_STATUS_CODES = (429, 432, 433)
+    
     def __init__(self, api_keys: List[str]):
         super().__init__(api_keys, "Tavily")
     
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
         """执行 Tavily 搜索"""
         try:
-            from tavily import TavilyClient
-        except ImportError:
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message="tavily-python 未安装，请运行: pip install tavily-python"
-            )
-        
-        try:
-            client = TavilyClient(api_key=api_key)
-            
+            # 直接调用 REST 接口（经共享会话复用连接），不再每次构造 TavilyClient
             # 执行搜索（优化：使用advanced深度、限制最近几天）
-            response = client.search(
-                query=query,
-                search_depth="advanced",  # advanced 获取更多结果
-                max_results=max_results,
-                include_answer=False,
-                include_raw_content=False,
-                days=days,  # 搜索最近天数的内容
+            resp = self._http().post(
+                self.API_ENDPOINT,
+                headers={'Authorization': f'Bearer {api_key}'},
+                json={
+                    "query": query,
+                    "search_depth": "advanced",  # advanced 获取更多结果
+                    "max_results": max_results,
+                    "include_answer": False,
+                    "include_raw_content": False,
+                    "days": days,  # 搜索最近天数的内容
+                },
+                timeout=15,
             )
+            if resp.status_code != 200:
+                try:
+                    detail = parse_json_response(resp).get('detail', resp.text[:200])
+                except ValueError:
+                    detail = resp.text[:200]
+                error_msg = f"HTTP {resp.status_code}: {detail}"
+                if resp.status_code in self.QUOTA_STATUS_CODES:
+                    error_msg = f"API 配额已用尽: {error_msg}"
+                return SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    success=False,
+                    error_message=error_msg
+                )
+            response = parse_json_response(resp)
+            
+            items = response.get('results', [])
             
             # 记录原始响应到日志
-            logger.info(f"[Tavily] 搜索完成，query='{query}', 返回 {len(response.get('results', []))} 条结果")
+            logger.info(f"[Tavily] 搜索完成，query='{query}', 返回 {len(items)} 条结果")
             logger.debug(f"[Tavily] 原始响应: {response}")
             
             # 解析结果
-            results = []
-            for item in response.get('results', []):
-                results.append(SearchResult(
+            results = [
+                SearchResult(
                     title=item.get('title', ''),
                     snippet=item.get('content', '')[:500],  # 截取前500字
-                    url=item.get('url', ''),
-                    source=self._extract_domain(item.get('url', '')),
+                    url=(url := item.get('url', '')),
+                    source=self._extract_domain(url),
                     published_date=item.get('published_date'),
-                ))
+                )
+                for item in items
+            ]
             
             return SearchResponse(
                 query=query,
@@ -90,14 +105,3 @@ class TavilySearchProvider(BaseSearchProvider):
                 success=False,
                 error_message=error_msg
             )
-    
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        """从 URL 提取域名作为来源"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace('www.', '')
-            return domain or '未知来源'
-        except:
-            return '未知来源'
\ No newline at end of file
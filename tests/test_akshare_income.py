@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+财报数据测试：披露报告期的选取，以及业绩报表（批量）与财务摘要（逐只）输出同一格式的记录
+"""
+import math
+import sys
+from datetime import datetime
+from types import ModuleType
+
+import pandas as pd
+import pytest
+
+from data_fetcher import akshare_fetcher
+from data_fetcher.akshare_fetcher import AkshareFetcher, _latest_disclosed_period
+from data_fetcher.realtime_types import get_realtime_circuit_breaker
+from utils.config import FetcherArgs
+
+PERIOD = '20250630'
+
+
+@pytest.mark.parametrize('today, expected', [
+    (datetime(2025, 4, 30), '20240930'),
+    (datetime(2025, 5, 1), '20250331'),
+    (datetime(2025, 8, 31), '20250331'),
+    (datetime(2025, 9, 1), '20250630'),
+    (datetime(2025, 10, 31), '20250630'),
+    (datetime(2025, 11, 1), '20250930'),
+    (datetime(2026, 1, 5), '20250930'),
+])
+def test_latest_disclosed_period(today, expected):
+    assert _latest_disclosed_period(today) == expected
+
+
+def _yjbb_frame():
+    return pd.DataFrame({
+        '股票代码': [600519, '000001'],
+        '营业总收入-营业总收入': ['1.5e10', 2.0e9],
+        '营业总收入-同比增长': [12.5, '--'],
+        '净利润-净利润': [7.0e9, 5.0e8],
+        '净利润-同比增长': [15.0, -3.2],
+    })
+
+
+def _abstract_frame():
+    rows = [
+        ('成长能力', '营业总收入', 1.5e10, 1.2e10),
+        ('成长能力', '营业总收入增长率', 12.5, 8.0),
+        ('成长能力', '净利润', 7.0e9, 6.0e9),
+        ('成长能力', '归属母公司净利润增长率', 15.0, 9.0),
+        ('常用指标', '营业总收入', 0.0, 0.0),
+    ]
+    return pd.DataFrame(rows, columns=['选项', '指标', PERIOD, '20250331'])
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    """注入假的 akshare 模块，并把报告期固定为 PERIOD"""
+    fake_ak = ModuleType('akshare')
+    fake_ak.stock_yjbb_em = lambda date: _yjbb_frame() if date == PERIOD else pd.DataFrame()
+    fake_ak.stock_financial_abstract = lambda code: _abstract_frame()
+    monkeypatch.setitem(sys.modules, 'akshare', fake_ak)
+    monkeypatch.setattr(akshare_fetcher, '_latest_disclosed_period', lambda today=None: PERIOD)
+    get_realtime_circuit_breaker().reset('akshare_em')
+    return AkshareFetcher(FetcherArgs(), sleep_min=0, sleep_max=0)
+
+
+def test_income_map_normalizes_records(fetcher):
+    mapping = fetcher.get_income_map()
+
+    assert set(mapping) == {'600519', '000001'}
+    record = mapping['600519']
+    assert record == {'code': '600519', 'period': PERIOD, 'income': 1.5e10,
+                      'income_inc': 12.5, 'profit': 7.0e9, 'profit_inc': 15.0}
+    assert math.isnan(mapping['000001']['income_inc'])
+
+
+def test_per_code_record_matches_bulk_record(fetcher):
+    single = fetcher.get_income_data('600519')
+
+    assert single == fetcher.get_income_map()['600519']
+
+
+def test_per_code_missing_period_returns_none(fetcher, monkeypatch):
+    monkeypatch.setattr(akshare_fetcher, '_latest_disclosed_period', lambda today=None: '20250930')
+
+    assert fetcher.get_income_data('600519') is None
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+BaseFetcher.get_daily_data 测试：默认返回多取的全部数据，trim=True 时截取最近 days 个交易日
+"""
+import numpy as np
+import pandas as pd
+
+from data_fetcher.base import BaseFetcher
+from utils.config import FetcherArgs
+
+
+class _FrameFetcher(BaseFetcher):
+    """按请求的日期范围返回工作日行情的数据源替身"""
+    name = "FrameFetcher"
+    priority = 0
+
+    def __init__(self):
+        self.args = FetcherArgs()
+
+    def _fetch_raw_data(self, stock_code, start_date, end_date):
+        dates = pd.bdate_range(start_date, end_date)
+        close = np.linspace(10, 20, len(dates))
+        return pd.DataFrame({
+            'date': dates, 'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': 1e5, 'amount': 1e7, 'pct_chg': 0.0,
+        })
+
+    def _normalize_data(self, df, stock_code):
+        return df
+
+
+def test_default_returns_full_over_fetched_frame():
+    df = _FrameFetcher().get_daily_data('600519', end_date='2026-10-15', days=30)
+    # 按日历日多取一倍：60 个日历日约 43 个工作日
+    assert len(df) > 30
+    assert df['date'].iloc[-1] == pd.Timestamp('2026-10-15')
+
+
+def test_trim_keeps_last_days_up_to_end_date():
+    df = _FrameFetcher().get_daily_data('600519', end_date='2026-10-15', days=30, trim=True)
+    assert len(df) == 30
+    assert df['date'].iloc[-1] == pd.Timestamp('2026-10-15')
+    # 均线在截取前计算，首行已包含预热数据
+    assert df['ma20'].iloc[0] != df['close'].iloc[0]
+
+
+def test_explicit_start_date_is_never_trimmed():
+    df = _FrameFetcher().get_daily_data(
+        '600519', start_date='2026-01-01', end_date='2026-10-15', days=30, trim=True
+    )
+    assert df['date'].iloc[0] == pd.Timestamp('2026-01-01')
+    assert len(df) > 30
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+utils.cache.cached 装饰器测试：TTL 过期、缓存键与 per_day 键、进程内缓存（含独立有效期）与 None 结果的处理
+"""
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import cached
+
+
+class _Source:
+    """记录调用次数的数据源替身（cached 从 self.args 读取缓存配置）"""
+
+    def __init__(self, cache_dir=None, priority="tencent"):
+        self.args = SimpleNamespace(cache_dir=cache_dir, realtime_source_priority=priority)
+        self.calls = 0
+
+    @cached(0.2)
+    def short_lived(self, code):
+        self.calls += 1
+        return f"{code}-{self.calls}"
+
+    @cached(3600, per_day=True)
+    def daily(self, code):
+        self.calls += 1
+        return f"{code}-{self.calls}"
+
+    @cached(3600, memory_size=2, disk=False)
+    def memo_only(self, code):
+        self.calls += 1
+        return [code, self.calls]
+
+    @cached(3600, memory_size=2, disk=False, negative_ttl=3600)
+    def maybe_missing(self, code):
+        self.calls += 1
+        return None
+
+    @cached(3600, memory_size=8, disk=False)
+    def window(self, code, days=30):
+        self.calls += 1
+        return [code, days, self.calls]
+
+    @cached(3600, memory_size=2, memory_ttl=0.2)
+    def fresh_in_memory(self, code):
+        self.calls += 1
+        return [code, self.calls]
+
+
+@pytest.fixture
+def fixed_today(monkeypatch):
+    """将 cached 使用的当天日期固定为可修改的值"""
+    today = {'value': datetime(2026, 10, 15, 10, 0)}
+
+    class _FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return today['value']
+
+    monkeypatch.setattr(cache_module, 'datetime', _FixedDatetime)
+    return today
+
+
+def test_without_cache_dir_every_call_hits_source():
+    source = _Source(cache_dir=None)
+    source.short_lived("600519")
+    source.short_lived("600519")
+    assert source.calls == 2
+
+
+def test_disk_cache_hit_until_ttl_expires(tmp_path):
+    source = _Source(cache_dir=str(tmp_path))
+    assert source.short_lived("600519") == "600519-1"
+    # 新实例共享磁盘缓存
+    assert _Source(cache_dir=str(tmp_path)).short_lived("600519") == "600519-1"
+    time.sleep(0.3)
+    assert source.short_lived("600519") == "600519-2"
+
+
+def test_key_includes_arguments_and_source_priority(tmp_path):
+    source = _Source(cache_dir=str(tmp_path))
+    source.short_lived("600519")
+    source.short_lived("000001")
+    assert source.calls == 2
+    other_priority = _Source(cache_dir=str(tmp_path), priority="efinance")
+    assert other_priority.short_lived("600519") == "600519-1"
+    assert other_priority.calls == 1
+
+
+def test_per_day_key_changes_with_date(tmp_path, fixed_today):
+    source = _Source(cache_dir=str(tmp_path))
+    assert source.daily("600519") == "600519-1"
+    fixed_today['value'] = datetime(2026, 10, 15, 23, 59)
+    assert source.daily("600519") == "600519-1"
+    fixed_today['value'] = datetime(2026, 10, 16, 9, 30)
+    assert source.daily("600519") == "600519-2"
+
+
+def test_per_day_key_uses_exchange_timezone(tmp_path, monkeypatch):
+    # 服务器时钟为 UTC；北京时间比 UTC 早 8 小时跨天
+    utc_now = {'value': datetime(2026, 10, 15, 15, 0, tzinfo=timezone.utc)}
+
+    class _UtcDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return utc_now['value'].astimezone(tz) if tz else utc_now['value'].replace(tzinfo=None)
+
+    monkeypatch.setattr(cache_module, 'datetime', _UtcDatetime)
+    source = _Source(cache_dir=str(tmp_path))
+    assert source.daily("600519") == "600519-1"
+    utc_now['value'] = datetime(2026, 10, 15, 15, 59, tzinfo=timezone.utc)
+    assert source.daily("600519") == "600519-1"
+    # UTC 日期不变，但北京时间跨过零点，缓存键随之变化
+    utc_now['value'] = datetime(2026, 10, 15, 16, 30, tzinfo=timezone.utc)
+    assert source.daily("600519") == "600519-2"
+
+
+def test_key_ignores_positional_or_keyword_spelling():
+    source = _Source(cache_dir=None)
+    first = source.window("600519")
+    assert source.window("600519", 30) is first
+    assert source.window("600519", days=30) is first
+    assert source.window(code="600519") is first
+    assert source.window("600519", days=60) is not first
+    assert source.calls == 2
+
+
+def test_unsupported_argument_types_bypass_cache():
+    source = _Source(cache_dir=None)
+    source.window("600519", days={'n': 30})
+    source.window("600519", days={'n': 30})
+    assert source.calls == 2
+
+
+def test_memory_tier_is_lru_bounded_without_cache_dir():
+    source = _Source(cache_dir=None)
+    first = source.memo_only("a")
+    assert source.memo_only("a") is first
+    source.memo_only("b")
+    source.memo_only("c")
+    # 容量为 2，最久未使用的 "a" 已被淘汰
+    assert source.memo_only("a") is not first
+    assert source.calls == 4
+
+
+def test_disk_false_skips_disk_tier(tmp_path):
+    source = _Source(cache_dir=str(tmp_path))
+    first = source.memo_only("a")
+    assert source.memo_only("a") is first
+    assert source.calls == 1
+    assert not any(tmp_path.iterdir())
+
+
+def test_none_results_cached_only_with_negative_ttl(tmp_path):
+    source = _Source(cache_dir=str(tmp_path))
+    assert source.maybe_missing("x") is None
+    assert source.maybe_missing("x") is None
+    assert source.calls == 1
+
+
+def test_memory_ttl_expires_before_disk_ttl(tmp_path):
+    source = _Source(cache_dir=None)
+    first = source.fresh_in_memory("a")
+    assert source.fresh_in_memory("a") is first
+    time.sleep(0.3)
+    assert source.fresh_in_memory("a") == ["a", 2]
+
+    # 内存缓存过期后仍可从磁盘缓存读取
+    source = _Source(cache_dir=str(tmp_path))
+    source.fresh_in_memory("a")
+    time.sleep(0.3)
+    assert source.fresh_in_memory("a") == ["a", 1]
+    assert source.calls == 1
+
+
+def test_daily_memory_ttl_is_short_during_trading(monkeypatch):
+    from framework import data_fetch_manager as manager_module
+
+    monkeypatch.setattr(manager_module, '_is_trading_session', lambda epoch_second: True)
+    assert manager_module.daily_memory_ttl() == manager_module.DAILY_MEMORY_TTL_TRADING
+    monkeypatch.setattr(manager_module, '_is_trading_session', lambda epoch_second: False)
+    assert manager_module.daily_memory_ttl() == pytest.approx(manager_module.daily_data_ttl(), abs=1)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+数据源调用测试：对冲请求（单个调用不经过线程池、超时记录到 errors、返回最先得到的有效结果）与限流重试
+"""
+import threading
+import time
+
+import pytest
+
+from data_fetcher.base import DataFetchError, RateLimitError
+from framework.data_fetch_manager import RATE_LIMIT_ATTEMPTS, _call_with_backoff, _iter_completed, _race
+
+
+def test_single_call_runs_in_current_thread():
+    errors = []
+    results = list(_iter_completed([('a', threading.current_thread)], errors))
+
+    assert results == [('a', threading.current_thread())]
+    assert errors == []
+
+
+def test_single_call_failure_is_recorded():
+    def fail():
+        raise ValueError("boom")
+
+    errors = []
+    assert list(_iter_completed([('a', fail)], errors)) == []
+    assert len(errors) == 1 and 'boom' in errors[0]
+
+
+def test_timeout_is_recorded_not_raised():
+    errors = []
+    calls = [('slow', lambda: time.sleep(0.5)), ('slower', lambda: time.sleep(0.5))]
+
+    assert list(_iter_completed(calls, errors, timeout=0.05)) == []
+    assert len(errors) == 1 and '超时' in errors[0]
+
+
+def test_race_returns_first_valid_result():
+    def slow():
+        time.sleep(0.2)
+        return 'slow'
+
+    errors = []
+    winner = _race([('invalid', lambda: None), ('slow', slow)], lambda r: r is not None, errors)
+
+    assert winner == ('slow', 'slow')
+
+
+class _FlakySource:
+    """前 failures 次调用抛出 error 的数据源替身，记录冷却等待与限流标记次数"""
+    name = "FlakySource"
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = self.backoffs = self.marks = 0
+
+    def rate_limit_backoff(self):
+        self.backoffs += 1
+
+    def mark_rate_limited(self):
+        self.marks += 1
+
+    def fetch(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error()
+        return 'ok'
+
+
+def test_rate_limited_call_is_retried_after_backoff():
+    source = _FlakySource(1, lambda: RateLimitError("429"))
+
+    assert _call_with_backoff(source, 'fetch') == 'ok'
+    assert (source.calls, source.marks, source.backoffs) == (2, 1, 2)
+
+
+def test_wrapped_rate_limit_raises_after_last_attempt():
+    def wrapped():
+        try:
+            raise RateLimitError("429")
+        except RateLimitError as e:
+            raise DataFetchError("wrapped") from e
+
+    source = _FlakySource(RATE_LIMIT_ATTEMPTS, wrapped)
+    with pytest.raises(RateLimitError):
+        _call_with_backoff(source, 'fetch')
+    assert source.calls == RATE_LIMIT_ATTEMPTS
+
+
+def test_other_errors_are_not_retried():
+    source = _FlakySource(1, lambda: DataFetchError("bad"))
+    with pytest.raises(DataFetchError):
+        _call_with_backoff(source, 'fetch')
+    assert (source.calls, source.marks) == (1, 0)
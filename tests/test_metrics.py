@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+技术指标计算与旧版 ta/ewm 实现的一致性测试
+
+旧版实现逐只构造 pandas Series 并调用 ta 库；_metrics_kernel 改为单次遍历计算，
+交叉计数需完全一致，浮点指标在数值误差范围内一致。
+"""
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ta_trend = pytest.importorskip("ta.trend")
+ta_volatility = pytest.importorskip("ta.volatility")
+
+from data_fetcher.base import MIN_HISTORY_DAYS, _calculate_metrics
+
+INT_KEYS = ('gloden_cross_days', 'cross_count_10d')
+
+
+def _baseline_metrics(df: pd.DataFrame) -> dict:
+    """旧版 _calculate_metrics（pandas ewm + ta 库）"""
+    close = df['close']
+    result = {'amount': df['amount'].iloc[-1], 'close': close.iloc[-1]}
+    result['amount_ma20'] = df['amount'].rolling(window=20).mean().iloc[-1]
+    ema5, ema10, ema50, ema200 = (close.ewm(span=span, adjust=False).mean() for span in (5, 10, 50, 200))
+    result['ema5'] = ema5.iloc[-1]
+    result['ema10'] = ema10.iloc[-1]
+    result['ema50'] = ema50.iloc[-1]
+    result['ema200'] = ema200.iloc[-1]
+    result['ema200_slop'] = (ema200.iloc[-1] - ema200.iloc[-2]) / ema200.iloc[-2] * 100
+    is_golden_cross = (ema5 > ema10) & (ema5.shift(1) <= ema10.shift(1))
+    is_death_cross = (ema5 < ema10) & (ema5.shift(1) >= ema10.shift(1))
+    cross_days = df[is_golden_cross].index.tolist()
+    result['gloden_cross_days'] = len(df) - 1 - cross_days[-1] if cross_days else -1
+    result['cross_count_10d'] = int((is_golden_cross | is_death_cross).astype(int).iloc[-10:].sum())
+    macd = ta_trend.MACD(close=close, window_fast=12, window_slow=26, window_sign=9)
+    result['macd_histogram'] = float(macd.macd_diff().iloc[-1])
+    result['ema200_deviation_rate'] = (result['ema200'] - result['close']) / result['ema200'] * 100
+    result['20d_inc'] = (close.iloc[-1] - close.iloc[-21]) / close.iloc[-21] * 100
+    result['60d_inc'] = (close.iloc[-1] - close.iloc[-61]) / close.iloc[-61] * 100
+    atr = ta_volatility.AverageTrueRange(high=df['high'], low=df['low'], close=close, window=14)
+    result['atr_rate'] = float(atr.average_true_range().iloc[-1]) / float(close.iloc[-1]) * 100
+    bb = ta_volatility.BollingerBands(close=close, window=20, window_dev=2)
+    percent_b = (close - bb.bollinger_lband()) / (bb.bollinger_hband() - bb.bollinger_lband())
+    result['bb_percent_b1'] = percent_b.iloc[-1]
+    result['bb_percent_b2'] = percent_b.iloc[-2]
+    return result
+
+
+def _random_daily_frame(rng: np.random.Generator, days: int) -> pd.DataFrame:
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame({
+        'date': pd.bdate_range('2024-01-02', periods=days),
+        'open': close * (1 + rng.normal(0, 0.005, days)),
+        'high': close * (1 + rng.uniform(0, 0.03, days)),
+        'low': close * (1 - rng.uniform(0, 0.03, days)),
+        'close': close,
+        'volume': rng.uniform(1e5, 1e6, days),
+        'amount': rng.uniform(1e7, 1e8, days),
+    })
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("days", [MIN_HISTORY_DAYS, 120, 260])
+def test_metrics_match_baseline(seed, days):
+    df = _random_daily_frame(np.random.default_rng(seed), days)
+    metrics = _calculate_metrics(df)
+    for key, expected in _baseline_metrics(df).items():
+        actual = metrics[key]
+        if key in INT_KEYS:
+            assert actual == expected, key
+        else:
+            assert math.isclose(actual, expected, rel_tol=1e-6, abs_tol=1e-9), (key, actual, expected)
+
+
+def test_short_history_long_window_metrics_are_nan():
+    df = _random_daily_frame(np.random.default_rng(0), MIN_HISTORY_DAYS - 1)
+    metrics = _calculate_metrics(df)
+    assert math.isnan(metrics['ema200'])
+    assert math.isnan(metrics['60d_inc'])
+    assert not math.isnan(metrics['20d_inc'])
+
+
+def test_zero_prices_give_nan_or_inf_instead_of_raising():
+    df = _random_daily_frame(np.random.default_rng(0), 120)
+    df[['open', 'high', 'low', 'close']] = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        metrics = _calculate_metrics(df)
+    assert math.isnan(metrics['atr_rate'])
+    assert math.isnan(metrics['ema200_deviation_rate'])
+    assert math.isnan(metrics['ema200_slop'])
+
+
+def test_zero_reference_price_gives_inf_increase():
+    df = _random_daily_frame(np.random.default_rng(0), 120)
+    df.loc[len(df) - 21, 'close'] = 0.0
+    metrics = _calculate_metrics(df)
+    assert math.isinf(metrics['20d_inc'])
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+新闻搜索时间范围测试：按星期几确定天数，结果缓存 NEWS_SEARCH_DAYS_TTL 秒
+"""
+from datetime import datetime
+
+import pytest
+
+from framework import search_service
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可修改的当前时间，并清空搜索天数缓存"""
+    now = {'value': datetime(2026, 10, 12, 9, 0).timestamp()}  # 周一
+    monkeypatch.setattr(search_service.time, 'time', lambda: now['value'])
+    monkeypatch.setattr(search_service, '_news_search_days_cache', (0.0, 1))
+    return now
+
+
+@pytest.mark.parametrize('day, expected', [(12, 3), (13, 1), (16, 1), (17, 2), (18, 2)])
+def test_search_days_by_weekday(clock, day, expected):
+    clock['value'] = datetime(2026, 10, day, 9, 0).timestamp()
+    assert search_service._news_search_days() == expected
+
+
+def test_search_days_cached_until_ttl(clock):
+    clock['value'] = datetime(2026, 10, 12, 23, 59, 30).timestamp()
+    assert search_service._news_search_days() == 3
+    # 缓存有效期内跨到周二，仍返回缓存值
+    clock['value'] = datetime(2026, 10, 13, 0, 0, 10).timestamp()
+    assert search_service._news_search_days() == 3
+    clock['value'] = datetime(2026, 10, 13, 9, 0).timestamp()
+    assert search_service._news_search_days() == 1
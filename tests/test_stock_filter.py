@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+StockFilter 按列筛选（_trend_mask / _risk_flags / _additional_mask）与旧版逐只判断的一致性测试
+"""
+import math
+import random
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_fetcher.base import Metrics
+from framework import stock_filter as sf
+from framework.stock_filter import StockFilter
+from utils.config import FetcherArgs, FilterArgs
+
+
+def _baseline_trend(m: Metrics) -> bool:
+    """旧版 _single_trend_filter"""
+    if not (m.amount_ma20 >= sf.MA20_AMOUNT and m.amount >= m.amount_ma20 * sf.MA20_AMOUNT_FACTOR):
+        return False
+    if not m.close > m.ema200:
+        return False
+    if not m.ema200_slop >= sf.EMA200_SLOP:
+        return False
+    if not (m.gloden_cross_days >= sf.GLODEN_CROSS_DAYS and m.cross_count_10d <= sf.CROSS_COUNT_10D):
+        return False
+    return m.macd_histogram >= sf.MACD_HISTOGRAM
+
+
+def _baseline_risk(m: Metrics) -> dict:
+    """旧版 _single_risk_filter 写入的风险项与风险分"""
+    flags = {
+        '长期偏离EMA200>25%': abs(m.ema200_deviation_rate) > sf.EMA200_DEVIATION_RATE_HIGH,
+        '长期偏离EMA200>15%': abs(m.ema200_deviation_rate) > sf.EMA200_DEVIATION_RATE_LOW,
+        '20日涨幅>25%': m.inc_20d > sf.INCOME_INCREASE_20D,
+        '60日涨幅>50%': m.inc_60d > sf.INCOME_INCREASE_60D,
+        'ATR/收盘价比值>4%': m.atr_rate > sf.ATR_RATE,
+        '布林带%B连续2日>0.9': m.bb_percent_b1 > sf.BOLL_PCT_B and m.bb_percent_b2 > sf.BOLL_PCT_B,
+    }
+    flags['风险分'] = sum(flags.values())
+    return flags
+
+
+def _baseline_additional(m: Metrics) -> bool:
+    """旧版 _single_additional_filter"""
+    return m.ema50 >= m.ema200
+
+
+def _random_metrics(rng: random.Random) -> Metrics:
+    """围绕各阈值随机生成指标（含 NaN），使每个条件都有通过和不通过的样本"""
+    nan_or = lambda value: math.nan if rng.random() < 0.1 else value
+    return Metrics(
+        amount=rng.uniform(1e8, 9e8),
+        amount_ma20=rng.uniform(2e8, 5e8),
+        close=rng.uniform(5, 20),
+        ema5=rng.uniform(5, 20),
+        ema10=rng.uniform(5, 20),
+        ema50=nan_or(rng.uniform(5, 20)),
+        ema200=nan_or(rng.uniform(5, 20)),
+        ema200_slop=rng.uniform(-0.1, 0.1),
+        gloden_cross_days=rng.choice([-1, 0, 1, 3]),
+        cross_count_10d=rng.choice([0, 1, 2]),
+        macd_histogram=rng.uniform(-1, 1),
+        ema200_deviation_rate=rng.uniform(-40, 40),
+        inc_20d=rng.uniform(0, 40),
+        inc_60d=nan_or(rng.uniform(0, 80)),
+        atr_rate=rng.uniform(1, 6),
+        bb_percent_b1=nan_or(rng.uniform(0, 1.2)),
+        bb_percent_b2=rng.uniform(0, 1.2),
+        ma5=rng.uniform(5, 20),
+        ma10=rng.uniform(5, 20),
+        ma20=rng.uniform(5, 20),
+        volume_ratio=rng.uniform(0.5, 3),
+    )
+
+
+@pytest.fixture(scope="module")
+def metrics_by_code():
+    rng = random.Random(1)
+    return {f"{i:06d}": _random_metrics(rng) for i in range(3000)}
+
+
+@pytest.fixture(scope="module")
+def metrics_frame(metrics_by_code):
+    columns = [f.name for f in fields(Metrics)]
+    return pd.DataFrame(
+        [[getattr(m, col) for col in columns] for m in metrics_by_code.values()],
+        index=list(metrics_by_code),
+        columns=columns,
+    )
+
+
+def test_trend_mask_matches_scalar_filter(metrics_by_code, metrics_frame):
+    expected = np.array([_baseline_trend(m) for m in metrics_by_code.values()])
+    assert expected.any() and not expected.all()
+    np.testing.assert_array_equal(StockFilter._trend_mask(metrics_frame), expected)
+
+
+def test_risk_flags_match_scalar_filter(metrics_by_code, metrics_frame):
+    risk = StockFilter._risk_flags(metrics_frame)
+    for code, m in metrics_by_code.items():
+        row = risk.loc[code]
+        assert {k: (int(v) if k == '风险分' else bool(v)) for k, v in row.items()} == _baseline_risk(m), code
+
+
+def test_additional_mask_matches_scalar_filter(metrics_by_code, metrics_frame):
+    expected = np.array([_baseline_additional(m) for m in metrics_by_code.values()])
+    np.testing.assert_array_equal(StockFilter._additional_mask(metrics_frame), expected)
+
+
+def test_evaluate_history_matches_scalar_pipeline(metrics_by_code, metrics_frame):
+    codes = list(metrics_by_code)
+    expected = [
+        code for code, m in metrics_by_code.items()
+        if _baseline_trend(m)
+        and _baseline_risk(m)['风险分'] <= sf.RISK_SCORE_THRESHOLD
+        and _baseline_additional(m)
+    ]
+    assert expected
+    filter_ = StockFilter.__new__(StockFilter)
+    passed, infos = filter_._evaluate_history(codes, metrics_frame, report_type='long')
+    assert passed == expected
+    for code, info in zip(passed, infos):
+        assert info['code'] == code
+        assert info['风险分'] == _baseline_risk(metrics_by_code[code])['风险分']
+        assert info['origin_data'].keys() == metrics_by_code[code].to_dict().keys()
+
+
+def test_request_interval_override_only_when_set():
+    fetcher_args = FetcherArgs(request_interval=0.1)
+    kept = StockFilter(FilterArgs(fetcher_args=fetcher_args, analysis_delay=5.0))
+    assert kept.fetcher_manager.args.request_interval == 0.1
+
+    overridden = StockFilter(FilterArgs(fetcher_args=fetcher_args, request_interval=2.0))
+    assert overridden.fetcher_manager.args.request_interval == 2.0
+    # 覆盖时复制一份，不修改调用方传入的配置
+    assert fetcher_args.request_interval == 0.1
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+股票名称缓存测试：按条目过期、进程退出时统一写回磁盘、已回收的管理器不再被引用
+"""
+import gc
+import time
+
+from framework import data_fetch_manager as manager_module
+from framework.data_fetch_manager import DataFetcherManager
+from utils.config import FetcherArgs
+
+
+class _NameFetcher:
+    """只提供 get_stock_name 的数据源替身"""
+    name = "NameFetcher"
+    priority = 0
+
+    def __init__(self):
+        self.calls = 0
+
+    def set_http_session(self, session):
+        pass
+
+    def get_stock_name(self, stock_code):
+        self.calls += 1
+        return f"name-{stock_code}"
+
+
+def _manager(cache_dir=None):
+    return DataFetcherManager(FetcherArgs(cache_dir=cache_dir), fetchers=[_NameFetcher()])
+
+
+def test_names_expire_per_entry(monkeypatch):
+    manager = _manager()
+    manager._cache_names({'600519': '贵州茅台'})
+    clock = time.time()
+    monkeypatch.setattr(manager_module.time, 'time', lambda: clock + manager_module.NAME_CACHE_TTL - 1)
+    manager._cache_names({'000001': '平安银行'})
+    assert manager._get_cached_name('600519') == '贵州茅台'
+
+    monkeypatch.setattr(manager_module.time, 'time', lambda: clock + manager_module.NAME_CACHE_TTL + 1)
+    assert manager._get_cached_name('600519') is None
+    # 后写入的条目仍按自身获取时间计算有效期
+    assert manager._get_cached_name('000001') == '平安银行'
+
+
+def test_flush_writes_all_live_managers(tmp_path):
+    first, second = _manager(str(tmp_path / 'a')), _manager(str(tmp_path / 'b'))
+    first._cache_names({'600519': '贵州茅台'})
+    second._cache_names({'000001': '平安银行'})
+
+    manager_module._flush_stock_names()
+
+    assert _manager(str(tmp_path / 'a'))._get_cached_name('600519') == '贵州茅台'
+    assert _manager(str(tmp_path / 'b'))._get_cached_name('000001') == '平安银行'
+
+
+def test_expired_entries_skipped_on_load(tmp_path, monkeypatch):
+    manager = _manager(str(tmp_path))
+    manager._cache_names({'600519': '贵州茅台'})
+    manager._save_stock_names()
+
+    clock = time.time()
+    monkeypatch.setattr(manager_module.time, 'time', lambda: clock + manager_module.NAME_CACHE_TTL + 1)
+    assert _manager(str(tmp_path))._get_cached_name('600519') is None
+
+
+def test_released_managers_are_not_kept_alive():
+    manager = _manager()
+    before = len(manager_module._live_managers)
+    del manager
+    gc.collect()
+    assert len(manager_module._live_managers) == before - 1
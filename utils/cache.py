@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Union
+
+from utils.logger import Logger
+
+logger = Logger(__name__)
+
+# 缓存未命中标记（区分缓存值本身为 None 的情况）
+MISSING = object()
+
+
+class FileCache:
+    """
+    基于本地文件的 TTL 缓存
+
+    每个键对应一个 pickle 文件，内容为 (过期时间戳, 值)；
+    写入时先写临时文件再原子替换，支持多线程/多进程并发读写。
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def get(self, key: str) -> Any:
+        """读取缓存，不存在或已过期返回 MISSING"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expire_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return MISSING
+        except Exception as e:
+            logger.debug(f"[缓存] 读取 {path} 失败: {e}")
+            return MISSING
+
+        if time.time() > expire_at:
+            return MISSING
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """写入缓存，ttl 为有效期（秒）"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((time.time() + ttl, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"[缓存] 写入 {path} 失败: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_caches: Dict[str, FileCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(directory: str) -> FileCache:
+    """获取指定目录的缓存实例（同一目录共用一个实例）"""
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = FileCache(directory)
+        return cache
+
+
+# 进程内缓存的读写锁（各实例共用，临界区只有字典操作）
+_memory_lock = threading.Lock()
+
+# per_day 缓存键按 A 股交易所时区取日期（与 daily_data_ttl 一致，不受服务器时区影响）
+_CN_TZ = timezone(timedelta(hours=8))
+
+# 可参与缓存键的参数类型：repr 稳定且能唯一表示取值
+_KEY_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_key_safe(value: Any) -> bool:
+    """参数是否可安全放入缓存键（标量，或由标量构成的 list/tuple）"""
+    if isinstance(value, (list, tuple)):
+        return all(isinstance(item, _KEY_SCALAR_TYPES) for item in value)
+    return isinstance(value, _KEY_SCALAR_TYPES)
+
+
+def cached(
+    ttl: Union[float, Callable[[], float]],
+    per_day: bool = False,
+    memory_size: int = 0,
+    disk: bool = True,
+    negative_ttl: float = 0,
+    memory_ttl: Union[float, Callable[[], float], None] = None,
+) -> Callable:
+    """
+    数据获取方法的磁盘 TTL 缓存装饰器
+
+    用于 DataFetcherManager 的方法：缓存目录取自 self.args.cache_dir（为空时不缓存），
+    缓存键 = md5(方法名 | 参数 | 数据源优先级 [| 当天日期])。返回 None 的结果不写入磁盘。
+
+    参数按函数签名绑定并补全默认值后生成缓存键，位置参数与关键字参数写法得到同一个键。
+    参数只能是 str/int/float/bool/None 或由它们构成的 list/tuple；
+    含其他类型（DataFrame、日期对象等）的调用不走缓存，直接执行。
+
+    Args:
+        ttl: 缓存有效期（秒），或在写入时计算有效期的无参函数
+        per_day: 缓存键是否包含当天日期（未指定结束日期的日线数据跨天后需重新获取）
+        memory_size: 进程内 LRU 缓存条目上限（0 表示不启用）。内存缓存保存在实例上
+            （不延长实例生命周期），不受 cache_dir 影响，命中时返回同一对象，
+            仅用于调用方只读的结果
+        disk: 是否写入磁盘缓存（有效期仅数秒的结果只需内存缓存）
+        negative_ttl: 返回 None 的结果在内存缓存中保留的秒数（0 表示不缓存，需启用 memory_size）
+        memory_ttl: 内存缓存有效期（秒，或无参函数），None 表示与 ttl 相同；
+            磁盘缓存仍按 ttl 过期
+    """
+    if memory_ttl is None:
+        memory_ttl = ttl
+
+    def decorator(func: Callable) -> Callable:
+        memo_attr = f"_memo_{func.__name__}"
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache_dir = self.args.cache_dir if disk else None
+            if not cache_dir and not memory_size:
+                return func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:]
+            if not all(_is_key_safe(value) for _, value in arguments):
+                logger.debug(f"[缓存] {func.__name__} 参数类型不支持缓存，直接调用")
+                return func(self, *args, **kwargs)
+
+            parts = [
+                func.__qualname__,
+                repr(arguments),
+                self.args.realtime_source_priority,
+            ]
+            if per_day:
+                parts.append(datetime.now(_CN_TZ).strftime('%Y-%m-%d'))
+            key = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+            memo = None
+            if memory_size:
+                with _memory_lock:
+                    memo = self.__dict__.get(memo_attr)
+                    if memo is None:
+                        memo = self.__dict__[memo_attr] = OrderedDict()
+                    entry = memo.get(key)
+                    if entry is not None and time.monotonic() < entry[0]:
+                        memo.move_to_end(key)
+                        return entry[1]
+
+            value = MISSING
+            cache = get_cache(cache_dir) if cache_dir else None
+            if cache is not None:
+                value = cache.get(key)
+                if value is not MISSING:
+                    logger.debug(f"[缓存] 命中 {func.__name__}{args}")
+
+            if value is MISSING:
+                value = func(self, *args, **kwargs)
+                if value is None and not (memo is not None and negative_ttl > 0):
+                    return None
+                if cache is not None and value is not None:
+                    cache.set(key, value, ttl() if callable(ttl) else ttl)
+
+            if memo is not None:
+                if value is None:
+                    expire_at = time.monotonic() + negative_ttl
+                else:
+                    expire_at = time.monotonic() + (memory_ttl() if callable(memory_ttl) else memory_ttl)
+                with _memory_lock:
+                    memo[key] = (expire_at, value)
+                    memo.move_to_end(key)
+                    while len(memo) > memory_size:
+                        memo.popitem(last=False)
+            return value
+        return wrapper
+    return decorator
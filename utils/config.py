@@ -4,7 +4,7 @@ import os
 from typing import List, Optional
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class NotificationArgs:
     dingtalk_token: Optional[str] = None
     wechat_webhook_url: Optional[str] = None
@@ -32,7 +32,7 @@ class NotificationArgs:
     wechat_max_bytes: int = 8192
     
 
-@dataclass
+@dataclass(slots=True)
 class FetcherArgs:
     # === 数据源 API Token ===
     tushare_token: Optional[str] = None
@@ -45,14 +45,29 @@ class FetcherArgs:
     # - efinance/akshare_em: 东财全量接口，数据最全但容易被封
     # - tushare: Tushare Pro，需要2000积分，数据全面（付费用户可优先使用）
     realtime_source_priority: str = "tencent,akshare_sina,akshare_em,efinance"
+    # 启用的数据源（Fetcher 类名列表，None 表示全部启用；未启用的数据源模块不会被导入）
+    enabled_fetchers: Optional[List[str]] = None
+    # 数据获取磁盘缓存目录（默认不启用；缓存为 pickle 文件，只应指向本用户可写的私有目录）
+    cache_dir: Optional[str] = None
+    # 个股数据请求的最小发起间隔（秒，多线程共享），0 表示不限；默认保留节流防封禁
+    request_interval: float = 0.5
+    # 是否获取实时行情 / 筹码分布
+    enable_realtime_quote: bool = True
+    enable_chip_distribution: bool = True
+    # 日线/实时行情同时请求的数据源个数；大于 1 时成倍增加上游请求量，默认逐个故障切换
+    hedge_width: int = 1
     
 
-@dataclass
+@dataclass(slots=True)
 class FilterArgs:
-    max_workers: int = 4
+    max_workers: int = 3  # 低并发防封禁
     fetcher_args: FetcherArgs = field(default_factory=FetcherArgs)
     notifier_args: NotificationArgs = field(default_factory=NotificationArgs)
     analysis_delay: float = 0.0  # 个股分析与大盘分析之间的延迟
-    max_workers: int = 3  # 低并发防封禁
+    # 覆盖 fetcher_args.request_interval（个股数据请求的最小发起间隔，秒），None 表示沿用 fetcher_args 的配置
+    request_interval: Optional[float] = None
+    # 各阶段线程数（为空时使用 max_workers），实际线程数不超过本批股票数
+    income_max_workers: Optional[int] = None
+    history_max_workers: Optional[int] = None
     request_batch: int = 200  # 以batch方式请求，一次请求最多200只股票
     analyze_date: Optional[str] = None
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Iterable
+
+
+def create_http_session(
+    retries: int = 3,
+    backoff_factor: float = 0.3,
+    status_forcelist: Iterable[int] = (),
+    pool_size: int = 32,
+) -> Any:
+    """
+    创建共享的 HTTP 会话（requests.Session）
+
+    连接池复用 TCP/TLS 连接（keep-alive），连接错误时自动重试。
+
+    Args:
+        retries: 最大重试次数
+        backoff_factor: 重试退避系数
+        status_forcelist: 需要重试的 HTTP 状态码
+        pool_size: 连接池大小
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(status_forcelist),
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -1,36 +1,40 @@
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 
-class SingleLevelFilter(logging.Filter):
-    def __init__(self, passlevel, reject):
-        self.passlevel = passlevel
-        self.reject = reject
+_FORMATTER = logging.Formatter(
+    "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
+)
 
-    def filter(self, record):
-        if self.reject:
-            return record.levelno != self.passlevel
-        else:
-            return record.levelno == self.passlevel
+
+# 日志经队列交给后台线程写出，业务线程只做入队，不在 stdout/stderr 写入上阻塞
+_LOG_QUEUE = queue.Queue(-1)
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stderr_handler = logging.StreamHandler(sys.stderr)
+# INFO 写 stdout，其余级别写 stderr
+_stdout_handler.addFilter(lambda record: record.levelno == logging.INFO)
+_stderr_handler.addFilter(lambda record: record.levelno != logging.INFO)
+_stdout_handler.setFormatter(_FORMATTER)
+_stderr_handler.setFormatter(_FORMATTER)
+_listener = QueueListener(_LOG_QUEUE, _stdout_handler, _stderr_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
 
 
 class Logger:
     def __init__(self, name=__file__, level=logging.INFO):
-        stdout_handler = logging.StreamHandler(sys.stdout)
-        stderr_handler = logging.StreamHandler(sys.stderr)
-        stdout_handler.addFilter(SingleLevelFilter(logging.INFO, False))
-        stderr_handler.addFilter(SingleLevelFilter(logging.INFO, True))
-        stderr_handler.setLevel(level)
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
-        )
         logger = logging.getLogger(name)
+        # 同名 logger 已配置过处理器时直接复用，避免重复添加导致每条日志输出多次
+        if logger.handlers:
+            self._logger = logger
+            return
+        # 级别由 logger 控制，共享的输出处理器不再按实例设置级别
         logger.setLevel(level)
-        stdout_handler.setFormatter(formatter)
-        stderr_handler.setFormatter(formatter)
-        logger.addHandler(stdout_handler)
-        logger.addHandler(stderr_handler)
+        logger.addHandler(QueueHandler(_LOG_QUEUE))
         logger.propagate = False
         self._logger = logger
 
@@ -44,4 +48,7 @@ class Logger:
         self._logger.error(*args, **kwargs)
 
     def debug(self, *args, **kwargs):
-        self._logger.debug(*args, **kwargs)
\ No newline at end of file
+        self._logger.debug(*args, **kwargs)
+
+    def isEnabledFor(self, level):
+        return self._logger.isEnabledFor(level)
@@ -1,12 +1,42 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
-@dataclass
+
+# 操作建议 -> emoji
+_EMOJI_MAP = {
+    '买入': '🟢',
+    '加仓': '🟢',
+    '强烈买入': '💚',
+    '持有': '🟡',
+    '观望': '⚪',
+    '减仓': '🟠',
+    '卖出': '🔴',
+    '强烈卖出': '❌',
+}
+
+# 置信度 -> 星级
+_STAR_MAP = {'高': '⭐⭐⭐', '中': '⭐⭐', '低': '⭐'}
+
+# 复合操作建议的分隔符（如 "卖出/观望"）
+_ADVICE_SPLIT_RE = re.compile(r'[/|]')
+
+# 无前缀的中文命令（按顺序匹配）
+_CN_COMMANDS = (
+    ('分析', 'analyze'),
+    ('大盘', 'market'),
+    ('批量', 'batch'),
+    ('帮助', 'help'),
+    ('状态', 'status'),
+)
+_CN_COMMAND_KEYS = tuple(cn_cmd for cn_cmd, _ in _CN_COMMANDS)
+
+@dataclass(slots=True)
 class AnalysisResult:
     """
     AI 分析结果数据类 - 决策仪表盘版
@@ -66,40 +96,8 @@ class AnalysisResult:
     change_pct: Optional[float] = None     # 分析时的涨跌幅(%)
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
-            'code': self.code,
-            'name': self.name,
-            'sentiment_score': self.sentiment_score,
-            'trend_prediction': self.trend_prediction,
-            'operation_advice': self.operation_advice,
-            'decision_type': self.decision_type,
-            'confidence_level': self.confidence_level,
-            'dashboard': self.dashboard,  # 决策仪表盘数据
-            'trend_analysis': self.trend_analysis,
-            'short_term_outlook': self.short_term_outlook,
-            'medium_term_outlook': self.medium_term_outlook,
-            'technical_analysis': self.technical_analysis,
-            'ma_analysis': self.ma_analysis,
-            'volume_analysis': self.volume_analysis,
-            'pattern_analysis': self.pattern_analysis,
-            'fundamental_analysis': self.fundamental_analysis,
-            'sector_position': self.sector_position,
-            'company_highlights': self.company_highlights,
-            'news_summary': self.news_summary,
-            'market_sentiment': self.market_sentiment,
-            'hot_topics': self.hot_topics,
-            'analysis_summary': self.analysis_summary,
-            'key_points': self.key_points,
-            'risk_warning': self.risk_warning,
-            'buy_reason': self.buy_reason,
-            'market_snapshot': self.market_snapshot,
-            'search_performed': self.search_performed,
-            'success': self.success,
-            'error_message': self.error_message,
-            'current_price': self.current_price,
-            'change_pct': self.change_pct,
-        }
+        """转换为字典（不含调试用的原始响应和数据来源说明）"""
+        return {name: getattr(self, name) for name in _ANALYSIS_RESULT_DICT_FIELDS}
 
     def get_core_conclusion(self) -> str:
         """获取核心结论（一句话）"""
@@ -136,25 +134,15 @@ class AnalysisResult:
 
     def get_emoji(self) -> str:
         """根据操作建议返回对应 emoji"""
-        emoji_map = {
-            '买入': '🟢',
-            '加仓': '🟢',
-            '强烈买入': '💚',
-            '持有': '🟡',
-            '观望': '⚪',
-            '减仓': '🟠',
-            '卖出': '🔴',
-            '强烈卖出': '❌',
-        }
         advice = self.operation_advice or ''
         # Direct match first
-        if advice in emoji_map:
-            return emoji_map[advice]
+        if advice in _EMOJI_MAP:
+            return _EMOJI_MAP[advice]
         # Handle compound advice like "卖出/观望" — use the first part
-        for part in advice.replace('/', '|').split('|'):
+        for part in _ADVICE_SPLIT_RE.split(advice):
             part = part.strip()
-            if part in emoji_map:
-                return emoji_map[part]
+            if part in _EMOJI_MAP:
+                return _EMOJI_MAP[part]
         # Score-based fallback
         score = self.sentiment_score
         if score >= 80:
@@ -172,8 +160,13 @@ class AnalysisResult:
 
     def get_confidence_stars(self) -> str:
         """返回置信度星级"""
-        star_map = {'高': '⭐⭐⭐', '中': '⭐⭐', '低': '⭐'}
-        return star_map.get(self.confidence_level, '⭐⭐')
+        return _STAR_MAP.get(self.confidence_level, '⭐⭐')
+
+
+# to_dict 输出的字段（按声明顺序，类定义时计算一次）
+_ANALYSIS_RESULT_DICT_FIELDS = tuple(
+    f.name for f in fields(AnalysisResult) if f.name not in ('raw_response', 'data_sources')
+)
 
 
 class ChatType(str, Enum):
@@ -192,7 +185,7 @@ class Platform(str, Enum):
     UNKNOWN = "unknown"      # 未知
 
 
-@dataclass
+@dataclass(slots=True)
 class BotMessage:
     """
     统一的机器人消息模型
@@ -242,14 +235,7 @@ class BotMessage:
         # 检查是否以命令前缀开头
         if not text.startswith(prefix):
             # 尝试匹配中文命令（无前缀）
-            chinese_commands = {
-                '分析': 'analyze',
-                '大盘': 'market',
-                '批量': 'batch',
-                '帮助': 'help',
-                '状态': 'status',
-            }
-            for cn_cmd, en_cmd in chinese_commands.items():
+            for cn_cmd, en_cmd in _CN_COMMANDS:
                 if text.startswith(cn_cmd):
                     args = text[len(cn_cmd):].strip().split()
                     return en_cmd, args
@@ -269,6 +255,9 @@ class BotMessage:
         return command, args
     
     def is_command(self, prefix: str = "/") -> bool:
-        """检查消息是否是命令"""
-        cmd, _ = self.get_command_and_args(prefix)
-        return cmd is not None
+        """检查消息是否是命令（只判断前缀，不拆分参数）"""
+        text = self.content.strip()
+        if text.startswith(prefix):
+            # 前缀后还有内容才是命令（text 已去除首尾空白）
+            return len(text) > len(prefix)
+        return text.startswith(_CN_COMMAND_KEYS)